@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+成就检查基准
+在成千上万个成就下比较每回合的检查耗时：按字段索引的增量检查（check_achievements）
+与逐个成就全量评估（每回合对全部成就调用 check_unlock，即原先的做法）
+"""
+
+import sys
+import os
+import time
+import random
+import argparse
+
+# 添加项目路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_core.player import Player
+from game_modules.achievement_system import Achievement, AchievementSystem
+from game_utils import realms, rng
+from game_utils.renderer import set_renderer, NullRenderer
+
+def make_system(count: int, seed: int) -> AchievementSystem:
+    """内置成就之外再随机生成 count 个成就"""
+    gen = random.Random(seed)
+    system = AchievementSystem()
+    for i in range(count):
+        clauses = []
+        kind = gen.randrange(4)
+        if kind in (0, 3):
+            clauses.append(f"realm:{realms.NAMES[gen.randint(1, realms.HIGHEST)]}")
+        if kind in (1, 3):
+            clauses.append(f"lifetime<={gen.randint(10, 1000)}")
+        if kind == 2:
+            clauses.append(f"cultivation>={gen.randint(10, 100)}")
+        if kind == 1:
+            clauses.append(f"lifetime>={gen.randint(10, 1000)}")
+        system.add_achievement(Achievement(f"成就{i}", "随机生成", ",".join(clauses), {"灵石": 1}))
+    return system
+    
+def play(system: AchievementSystem, turns: int, full_scan: bool, seed: int):
+    """玩家逐回合修炼、增寿并检查成就，返回（每回合秒数，解锁的成就名）"""
+    rng.seed(seed)
+    player = Player("测试修士")
+    player.stats['机缘'] = 60
+    elapsed = 0.0
+    for _ in range(turns):
+        player.cultivate()
+        player.lifetime += 1
+        start = time.perf_counter()
+        if full_scan:
+            player_stats = {
+                'realm': player.realm,
+                'cultivation': player.cultivation,
+                'lifetime': player.lifetime,
+                'resources': player.resources,
+                'stats': player.stats
+            }
+            for achievement in system.achievements.values():
+                achievement.check_unlock(player_stats)
+        else:
+            system.check_achievements(player)
+        elapsed += time.perf_counter() - start
+    return elapsed / turns, [achievement.name for achievement in system.get_unlocked_achievements()]
+    
+def main():
+    """基准入口"""
+    parser = argparse.ArgumentParser(description="成就检查基准")
+    parser.add_argument("--turns", type=int, default=1000, help="模拟回合数")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    args = parser.parse_args()
+    set_renderer(NullRenderer())
+    
+    print(f"{'成就数':>8}{'全量(us/回合)':>16}{'增量(us/回合)':>16}{'加速':>8}{'解锁数':>8}")
+    for count in (100, 1000, 10000):
+        full, full_unlocked = play(make_system(count, args.seed), args.turns, True, args.seed)
+        incremental, unlocked = play(make_system(count, args.seed), args.turns, False, args.seed)
+        assert unlocked == full_unlocked, "增量检查与全量评估的解锁结果不一致"
+        print(f"{count:>8}{full * 1e6:>16.1f}{incremental * 1e6:>16.2f}{full / incremental:>8.0f}x{len(unlocked):>8}")
+        
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+斗法大会基准
+在同一批 NPC 上分别用 1 个进程和多个进程跑瑞士轮与单败淘汰赛，比较每秒结算的对局数；
+对局随机种子预先抽好，两种方式的赛果一致
+"""
+
+import sys
+import os
+import time
+import argparse
+
+# 添加项目路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from game_core.arena import Arena
+from game_core.npc_population import NPCPopulation
+
+def run(workers: int, args) -> dict:
+    """在新生成的群体上跑一届比赛，返回赛果与耗时"""
+    population = NPCPopulation(["擂台"], args.npcs, np.random.default_rng(args.seed), indexed=False)
+    population.spawn(args.npcs)
+    with Arena(population, workers=workers, bouts=args.bouts, rng=np.random.default_rng(args.seed)) as arena:
+        start = time.perf_counter()
+        result = arena.swiss() if args.format == "swiss" else arena.bracket()
+        result['elapsed'] = time.perf_counter() - start
+    return result
+
+def main():
+    """基准入口"""
+    parser = argparse.ArgumentParser(description="斗法大会基准")
+    parser.add_argument("--npcs", type=int, default=1024, help="参赛 NPC 数")
+    parser.add_argument("--bouts", type=int, default=51, help="每场对局的局数（bouts//2+1 胜）")
+    parser.add_argument("--format", choices=["swiss", "bracket"], default="swiss", help="赛制")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="进程池大小")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    args = parser.parse_args()
+    
+    print(f"CPU 核数: {os.cpu_count()}，{args.npcs} 人{'瑞士轮' if args.format == 'swiss' else '单败淘汰'}，"
+          f"每场 {args.bouts} 局")
+    baseline = None
+    for workers in sorted({1, args.workers}):
+        result = run(workers, args)
+        baseline = baseline or result['elapsed']
+        print(f"{workers:>3} 进程：{result['matches']} 场对局 {result['elapsed']:.2f} 秒，"
+              f"{result['matches'] / result['elapsed']:,.0f} 场/秒，加速 {baseline / result['elapsed']:.2f}x，"
+              f"冠军 #{result['champion']}")
+
+if __name__ == "__main__":
+    main()
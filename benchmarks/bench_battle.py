@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+战斗模拟基准
+输出各境界对阵的胜率表（每组默认 100 万场，simulate_many 批量结算），
+并比较逐场 simulate() 与批量结算的吞吐，以及与 battle_odds() 精确胜率的偏差
+"""
+
+import sys
+import os
+import time
+import argparse
+
+# 添加项目路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from game_modules.battle_system import simulate, simulate_many, battle_odds, exact_outcome
+from game_utils import realms
+
+REALMS = list(realms.NAMES)
+
+def main():
+    """基准入口"""
+    parser = argparse.ArgumentParser(description="战斗模拟基准")
+    parser.add_argument("--fights", type=int, default=1000000, help="每组境界对阵的战斗场数")
+    parser.add_argument("--constitution", type=int, default=5, help="玩家体质")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    args = parser.parse_args()
+    rng = np.random.default_rng(args.seed)
+    
+    print(f"胜率表（行：玩家境界，列：敌人境界；体质 {args.constitution}，每组 {args.fights} 场）")
+    print(f"{'':>11}" + "".join(f"{realm:>8}" for realm in REALMS))  # 中文字符占两列
+    start = time.perf_counter()
+    max_error = 0.0
+    for player_realm in REALMS:
+        snapshot = {'realm': player_realm, '体质': args.constitution}
+        rates = [simulate_many(snapshot, {'realm': enemy_realm}, args.fights, rng)['win_rate']
+                 for enemy_realm in REALMS]
+        print(f"{player_realm:>8}" + "".join(f"{rate:>11.2%}" for rate in rates))
+        for enemy_realm, rate in zip(REALMS, rates):
+            max_error = max(max_error, abs(rate - battle_odds(snapshot, {'realm': enemy_realm})['win_rate']))
+    batch_time = (time.perf_counter() - start) / (args.fights * len(REALMS) ** 2)
+    print(f"与精确胜率的最大偏差：{max_error:.3%}")
+    
+    # 逐场结算只跑少量场次估算吞吐
+    snapshot = {'realm': '练气期', '体质': args.constitution}
+    enemy = {'realm': '筑基期'}
+    loops = min(args.fights, 50000)
+    start = time.perf_counter()
+    for _ in range(loops):
+        simulate(snapshot, enemy)
+    loop_time = (time.perf_counter() - start) / loops
+    
+    # 精确解：首次计算与缓存命中
+    exact_outcome.cache_clear()
+    start = time.perf_counter()
+    battle_odds(snapshot, enemy)
+    first_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(10000):
+        battle_odds(snapshot, enemy)
+    cached_time = (time.perf_counter() - start) / 10000
+    
+    print(f"\n逐场结算：{1 / loop_time:,.0f} 场/秒")
+    print(f"批量结算：{1 / batch_time:,.0f} 场/秒（{loop_time / batch_time:.0f}x）")
+    print(f"精确胜率：首次 {first_time * 1000:.2f} 毫秒，缓存命中 {cached_time * 1e6:.1f} 微秒")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+游戏主循环吞吐基准
+用随机策略无头驱动 GameEngine，输出每秒回合数
+"""
+
+import sys
+import os
+import argparse
+
+# 添加项目路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_core.headless import HeadlessSimulation
+
+def main():
+    """基准入口"""
+    parser = argparse.ArgumentParser(description="无头游戏循环吞吐基准")
+    parser.add_argument("--turns", type=int, default=10000, help="模拟回合数")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    args = parser.parse_args()
+    
+    simulation = HeadlessSimulation(seed=args.seed)
+    report = simulation.run(args.turns)
+    
+    print(f"回合数：{report['turns']}  局数：{report['episodes']}")
+    print(f"耗时：{report['elapsed']:.3f}秒  吞吐：{report['turns_per_second']:.0f} 回合/秒")
+    print(f"子菜单应答：{report['prompts']} 次")
+    for action, count in sorted(report['actions'].items(), key=lambda item: -item[1]):
+        print(f"  {action}: {count}")
+
+if __name__ == "__main__":
+    main()
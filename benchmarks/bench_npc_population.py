@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+NPC 群体模拟基准
+比较逐个字典更新与列式批量更新在 1千、10万、100万 NPC 下的每回合耗时，
+以及维护倒排索引的额外开销和按地点查询的耗时
+"""
+
+import sys
+import os
+import time
+import random
+import argparse
+
+# 添加项目路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from game_core.npc_population import NPCPopulation
+
+LOCATIONS = ["青云山脉", "幽冥谷", "天机城", "万宝阁", "紫霄宫", "血魔宗"]
+
+def bench_dicts(n: int, ticks: int) -> float:
+    """旧实现：字典列表，每个 NPC 单独掷骰移动，返回每回合秒数"""
+    npcs = [{'name': random.choice(NPCPopulation.NAMES), 'location': random.choice(LOCATIONS)}
+            for _ in range(n)]
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for npc in npcs:
+            if random.random() < 0.4:
+                npc['location'] = random.choice(LOCATIONS)
+    return (time.perf_counter() - start) / ticks
+
+def bench_columns(n: int, ticks: int, indexed: bool):
+    """列式实现：返回（每回合秒数，列内存字节数，单次地点查询秒数）"""
+    population = NPCPopulation(LOCATIONS, n, np.random.default_rng(42), indexed=indexed)
+    population.spawn(n)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        population.step()
+    step_time = (time.perf_counter() - start) / ticks
+    
+    # 查询一个较小的结果集：某地点、某境界、某性格的前 10 人
+    start = time.perf_counter()
+    for location_id in range(len(LOCATIONS)):
+        population.find(location_id=location_id, realm_id=3, personality_id=0, limit=10)
+    query_time = (time.perf_counter() - start) / len(LOCATIONS)
+    return step_time, population.nbytes, query_time
+
+def main():
+    """基准入口"""
+    parser = argparse.ArgumentParser(description="NPC 群体模拟基准")
+    parser.add_argument("--ticks", type=int, default=20, help="每个规模模拟的回合数")
+    parser.add_argument("--skip-dicts-above", type=int, default=100000, help="超过该规模时不测旧实现")
+    args = parser.parse_args()
+    
+    print(f"{'NPC数':>10}{'字典(ms/回合)':>16}{'列式(ms/回合)':>16}{'加速':>8}{'列内存':>12}"
+          f"{'含索引(ms/回合)':>18}{'扫描查询(ms)':>14}{'索引查询(ms)':>14}")
+    for n in (1000, 100000, 1000000):
+        column_time, nbytes, scan_time = bench_columns(n, args.ticks, indexed=False)
+        indexed_time, _, index_time = bench_columns(n, args.ticks, indexed=True)
+        if n <= args.skip_dicts_above:
+            dict_time = bench_dicts(n, args.ticks)
+            dict_text = f"{dict_time * 1000:.2f}"
+            speedup = f"{dict_time / column_time:.0f}x"
+        else:
+            dict_text, speedup = "-", "-"
+        print(f"{n:>10}{dict_text:>16}{column_time * 1000:>16.2f}{speedup:>8}{nbytes / 1024:>10.0f}KB"
+              f"{indexed_time * 1000:>18.2f}{scan_time * 1000:>14.3f}{index_time * 1000:>14.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+玩家群体基准
+比较逐个 Player 对象修炼与 PlayerPopulation 批量修炼的耗时，以及每名玩家占用的内存
+"""
+
+import sys
+import os
+import time
+import tracemalloc
+import argparse
+
+# 添加项目路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from game_core.player import Player
+from game_core.player_population import PlayerPopulation
+from game_utils.renderer import set_renderer, NullRenderer
+
+def bench_objects(n: int, turns: int):
+    """逐个对象：返回（每回合秒数，每人字节数）"""
+    tracemalloc.start()
+    players = [Player(f"修士{i}") for i in range(n)]
+    per_player = tracemalloc.get_traced_memory()[0] / n
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for _ in range(turns):
+        for player in players:
+            player.cultivate()
+    return (time.perf_counter() - start) / turns, per_player
+
+def bench_population(n: int, turns: int):
+    """批量：返回（每回合秒数，每人字节数）"""
+    tracemalloc.start()
+    population = PlayerPopulation(n, np.random.default_rng(42))
+    for i in range(n):
+        population.add(f"修士{i}")
+    per_player = tracemalloc.get_traced_memory()[0] / n
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for _ in range(turns):
+        population.cultivate()
+    return (time.perf_counter() - start) / turns, per_player
+
+def main():
+    """基准入口"""
+    parser = argparse.ArgumentParser(description="玩家群体基准")
+    parser.add_argument("--turns", type=int, default=20, help="修炼回合数")
+    args = parser.parse_args()
+    set_renderer(NullRenderer())
+    
+    print(f"{'玩家数':>10}{'对象(ms/回合)':>16}{'批量(ms/回合)':>16}{'加速':>8}{'对象(B/人)':>14}{'批量(B/人)':>14}")
+    for n in (1000, 10000, 100000):
+        object_time, object_bytes = bench_objects(n, args.turns)
+        population_time, population_bytes = bench_population(n, args.turns)
+        print(f"{n:>10}{object_time * 1000:>16.2f}{population_time * 1000:>16.2f}"
+              f"{object_time / population_time:>7.0f}x{object_bytes:>14.0f}{population_bytes:>14.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+存档格式基准
+用合成存档比较缩进 JSON 与二进制格式（不压缩 / zlib / zstd）的文件大小和保存、读取延迟
+"""
+
+import sys
+import os
+import time
+import random
+import argparse
+import tempfile
+
+# 添加项目路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_modules.save_system import SaveSystem
+from game_modules import save_codec
+from game_utils.renderer import set_renderer, NullRenderer
+
+SIZES = [1 << 10, 64 << 10, 1 << 20, 10 << 20, 50 << 20]
+
+def make_npc(rng: random.Random, index: int) -> dict:
+    """生成一条合成 NPC 记录"""
+    return {
+        "name": f"修士{index}",
+        "realm": rng.choice(["练气期", "筑基期", "金丹期", "元婴期"]),
+        "level": rng.randint(1, 9),
+        "location": rng.choice(["青云山", "天剑峰", "万花谷", "幽冥洞"]),
+        "personality": rng.choice(["正直", "狡诈", "冷漠", "热情"]),
+        "relationship": rng.randint(-100, 100),
+        "stats": {"hp": rng.randint(50, 5000), "mp": rng.randint(20, 2000), "attack": rng.randint(5, 500)},
+    }
+
+def make_save(target_bytes: int, seed: int = 0) -> dict:
+    """生成 JSON 体积约为 target_bytes 的合成存档"""
+    rng = random.Random(seed)
+    npcs = []
+    # 每条 NPC 缩进 JSON 约 330 字节
+    for index in range(max(1, target_bytes // 330)):
+        npcs.append(make_npc(rng, index))
+    return {
+        "player": {"name": "基准修士", "realm": "筑基期", "level": 3, "stats": {"hp": 300, "mp": 150}},
+        "game_state": {"game_time": 1000, "world_state": {"npc_cultivators": npcs}},
+        "save_time": "2024-01-01 00:00:00",
+        "version": "1.0",
+    }
+
+def measure(save_system: SaveSystem, save_data: dict, repeat: int):
+    """返回（文件字节数、保存毫秒、读取毫秒）"""
+    save_started = time.perf_counter()
+    for _ in range(repeat):
+        save_system._write_save("bench", save_data)
+    save_ms = (time.perf_counter() - save_started) * 1000 / repeat
+    
+    size = os.path.getsize(save_system._find_save("bench"))
+    
+    load_started = time.perf_counter()
+    for _ in range(repeat):
+        save_system.load_game("bench")
+    load_ms = (time.perf_counter() - load_started) * 1000 / repeat
+    return size, save_ms, load_ms
+
+def main():
+    """基准入口"""
+    parser = argparse.ArgumentParser(description="存档格式大小与延迟基准")
+    parser.add_argument("--max-mb", type=float, default=50, help="最大合成存档体积（MB）")
+    parser.add_argument("--repeat", type=int, default=3, help="每项重复次数")
+    args = parser.parse_args()
+    
+    formats = [("json", None), ("binary", "none"), ("binary", "zlib")]
+    if save_codec.zstandard is not None:
+        formats.append(("binary", "zstd"))
+    else:
+        print("未安装 zstandard，跳过 zstd")
+        
+    set_renderer(NullRenderer())
+    with tempfile.TemporaryDirectory() as save_dir:
+        for target in SIZES:
+            if target > args.max_mb * (1 << 20):
+                break
+            save_data = make_save(target)
+            repeat = args.repeat if target <= (1 << 20) else 1
+            print(f"\n合成存档 ≈ {target / 1024:.0f} KB")
+            print(f"  {'格式':<14}{'字节数':>12}{'保存(ms)':>12}{'读取(ms)':>12}")
+            for format, compression in formats:
+                save_system = SaveSystem(save_dir, format=format, compression=compression or "zlib")
+                size, save_ms, load_ms = measure(save_system, save_data, repeat)
+                label = format if compression is None else f"{format}/{compression}"
+                print(f"  {label:<14}{size:>12}{save_ms:>12.2f}{load_ms:>12.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+闭关基准
+比较逐回合调用 Player.cultivate() 与 Player.seclude() 闭式计算 N 回合的耗时
+"""
+
+import sys
+import os
+import time
+import argparse
+
+# 添加项目路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_core.player import Player
+from game_utils.renderer import set_renderer, NullRenderer
+
+def make_player(luck: int) -> Player:
+    """按给定机缘创建玩家"""
+    player = Player("闭关修士")
+    player.stats['机缘'] = luck
+    return player
+
+def main():
+    """基准入口"""
+    parser = argparse.ArgumentParser(description="闭关基准")
+    parser.add_argument("--luck", type=int, default=40, help="玩家机缘（决定突破成功率）")
+    parser.add_argument("--max-loop-turns", type=int, default=1000000, help="超过该回合数时不测逐回合修炼")
+    args = parser.parse_args()
+    set_renderer(NullRenderer())
+    
+    print(f"{'回合数':>10}{'逐回合(ms)':>14}{'闭式(ms)':>12}{'加速':>10}{'突破尝试':>10}{'最终境界':>10}")
+    for turns in (100, 10000, 1000000, 100000000):
+        if turns <= args.max_loop_turns:
+            player = make_player(args.luck)
+            start = time.perf_counter()
+            for _ in range(turns):
+                player.cultivate()
+            loop_time = time.perf_counter() - start
+            loop_text = f"{loop_time * 1000:.2f}"
+        else:
+            loop_time, loop_text = None, "-"
+            
+        player = make_player(args.luck)
+        start = time.perf_counter()
+        result = player.seclude(turns)
+        closed_time = time.perf_counter() - start
+        speedup = f"{loop_time / closed_time:.0f}x" if loop_time else "-"
+        print(f"{turns:>10}{loop_text:>14}{closed_time * 1000:>12.3f}{speedup:>10}"
+              f"{result['breakthrough_attempts']:>10}{player.realm:>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分片世界模拟基准
+比较各地区分片在本进程内顺序推进与在进程池上并行推进的吞吐（回合/秒），
+以及迁移消息交换间隔对吞吐的影响
+"""
+
+import sys
+import os
+import argparse
+
+# 添加项目路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_core.sharded_world import ShardedWorld
+
+def main():
+    """基准入口"""
+    parser = argparse.ArgumentParser(description="分片世界模拟基准")
+    parser.add_argument("--ticks", type=int, default=100, help="模拟的回合数")
+    parser.add_argument("--npcs", type=int, default=100000, help="每个地区的 NPC 数")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="进程池大小")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    args = parser.parse_args()
+    
+    print(f"CPU 核数: {os.cpu_count()}，每地区 {args.npcs} NPC，{args.ticks} 回合")
+    print(f"{'模式':>10}{'交换间隔':>10}{'回合/秒':>12}{'迁移人次':>12}{'总人口':>12}")
+    for workers in (1, args.workers):
+        for exchange_every in (1, 10):
+            with ShardedWorld(npcs_per_region=args.npcs, workers=workers, seed=args.seed) as world:
+                summary = world.run(args.ticks, exchange_every)
+            mode = "顺序" if workers <= 1 else f"{workers}进程"
+            print(f"{mode:>10}{exchange_every:>10}{summary['ticks_per_second']:>12.1f}"
+                  f"{summary['migrations']:>12}{summary['population']:>12}")
+
+if __name__ == "__main__":
+    main()
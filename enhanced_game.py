@@ -111,7 +111,7 @@ def load_saved_game():
     from game_modules.save_system import SaveSystem
     save_system = SaveSystem()
     
-    saves = save_system.list_saves()
+    saves = save_system.list_save_info()
     
     if not saves:
         print("没有找到存档文件")
@@ -120,12 +120,14 @@ def load_saved_game():
         
     print("可用存档：")
     for i, save in enumerate(saves, 1):
-        print(f"{i}. {save}")
+        save_time = (save.get('save_time') or '')[:19].replace('T', ' ')
+        print(f"{i}. {save['name']}  {save.get('player') or '?'}·{save.get('realm') or '?'}  "
+              f"第{save.get('game_time') or 0}回合  {save_time}")
         
     try:
         choice = int(input("选择存档编号: ")) - 1
         if 0 <= choice < len(saves):
-            save_data = save_system.load_game(saves[choice])
+            save_data = save_system.load_game(saves[choice]['name'])
             if save_data:
                 print("读取成功！正在加载游戏...")
                 # 这里应该实现从存档数据恢复游戏状态的逻辑
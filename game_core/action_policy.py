@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+行动策略模块
+为无头模拟提供可插拔的玩家行动与菜单应答策略
+"""
+
+import random
+from typing import Dict, List, Sequence, Tuple
+from game_utils.renderer import echo, flush_output
+
+class PolicyError(RuntimeError):
+    """策略在单个回合内应答次数过多（通常是菜单死循环）"""
+
+class ActionPolicy:
+    """行动策略基类"""
+    
+    def __init__(self, max_prompts_per_turn: int = 1000):
+        self.max_prompts_per_turn = max_prompts_per_turn
+        self.turn_prompts = 0
+        self.total_prompts = 0
+        self.action_counts = {}
+        
+    def begin_turn(self):
+        """新回合开始时重置应答计数"""
+        self.turn_prompts = 0
+        
+    def decide(self, engine, actions: List[str]) -> str:
+        """选择主菜单行动并记录统计"""
+        action = self.choose_action(engine, actions)
+        self.action_counts[action] = self.action_counts.get(action, 0) + 1
+        return action
+        
+    def choose_action(self, engine, actions: List[str]) -> str:
+        """选择主菜单行动，返回行动名称"""
+        raise NotImplementedError
+        
+    def answer(self, message: str) -> str:
+        """应答子菜单提示"""
+        self.turn_prompts += 1
+        self.total_prompts += 1
+        if self.turn_prompts > self.max_prompts_per_turn:
+            raise PolicyError(f"单回合应答超过 {self.max_prompts_per_turn} 次，最后的提示：{message!r}")
+        return self._answer(message)
+        
+    def _answer(self, message: str) -> str:
+        raise NotImplementedError
+
+class ConsolePolicy(ActionPolicy):
+    """控制台策略，行为与交互模式一致"""
+    
+    def choose_action(self, engine, actions: List[str]) -> str:
+        while True:
+            flush_output()
+            choice = input("请选择行动 (输入数字): ")
+            if choice.isdigit() and 1 <= int(choice) <= len(actions):
+                return actions[int(choice) - 1]
+            echo("无效选择，请重新输入")
+            
+    def _answer(self, message: str) -> str:
+        flush_output()
+        return input(message)
+
+class ScriptedPolicy(ActionPolicy):
+    """脚本策略：按顺序循环执行给定行动，按提示关键字应答"""
+    
+    def __init__(self, actions: Sequence[str], answers: Sequence[Tuple[str, object]] = (),
+                 default_answer: str = "", **kwargs):
+        super().__init__(**kwargs)
+        self.actions = list(actions)
+        # [(提示关键字, 应答或应答列表), ...]，按顺序匹配第一个命中的关键字
+        self.answers = [(key, list(value) if isinstance(value, (list, tuple)) else [value])
+                        for key, value in answers]
+        self.default_answer = default_answer
+        self._action_index = 0
+        self._answer_index = {}
+        
+    def choose_action(self, engine, actions: List[str]) -> str:
+        action = self.actions[self._action_index % len(self.actions)]
+        self._action_index += 1
+        return action
+        
+    def _answer(self, message: str) -> str:
+        for key, values in self.answers:
+            if key in message:
+                index = self._answer_index.get(key, 0)
+                self._answer_index[key] = index + 1
+                return str(values[index % len(values)])
+        return self.default_answer
+
+class RandomPolicy(ActionPolicy):
+    """随机策略：按权重随机选择行动，子菜单随机应答"""
+    
+    DEFAULT_ANSWERS = ["1", "2", "3", "4", "5", "6", "y", "n", ""]
+    
+    def __init__(self, weights: Dict[str, float] = None, seed: int = None,
+                 answers: Sequence[str] = None, **kwargs):
+        super().__init__(**kwargs)
+        # 默认不主动退出或手动存档
+        self.weights = weights or {"保存游戏": 0, "退出游戏": 0}
+        self.answer_pool = list(answers or self.DEFAULT_ANSWERS)
+        self.rng = random.Random(seed)
+        
+    def choose_action(self, engine, actions: List[str]) -> str:
+        weights = [self.weights.get(action, 1) for action in actions]
+        return self.rng.choices(actions, weights=weights)[0]
+        
+    def _answer(self, message: str) -> str:
+        return self.rng.choice(self.answer_pool)
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+斗法大会
+让世界中的 NPC 修士按战斗系统的规则（battle_system.duel）两两切磋，支持单败淘汰与瑞士轮两种赛制。
+同一轮的对局互不依赖，按批分发到进程池并行结算；每场对局的随机种子预先抽好，
+结果与进程数无关。赛果写回 NPC 群体：胜者有机会借战突破，好感度随胜负升降。
+"""
+
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from game_core.npc_population import NPCPopulation
+from game_modules.battle_system import duel
+from game_utils.rng import numpy_stream
+
+def _play_matches(task: Tuple[np.ndarray, np.ndarray, np.ndarray, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """工作进程入口：结算一批对局，返回（先列者是否获胜, 各局总回合数）"""
+    first_realms, second_realms, seeds, bouts = task
+    realms = NPCPopulation.REALMS
+    first_won = np.zeros(len(seeds), dtype=bool)
+    rounds = np.zeros(len(seeds), dtype=np.int32)
+    for i, seed in enumerate(seeds):
+        rng = random.Random(int(seed))
+        first = {'realm': realms[first_realms[i]], '体质': Arena.NPC_CONSTITUTION}
+        second = {'realm': realms[second_realms[i]], '体质': Arena.NPC_CONSTITUTION}
+        need = bouts // 2 + 1
+        first_wins = second_wins = 0
+        while first_wins < need and second_wins < need:
+            # 每局随机决定先手
+            if rng.random() < 0.5:
+                result = duel(first, second, rng)
+                won = result.victory
+            else:
+                result = duel(second, first, rng)
+                won = not result.victory
+            rounds[i] += result.round_count
+            if won:
+                first_wins += 1
+            else:
+                second_wins += 1
+        first_won[i] = first_wins == need
+    return first_won, rounds
+
+class Arena:
+    """斗法大会"""
+    
+    NPC_CONSTITUTION = 5       # NPC 体质（群体中不单独记录）
+    WIN_FAVOR = 2              # 胜者意气风发，好感上升
+    LOSS_FAVOR = -1            # 败者心有不甘，好感下降
+    BREAKTHROUGH_CHANCE = 0.05  # 每赢一场借战突破的概率
+    
+    def __init__(self, population: NPCPopulation, workers: int = None, bouts: int = 3,
+                 rng: np.random.Generator = None):
+        self.population = population
+        self.workers = os.cpu_count() if workers is None else workers  # 0 或 1 时在本进程内结算
+        self.bouts = bouts  # 每场对局为 bouts 局 bouts//2+1 胜
+        self.rng = rng if rng is not None else numpy_stream("arena")
+        self.breakthroughs = 0  # 本届大会借战突破的人数
+        self._executor = None
+        
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        
+    def close(self):
+        """关闭进程池"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+            
+    def _entrants(self, entrants: np.ndarray = None, size: int = None) -> np.ndarray:
+        """参赛者编号：默认从在世 NPC 中随机抽取 size 人（不指定则全部参赛）"""
+        if entrants is None:
+            entrants = self.population.ids()
+        entrants = np.asarray(entrants)
+        if size is not None and size < len(entrants):
+            entrants = self.rng.choice(entrants, size, replace=False)
+        return entrants
+        
+    def play_round(self, first: np.ndarray, second: np.ndarray) -> Tuple[np.ndarray, np.ndarray, int]:
+        """并行结算一轮对局（first[i] 对 second[i]），返回（胜者编号, 败者编号, 总回合数）"""
+        n = len(first)
+        if n == 0:
+            return first, second, 0
+        realm_id = self.population.realm_id
+        seeds = self.rng.integers(0, 2 ** 63, n)
+        
+        chunks = max(1, min(n, self.workers * 4))  # 每个进程分几批，减少空等
+        tasks = [(realm_id[first[part]], realm_id[second[part]], seeds[part], self.bouts)
+                 for part in np.array_split(np.arange(n), chunks)]
+        if self.workers <= 1:
+            results = list(map(_play_matches, tasks))
+        else:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            results = list(self._executor.map(_play_matches, tasks))
+            
+        first_won = np.concatenate([won for won, _ in results])
+        rounds = int(sum(int(chunk_rounds.sum()) for _, chunk_rounds in results))
+        winners = np.where(first_won, first, second)
+        losers = np.where(first_won, second, first)
+        self._apply_results(winners, losers)
+        return winners, losers, rounds
+        
+    def _apply_results(self, winners: np.ndarray, losers: np.ndarray):
+        """赛果写回 NPC 群体：好感度升降，胜者可能突破"""
+        population = self.population
+        relationship = population.relationship
+        relationship[winners] = np.minimum(100, relationship[winners] + self.WIN_FAVOR)
+        relationship[losers] = np.maximum(-100, relationship[losers] + self.LOSS_FAVOR)
+        
+        top_realm = len(population.REALMS) - 1
+        candidates = winners[population.realm_id[winners] < top_realm]
+        broke_through = candidates[self.rng.random(len(candidates)) < self.BREAKTHROUGH_CHANCE]
+        old_realms = population.realm_id[broke_through]
+        population.realm_id[broke_through] += 1
+        if population.index is not None and len(broke_through):
+            population.index.move('realm_id', old_realms, old_realms + 1, broke_through)
+        self.breakthroughs += len(broke_through)
+        
+    def bracket(self, entrants: np.ndarray = None, size: int = None) -> Dict:
+        """单败淘汰赛：每轮随机配对，人数为奇数时一人轮空晋级，直到决出冠军"""
+        remaining = self.rng.permutation(self._entrants(entrants, size))
+        self.breakthroughs = 0
+        rounds = matches = total_rounds = 0
+        while len(remaining) > 1:
+            paired = len(remaining) // 2 * 2
+            winners, _, round_total = self.play_round(remaining[0:paired:2], remaining[1:paired:2])
+            bye = remaining[paired:]
+            remaining = self.rng.permutation(np.concatenate([winners, bye]))
+            rounds += 1
+            matches += paired // 2
+            total_rounds += round_total
+        return {
+            'format': 'bracket',
+            'champion': int(remaining[0]) if len(remaining) else None,
+            'rounds': rounds,
+            'matches': matches,
+            'battle_rounds': total_rounds,
+            'breakthroughs': self.breakthroughs
+        }
+        
+    def swiss(self, entrants: np.ndarray = None, size: int = None, rounds: int = None) -> Dict:
+        """瑞士轮：每轮按积分排序、同分随机，相邻且未交过手的两人配对；
+        人数为奇数时，排名最低且尚未轮空过的一人轮空记一胜（人人都轮空过后再从最低者开始）"""
+        players = self._entrants(entrants, size)
+        n = len(players)
+        rounds = rounds if rounds is not None else max(1, math.ceil(math.log2(max(n, 2))))
+        position = {int(npc_id): i for i, npc_id in enumerate(players)}
+        scores = np.zeros(n, dtype=np.int32)
+        played = [set() for _ in range(n)]
+        had_bye = np.zeros(n, dtype=bool)
+        self.breakthroughs = 0
+        matches = total_rounds = 0
+        
+        for _ in range(rounds):
+            order = np.lexsort((self.rng.random(n), -scores))
+            if n % 2:
+                candidates = np.flatnonzero(~had_bye[order])
+                bye = int(candidates[-1]) if len(candidates) else n - 1  # order 中的位置
+                had_bye[order[bye]] = True
+                scores[order[bye]] += 1  # 轮空
+                order = np.delete(order, bye)
+            first, second = self._pair(order, played)
+            
+            winners, _, round_total = self.play_round(players[first], players[second])
+            for i, j in zip(first, second):
+                played[i].add(j)
+                played[j].add(i)
+            scores[[position[int(npc_id)] for npc_id in winners]] += 1
+            matches += len(first)
+            total_rounds += round_total
+            
+        ranking = np.lexsort((players, -scores))
+        return {
+            'format': 'swiss',
+            'standings': [(int(players[i]), int(scores[i])) for i in ranking],
+            'champion': int(players[ranking[0]]) if n else None,
+            'rounds': rounds,
+            'matches': matches,
+            'battle_rounds': total_rounds,
+            'breakthroughs': self.breakthroughs
+        }
+        
+    @staticmethod
+    def _pair(order: np.ndarray, played: List[set]) -> Tuple[List[int], List[int]]:
+        """按名次顺序贪心配对，优先避开交过手的对手"""
+        unpaired = [int(i) for i in order]
+        first, second = [], []
+        while len(unpaired) > 1:
+            i = unpaired.pop(0)
+            partner = next((k for k, j in enumerate(unpaired) if j not in played[i]), 0)
+            first.append(i)
+            second.append(unpaired.pop(partner))
+        return first, second
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+无头模拟驱动
+不经过控制台，由行动策略驱动 GameEngine 连续运行大量回合
+"""
+
+import time
+from typing import Dict
+from game_core.game_engine import GameEngine
+from game_core.player import Player
+from game_core.world_simulator import WorldSimulator
+from game_core.action_policy import ActionPolicy, RandomPolicy
+from game_utils.console_io import set_input_policy
+from game_utils.renderer import set_renderer, BufferedRenderer, NullRenderer
+from game_utils import rng
+
+class HeadlessSimulation:
+    """无头模拟器"""
+    
+    def __init__(self, policy: ActionPolicy = None, seed: int = None,
+                 player_name: str = "无头修士", stats: Dict[str, int] = None,
+                 autosave: bool = False, quiet: bool = True):
+        self.policy = policy or RandomPolicy(seed=seed)
+        self.seed = seed
+        self.player_name = player_name
+        self.stats = stats or {"体质": 5, "灵根": 5, "悟性": 5, "机缘": 5}
+        self.autosave = autosave
+        self.quiet = quiet
+        self.engine = None
+        self.episodes = 0
+        
+    def new_episode(self):
+        """开始新的一局（上一局结束后自动调用）"""
+        self.engine = GameEngine(policy=self.policy)
+        if not self.autosave:
+            self.engine.autosave_interval = 0
+        player = Player(self.player_name)
+        player.stats.update(self.stats)
+        self.engine.prepare_session(player, WorldSimulator())
+        self.episodes += 1
+        
+    def run(self, turns: int) -> Dict[str, object]:
+        """运行指定回合数，返回吞吐统计"""
+        if self.seed is not None:
+            rng.seed(self.seed)
+            
+        previous_policy = set_input_policy(self.policy)
+        # 静默模式使用空渲染器，完全跳过输出格式化
+        previous_renderer = set_renderer(NullRenderer() if self.quiet else BufferedRenderer())
+        start = time.perf_counter()
+        try:
+            self._run_turns(turns)
+        finally:
+            elapsed = time.perf_counter() - start
+            set_renderer(previous_renderer)
+            set_input_policy(previous_policy)
+            
+        return {
+            'turns': turns,
+            'episodes': self.episodes,
+            'elapsed': elapsed,
+            'turns_per_second': turns / elapsed if elapsed > 0 else float('inf'),
+            'prompts': self.policy.total_prompts,
+            'actions': dict(self.policy.action_counts)
+        }
+        
+    def _run_turns(self, turns: int):
+        """逐回合驱动游戏循环"""
+        for _ in range(turns):
+            if self.engine is None or not self.engine.running:
+                self.new_episode()
+            self.policy.begin_turn()
+            self.engine.game_loop()
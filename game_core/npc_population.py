@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+NPC 修士群体
+按列存放在 NumPy 数组中（姓名、境界、性格、地点、好感、年龄），
+移动、出生、衰老和突破都以整列批量运算完成，十万级群体也能逐回合模拟。
+
+数组按容量预先分配，alive 标记槽位是否有人；槽位编号即 NPC 编号，
+NPC 死亡后编号空出，之后出生的 NPC 复用空槽，已有 NPC 的编号保持不变。
+地点、境界、性格另有倒排索引（取值 -> NPC 编号集合），随每回合的变化增量维护，
+按条件查询的耗时只与结果数量有关。
+"""
+
+from itertools import islice
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+from game_utils import realms
+
+class NPCIndex:
+    """NPC 倒排索引：列名 -> 取值 -> NPC 编号集合"""
+    
+    def __init__(self, columns: Iterable[str]):
+        self.sets = {column: {} for column in columns}
+        
+    def clear(self):
+        for groups in self.sets.values():
+            groups.clear()
+            
+    def get(self, column: str, value: int) -> set:
+        """取值为 value 的 NPC 编号集合（调用方不应修改）"""
+        return self.sets[column].get(value, set())
+        
+    def groups(self, column: str) -> Dict[int, set]:
+        return self.sets[column]
+        
+    def add(self, column: str, values: np.ndarray, ids: np.ndarray):
+        """批量登记：按取值分组后整组加入集合"""
+        groups = self.sets[column]
+        for value in np.unique(values):
+            groups.setdefault(int(value), set()).update(ids[values == value].tolist())
+            
+    def remove(self, column: str, values: np.ndarray, ids: np.ndarray):
+        """批量注销"""
+        groups = self.sets[column]
+        for value in np.unique(values):
+            group = groups.get(int(value))
+            if group is not None:
+                group.difference_update(ids[values == value].tolist())
+                
+    def move(self, column: str, old_values: np.ndarray, new_values: np.ndarray, ids: np.ndarray):
+        """批量改变取值；取值未变的 NPC 不动"""
+        changed = old_values != new_values
+        if not changed.all():
+            ids, old_values, new_values = ids[changed], old_values[changed], new_values[changed]
+        self.remove(column, old_values, ids)
+        self.add(column, new_values, ids)
+
+class NPCPopulation:
+    """NPC 修士群体（列式存储）"""
+    
+    NAMES = ["李青云", "王玄机", "张无忌", "赵敏", "周芷若", "小龙女", "杨过", "令狐冲"]
+    REALMS = list(realms.NAMES[1:5])  # NPC 只有练气期至元婴期，realm_id 列为本表下标
+    REALM_LIFESPANS = [120, 200, 500, 1000]  # 各境界寿元（年）
+    PERSONALITIES = ['友善', '冷漠', '狡诈', '正直']
+    # (好感上限, 关系)，好感不低于最后一个上限时为“知己”
+    RELATIONSHIP_LEVELS = [(-50, '仇敌'), (-10, '不睦'), (10, '陌生'), (50, '友好')]
+    
+    TICKS_PER_YEAR = 16      # 四季各 4 回合
+    MOVE_CHANCE = 0.4        # 每回合移动概率
+    SPAWN_RATE = 0.03        # 每个空缺名额每回合的出生概率
+    BREAKTHROUGH_CHANCE = 0.002  # 每回合突破到下一境界的概率
+    
+    COLUMNS = ('alive', 'name_id', 'realm_id', 'personality_id', 'location_id', 'relationship', 'age')
+    # 迁移时随 NPC 一起搬走的列（地点由迁入方重新分配）
+    TRAVEL_COLUMNS = ('name_id', 'realm_id', 'personality_id', 'relationship', 'age')
+    INDEXED_COLUMNS = ('location_id', 'realm_id', 'personality_id')
+    
+    def __init__(self, locations: List[str], capacity: int = 10, rng: np.random.Generator = None,
+                 indexed: bool = True):
+        self.locations = locations  # 地点名称表（与世界状态共用），location 列存放其下标
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.capacity = 0
+        self.count = 0
+        self.alive = np.zeros(0, dtype=bool)
+        self.name_id = np.zeros(0, dtype=np.int16)
+        self.realm_id = np.zeros(0, dtype=np.int8)
+        self.personality_id = np.zeros(0, dtype=np.int8)
+        self.location_id = np.zeros(0, dtype=np.int16)
+        self.relationship = np.zeros(0, dtype=np.int16)  # 好感度 -100~100
+        self.age = np.zeros(0, dtype=np.int32)            # 年龄（回合）
+        self.lifespan_ticks = np.array(self.REALM_LIFESPANS, dtype=np.int32) * self.TICKS_PER_YEAR
+        self.index = NPCIndex(self.INDEXED_COLUMNS) if indexed else None  # None 时查询退化为整列扫描
+        self.resize(capacity)
+        
+    def resize(self, capacity: int):
+        """调整容量（出生补员的目标人数随之改变）；缩小时只保留编号在新容量以内的 NPC"""
+        self._reallocate(capacity)
+        self.target_size = capacity  # 出生只补到该人数；迁入可以临时超出
+        
+    def _reallocate(self, capacity: int):
+        for column in self.COLUMNS:
+            old = getattr(self, column)
+            new = np.zeros(capacity, dtype=old.dtype)
+            keep = min(capacity, len(old))
+            new[:keep] = old[:keep]
+            setattr(self, column, new)
+        self.capacity = capacity
+        self.count = int(self.alive.sum())
+        self.rebuild_index()
+        
+    def rebuild_index(self):
+        """按当前各列重建倒排索引"""
+        if self.index is None:
+            return
+        self.index.clear()
+        self._index_add(self.ids())
+        
+    def _index_add(self, ids: np.ndarray):
+        if self.index is not None and len(ids):
+            for column in self.INDEXED_COLUMNS:
+                self.index.add(column, getattr(self, column)[ids], ids)
+                
+    def _index_remove(self, ids: np.ndarray):
+        if self.index is not None and len(ids):
+            for column in self.INDEXED_COLUMNS:
+                self.index.remove(column, getattr(self, column)[ids], ids)
+        
+    def __len__(self) -> int:
+        return self.count
+        
+    @property
+    def nbytes(self) -> int:
+        """各列占用的字节数"""
+        return sum(getattr(self, column).nbytes for column in self.COLUMNS)
+        
+    def ids(self) -> np.ndarray:
+        """所有在世 NPC 的编号（升序）"""
+        return np.flatnonzero(self.alive)
+        
+    def spawn(self, n: int, location_ids: np.ndarray = None) -> np.ndarray:
+        """在空槽中生成 n 个新 NPC，返回它们的编号"""
+        free = np.flatnonzero(~self.alive)[:n]
+        k = len(free)
+        if k == 0:
+            return free
+        rng = self.rng
+        self.alive[free] = True
+        self.name_id[free] = rng.integers(0, len(self.NAMES), k)
+        self.realm_id[free] = rng.integers(0, len(self.REALMS), k)
+        self.personality_id[free] = rng.integers(0, len(self.PERSONALITIES), k)
+        if location_ids is None:
+            location_ids = rng.integers(0, len(self.locations), k)
+        self.location_id[free] = location_ids
+        self.relationship[free] = 0
+        # 新出现的修士年龄在 16~60 岁之间
+        self.age[free] = rng.integers(16 * self.TICKS_PER_YEAR, 60 * self.TICKS_PER_YEAR, k)
+        self.count += k
+        self._index_add(free)
+        return free
+        
+    def step(self) -> Dict[str, np.ndarray]:
+        """推进一回合：衰老、寿尽、突破、出生、移动，返回本回合的变化"""
+        rng = self.rng
+        alive = self.alive
+        
+        # 衰老与寿尽
+        self.age += alive
+        died = np.flatnonzero(alive & (self.age >= self.lifespan_ticks[self.realm_id]))
+        self._index_remove(died)
+        alive[died] = False
+        self.count -= len(died)
+        
+        # 突破（最高境界不再突破）
+        candidates = alive & (self.realm_id < len(self.REALMS) - 1)
+        broke_through = np.flatnonzero(candidates & (rng.random(self.capacity) < self.BREAKTHROUGH_CHANCE))
+        old_realms = self.realm_id[broke_through]
+        self.realm_id[broke_through] += 1
+        if self.index is not None and len(broke_through):
+            self.index.move('realm_id', old_realms, old_realms + 1, broke_through)
+        
+        # 出生：每个空缺名额独立按概率补上
+        vacancies = max(0, self.target_size - self.count)
+        spawned = self.spawn(int(rng.binomial(vacancies, self.SPAWN_RATE))) if vacancies else died[:0]
+        
+        # 移动（只有一个地点时无处可去）
+        if len(self.locations) > 1:
+            moved = np.flatnonzero(alive & (rng.random(self.capacity) < self.MOVE_CHANCE))
+        else:
+            moved = died[:0]
+        old_locations = self.location_id[moved]
+        self.location_id[moved] = rng.integers(0, len(self.locations), len(moved))
+        if self.index is not None and len(moved):
+            self.index.move('location_id', old_locations, self.location_id[moved], moved)
+            
+        return {
+            'died': died,
+            'spawned': spawned,
+            'broke_through': broke_through,
+            'moved': moved,
+            'moved_from': old_locations
+        }
+        
+    def advance(self, n_ticks: int) -> Dict[str, int]:
+        """一次推进 n_ticks 回合的闭式近似，返回死亡、出生、突破人数
+        
+        每人的突破次数按二项分布抽样，寿尽按期末境界判断；至少移动过一次的人
+        （概率 1-(1-p)^n）地点重新均匀抽样；期间的空缺按 1-(1-r)^n 的概率补上，
+        新人的年龄加上在期间内已度过的回合。
+        """
+        if n_ticks <= 0:
+            return {'died': 0, 'spawned': 0, 'broke_through': 0}
+        rng = self.rng
+        alive = self.alive
+        ids = np.flatnonzero(alive)
+        
+        top_realm = len(self.REALMS) - 1
+        gains = np.minimum(rng.binomial(n_ticks, self.BREAKTHROUGH_CHANCE, len(ids)),
+                           top_realm - self.realm_id[ids])
+        self.realm_id[ids] += gains.astype(self.realm_id.dtype)
+        self.age[ids] += n_ticks
+        
+        died = ids[self.age[ids] >= self.lifespan_ticks[self.realm_id[ids]]]
+        alive[died] = False
+        self.count -= len(died)
+        
+        movers = ids[rng.random(len(ids)) < 1 - (1 - self.MOVE_CHANCE) ** n_ticks]
+        movers = movers[alive[movers]]
+        self.location_id[movers] = rng.integers(0, len(self.locations), len(movers))
+        
+        vacancies = max(0, self.target_size - self.count)
+        fill_chance = 1 - (1 - self.SPAWN_RATE) ** n_ticks
+        spawned = self.spawn(int(rng.binomial(vacancies, fill_chance))) if vacancies else died[:0]
+        self.age[spawned] += rng.integers(0, n_ticks, len(spawned)).astype(self.age.dtype)
+        
+        self.rebuild_index()
+        return {'died': len(died), 'spawned': len(spawned), 'broke_through': int(gains.sum())}
+        
+    def extract(self, npc_ids: np.ndarray) -> Dict[str, np.ndarray]:
+        """移出一批 NPC（迁往别处），返回它们的列数据"""
+        self._index_remove(npc_ids)
+        batch = {column: getattr(self, column)[npc_ids] for column in self.TRAVEL_COLUMNS}
+        self.alive[npc_ids] = False
+        self.count -= len(npc_ids)
+        return batch
+        
+    def insert(self, batch: Dict[str, np.ndarray], location_ids: np.ndarray = None) -> np.ndarray:
+        """迁入一批 NPC，空槽不够时扩容，返回新编号"""
+        n = len(batch['age'])
+        free = np.flatnonzero(~self.alive)
+        if len(free) < n:
+            self._reallocate(max(self.capacity * 2, self.capacity + n - len(free)))
+            free = np.flatnonzero(~self.alive)
+        free = free[:n]
+        for column in self.TRAVEL_COLUMNS:
+            getattr(self, column)[free] = batch[column]
+        if location_ids is None:
+            location_ids = self.rng.integers(0, len(self.locations), n)
+        self.location_id[free] = location_ids
+        self.alive[free] = True
+        self.count += n
+        self._index_add(free)
+        return free
+        
+    def find(self, location_id: int = None, realm_id: int = None, personality_id: int = None,
+             limit: int = None) -> List[int]:
+        """按地点、境界、性格查询 NPC 编号；有索引时耗时与结果数量成正比"""
+        criteria = [(column, value) for column, value in
+                    (('location_id', location_id), ('realm_id', realm_id), ('personality_id', personality_id))
+                    if value is not None]
+        if self.index is None:
+            mask = self.alive.copy()
+            for column, value in criteria:
+                mask &= getattr(self, column) == value
+            return np.flatnonzero(mask)[:limit].tolist()
+            
+        if not criteria:
+            # 不限条件：依次取各地点的集合
+            candidates = (npc_id for group in self.index.groups('location_id').values() for npc_id in group)
+            return list(islice(candidates, limit))
+            
+        sets = sorted((self.index.get(column, value) for column, value in criteria), key=len)
+        smallest, others = sets[0], sets[1:]
+        matches = (npc_id for npc_id in smallest if all(npc_id in other for other in others))
+        return list(islice(matches, limit))
+        
+    def count_by(self, column: str) -> Dict[int, int]:
+        """各取值的 NPC 数量"""
+        if self.index is not None and column in self.index.sets:
+            return {value: len(group) for value, group in self.index.groups(column).items() if group}
+        values, counts = np.unique(getattr(self, column)[self.alive], return_counts=True)
+        return dict(zip(values.tolist(), counts.tolist()))
+        
+    def relationship_label(self, value: int) -> str:
+        """好感度对应的关系"""
+        for upper, label in self.RELATIONSHIP_LEVELS:
+            if value < upper:
+                return label
+        return '知己'
+        
+    def record(self, npc_id: int) -> Dict:
+        """把单个 NPC 转换为字典"""
+        npc_id = int(npc_id)
+        relationship = int(self.relationship[npc_id])
+        return {
+            'id': npc_id,
+            'name': self.NAMES[self.name_id[npc_id]],
+            'realm': self.REALMS[self.realm_id[npc_id]],
+            'personality': self.PERSONALITIES[self.personality_id[npc_id]],
+            'location': self.locations[self.location_id[npc_id]],
+            'relationship': self.relationship_label(relationship),
+            'favor': relationship,
+            'age': int(self.age[npc_id]) // self.TICKS_PER_YEAR
+        }
+        
+    def records(self, npc_ids=None) -> List[Dict]:
+        """把多个 NPC 转换为字典列表（默认全部在世 NPC）"""
+        if npc_ids is None:
+            npc_ids = self.ids()
+        return [self.record(npc_id) for npc_id in npc_ids]
+        
+    def load_records(self, records: List[Dict]):
+        """从字典列表恢复群体（兼容没有好感和年龄字段的旧存档）"""
+        self.alive[:] = False
+        self.count = 0
+        if len(records) > self.capacity:
+            self.resize(len(records))
+        lookups = {
+            'name_id': {name: i for i, name in enumerate(self.NAMES)},
+            'realm_id': {realm: i for i, realm in enumerate(self.REALMS)},
+            'personality_id': {p: i for i, p in enumerate(self.PERSONALITIES)},
+            'location_id': {location: i for i, location in enumerate(self.locations)}
+        }
+        fields = {'name_id': 'name', 'realm_id': 'realm', 'personality_id': 'personality', 'location_id': 'location'}
+        for slot, data in enumerate(records):
+            npc_id = data.get('id', slot)
+            if not 0 <= npc_id < self.capacity or self.alive[npc_id]:
+                npc_id = int(np.flatnonzero(~self.alive)[0])
+            for column, field in fields.items():
+                getattr(self, column)[npc_id] = lookups[column].get(data.get(field), 0)
+            self.relationship[npc_id] = data.get('favor', 0)
+            self.age[npc_id] = data.get('age', 20) * self.TICKS_PER_YEAR
+            self.alive[npc_id] = True
+            self.count += 1
+        self.rebuild_index()
@@ -5,98 +5,185 @@
 定义玩家的基本属性和行为
 """
 
+import math
 from typing import Dict, List
+from game_utils import realms
+from game_utils.renderer import echo
+from game_utils.rng import stream
+
+_rng = stream("player")  # 本模块的随机数流
 
 class Player:
     """玩家角色类"""
     
-    REALMS = [
-        "凡人", "练气期", "筑基期", "金丹期", 
-        "元婴期", "化神期", "合体期", "大乘期", "渡劫期"
-    ]
+    # 固定属性，不建实例字典；批量托管大量角色时见 PlayerPopulation
+    __slots__ = ('name', 'realm_id', 'cultivation', 'lifetime', 'stats', 'resources', 'skills',
+                 'achievements', 'sect')
+    
+    REALMS = list(realms.NAMES)
+    
+    # 初始属性、资源与技能（键的顺序即 PlayerPopulation 中的列顺序）
+    INITIAL_STATS = {
+        "体质": 5,      # 影响生命值和恢复速度
+        "灵根": 5,      # 影响灵气吸收效率
+        "悟性": 5,      # 影响学习和领悟速度
+        "机缘": 5       # 影响奇遇概率
+    }
+    INITIAL_RESOURCES = {
+        "灵石": 100,    # 基础货币
+        "灵药": 0,      # 炼丹材料
+        "法器": 0,      # 装备
+        "丹药": 0       # 消耗品
+    }
+    INITIAL_SKILLS = {
+        "基础修炼": 1,
+        "炼丹术": 0,
+        "炼器术": 0,
+        "阵法": 0,
+        "符箓": 0
+    }
+    
+    BASE_GAIN = 3               # 单次修炼的基础修为收益
+    INSIGHT_BONUS_ABOVE = 7     # 悟性高于此值时修炼额外 +1
+    BREAKTHROUGH_AT = 100       # 修为达到此值时尝试突破
+    FAILED_BREAKTHROUGH_CULTIVATION = 90  # 突破失败后修为回落到此值
+    BREAKTHROUGH_REWARD_STONES = 50
     
     def __init__(self, name: str):
         self.name = name
-        self.realm = "凡人"  # 当前境界
+        self.realm_id = realms.MORTAL  # 当前境界编号（见 game_utils.realms）
         self.cultivation = 0  # 修为值 (0-100)
         self.lifetime = 0  # 寿元
+        self.stats = dict(self.INITIAL_STATS)          # 基础属性
+        self.resources = dict(self.INITIAL_RESOURCES)  # 资源系统
+        self.skills = dict(self.INITIAL_SKILLS)        # 技能系统
+        self.achievements = []  # 成就系统
+        self.sect = None        # 所属门派（加入门派时由门派系统设置）
         
-        # 基础属性
-        self.stats = {
-            "体质": 5,      # 影响生命值和恢复速度
-            "灵根": 5,      # 影响灵气吸收效率
-            "悟性": 5,      # 影响学习和领悟速度
-            "机缘": 5       # 影响奇遇概率
-        }
+    @property
+    def realm(self) -> str:
+        """当前境界名称"""
+        return realms.NAMES[self.realm_id]
         
-        # 资源系统
-        self.resources = {
-            "灵石": 100,    # 基础货币
-            "灵药": 0,      # 炼丹材料
-            "法器": 0,      # 装备
-            "丹药": 0       # 消耗品
-        }
+    @realm.setter
+    def realm(self, name: str):
+        self.realm_id = realms.realm_id(name)
         
-        # 技能系统
-        self.skills = {
-            "基础修炼": 1,
-            "炼丹术": 0,
-            "炼器术": 0,
-            "阵法": 0,
-            "符箓": 0
-        }
-        
-        # 成就系统
-        self.achievements = []
-        
-    def cultivate(self):
-        """修炼行为"""
-        base_gain = 3
+    def cultivation_gain(self) -> int:
+        """单次修炼的修为收益"""
         # 根据灵根属性增加收益
-        gain = base_gain + (self.stats['灵根'] // 2)
+        gain = self.BASE_GAIN + (self.stats['灵根'] // 2)
         # 根据悟性增加额外收益
-        if self.stats['悟性'] > 7:
+        if self.stats['悟性'] > self.INSIGHT_BONUS_ABOVE:
             gain += 1
-            
+        return gain
+        
+    def cultivate(self):
+        """修炼行为"""
+        gain = self.cultivation_gain()
         self.cultivation += gain
         
         # 检查是否突破境界
-        if self.cultivation >= 100:
+        if self.cultivation >= self.BREAKTHROUGH_AT:
             self.breakthrough()
         else:
-            print(f"修炼中...修为+{gain}，当前修为 {self.cultivation}/100")
+            echo(f"修炼中...修为+{gain}，当前修为 {self.cultivation}/100")
+            
+    def seclude(self, turns: int, spirit_factor: float = 1.0) -> Dict[str, int]:
+        """闭关修炼若干回合，按闭式计算，结果与逐回合修炼同分布，返回修为增长与突破情况
+        
+        spirit_factor 为闭关期间平均灵气浓度相对基准值的倍数。
+        两次突破之间每回合收益不变，到达门槛所需回合数可直接算出；突破失败不改变属性，
+        之后每隔固定回合重试一次，成功概率不变，失败次数按几何分布一次抽出。
+        耗时只与成功突破的次数有关，与回合数无关。
+        """
+        start_realm = self.realm_id
+        gained = 0
+        attempts = 0
+        remaining = turns
+        while remaining > 0:
+            gain = max(1, round(self.cultivation_gain() * spirit_factor))
+            first = max(1, -(-(self.BREAKTHROUGH_AT - self.cultivation) // gain))  # 第一次尝试突破在第几回合
+            if first > remaining:
+                self.cultivation += gain * remaining
+                gained += gain * remaining
+                break
+                
+            if self.realm_id >= realms.HIGHEST:
+                # 已达最高境界：之后每回合都会“尝试”一次，修为照常累加
+                attempts += remaining - first + 1
+                self.cultivation += gain * remaining
+                gained += gain * remaining
+                break
+                
+            # 失败后修为回落，每隔 retry 回合再试一次
+            retry = max(1, -(-(self.BREAKTHROUGH_AT - self.FAILED_BREAKTHROUGH_CULTIVATION) // gain))
+            chances = 1 + (remaining - first) // retry  # 剩余回合内能尝试的次数
+            luck_needed = realms.BREAKTHROUGH_COST[self.realm_id] - self.stats['机缘']  # 1d10 需超过此值
+            success_rate = min(10, max(0, 10 - luck_needed)) / 10
+            failures = self._failures_before_success(success_rate, chances)
             
+            attempts += min(failures + 1, chances)
+            if failures >= chances:
+                # 全部失败：停在最后一次失败之后
+                last_attempt = first + (chances - 1) * retry
+                gained += gain * remaining
+                self.cultivation = self.FAILED_BREAKTHROUGH_CULTIVATION + gain * (remaining - last_attempt)
+                break
+                
+            success_turn = first + failures * retry
+            gained += gain * success_turn
+            remaining -= success_turn
+            self.realm_id += 1
+            self.cultivation = 0
+            self.stats['体质'] += 1
+            self.stats['灵根'] += 1
+            self.resources['灵石'] += self.BREAKTHROUGH_REWARD_STONES
+        return {
+            'turns': turns,
+            'cultivation_gained': gained,
+            'breakthrough_attempts': attempts,
+            'realms_gained': self.realm_id - start_realm
+        }
+        
+    @staticmethod
+    def _failures_before_success(success_rate: float, limit: int) -> int:
+        """首次成功前的失败次数（几何分布），不超过 limit"""
+        if success_rate >= 1:
+            return 0
+        if success_rate <= 0:
+            return limit
+        failures = math.floor(math.log(1.0 - _rng.random()) / math.log(1.0 - success_rate))
+        return min(failures, limit)
+        
     def breakthrough(self):
         """境界突破"""
-        current_index = self.REALMS.index(self.realm)
-        
-        if current_index < len(self.REALMS) - 1:
-            next_realm = self.REALMS[current_index + 1]
-            breakthrough_cost = (current_index + 1) * 20
+        if self.realm_id < realms.HIGHEST:
+            breakthrough_cost = realms.BREAKTHROUGH_COST[self.realm_id]
             
             # 检查是否满足突破条件
-            if self.stats['机缘'] + random.randint(1, 10) > breakthrough_cost:
-                self.realm = next_realm
+            if self.stats['机缘'] + _rng.randint(1, 10) > breakthrough_cost:
+                self.realm_id += 1
                 self.cultivation = 0
-                print(f"🎉 突破成功！境界提升至 {self.realm}")
+                echo(f"🎉 突破成功！境界提升至 {self.realm}")
                 
                 # 突破奖励
                 self.stats['体质'] += 1
                 self.stats['灵根'] += 1
-                self.add_resource('灵石', 50)
+                self.add_resource('灵石', self.BREAKTHROUGH_REWARD_STONES)
             else:
-                print("突破失败，需要更多积累...")
-                self.cultivation = 90  # 失败后修为下降
+                echo("突破失败，需要更多积累...")
+                self.cultivation = self.FAILED_BREAKTHROUGH_CULTIVATION  # 失败后修为下降
         else:
-            print("已达最高境界！")
+            echo("已达最高境界！")
             
     def add_resource(self, resource_type: str, amount: int):
         """添加资源"""
         if resource_type in self.resources:
             self.resources[resource_type] += amount
-            print(f"获得 {resource_type} x{amount}")
+            echo(f"获得 {resource_type} x{amount}")
         else:
-            print(f"未知资源类型：{resource_type}")
+            echo(f"未知资源类型：{resource_type}")
             
     def consume_resource(self, resource_type: str, amount: int) -> bool:
         """消耗资源"""
@@ -109,7 +196,7 @@ class Player:
         """学习技能"""
         if skill_name in self.skills:
             self.skills[skill_name] += 1
-            print(f"{skill_name} 等级提升至 {self.skills[skill_name]}")
+            echo(f"{skill_name} 等级提升至 {self.skills[skill_name]}")
             return True
         return False
         
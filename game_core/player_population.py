@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+玩家群体
+在一个进程中托管大量玩家与模拟角色：属性、资源、技能按玩家编号存放在定长类型数组中
+（每人一行，列顺序同 Player.INITIAL_STATS 等），修炼与突破对整个群体批量计算。
+单个玩家的存档数据与 Player.get_save_data / load_from_data 的格式相同，可以互相转换。
+"""
+
+from typing import Dict
+
+import numpy as np
+
+from game_core.player import Player
+from game_utils import realms
+from game_utils.rng import numpy_stream
+
+class PlayerPopulation:
+    """玩家群体（按列存储）"""
+    
+    STAT_NAMES = tuple(Player.INITIAL_STATS)
+    RESOURCE_NAMES = tuple(Player.INITIAL_RESOURCES)
+    SKILL_NAMES = tuple(Player.INITIAL_SKILLS)
+    
+    COLUMNS = ('alive', 'realm_id', 'cultivation', 'lifetime', 'stats', 'resources', 'skills')
+    
+    def __init__(self, capacity: int = 16, rng: np.random.Generator = None):
+        self.rng = rng if rng is not None else numpy_stream("player")
+        self.capacity = 0
+        self.count = 0
+        self.alive = np.zeros(0, dtype=bool)
+        self.realm_id = np.zeros(0, dtype=np.int8)
+        self.cultivation = np.zeros(0, dtype=np.int32)
+        self.lifetime = np.zeros(0, dtype=np.int32)
+        self.stats = np.zeros((0, len(self.STAT_NAMES)), dtype=np.int32)
+        self.resources = np.zeros((0, len(self.RESOURCE_NAMES)), dtype=np.int64)
+        self.skills = np.zeros((0, len(self.SKILL_NAMES)), dtype=np.int32)
+        self.names = []         # 玩家编号 -> 名字
+        self.achievements = []  # 玩家编号 -> 成就列表
+        self.extra = {}         # 玩家编号 -> 不在固定列中的属性/资源/技能（随存档原样保留）
+        self._stat = {name: i for i, name in enumerate(self.STAT_NAMES)}
+        self._resize(capacity)
+        
+    def _resize(self, capacity: int):
+        for column in self.COLUMNS:
+            old = getattr(self, column)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, column, new)
+        self.names.extend([None] * (capacity - self.capacity))
+        self.achievements.extend([None] * (capacity - self.capacity))
+        self.capacity = capacity
+        
+    def __len__(self) -> int:
+        return self.count
+        
+    @property
+    def nbytes(self) -> int:
+        """各列占用的字节数"""
+        return sum(getattr(self, column).nbytes for column in self.COLUMNS)
+        
+    def ids(self) -> np.ndarray:
+        """所有玩家的编号（升序）"""
+        return np.flatnonzero(self.alive)
+        
+    def add(self, name: str, data: Dict = None) -> int:
+        """加入一名新玩家（可带存档数据），返回玩家编号"""
+        free = np.flatnonzero(~self.alive)
+        if len(free) == 0:
+            self._resize(max(16, self.capacity * 2))
+            free = np.flatnonzero(~self.alive)
+        player_id = int(free[0])
+        self.alive[player_id] = True
+        self.count += 1
+        self.realm_id[player_id] = realms.MORTAL
+        self.cultivation[player_id] = 0
+        self.lifetime[player_id] = 0
+        self.stats[player_id] = list(Player.INITIAL_STATS.values())
+        self.resources[player_id] = list(Player.INITIAL_RESOURCES.values())
+        self.skills[player_id] = list(Player.INITIAL_SKILLS.values())
+        self.names[player_id] = name
+        self.achievements[player_id] = []
+        self.extra.pop(player_id, None)
+        if data is not None:
+            self.load_from_data(player_id, data)
+        return player_id
+        
+    def add_player(self, player: Player) -> int:
+        """按现有玩家对象的数据加入群体"""
+        return self.add(player.name, player.get_save_data())
+        
+    def remove(self, player_id: int):
+        """移除玩家，编号留给之后加入的玩家"""
+        if self.alive[player_id]:
+            self.alive[player_id] = False
+            self.count -= 1
+            self.names[player_id] = None
+            self.achievements[player_id] = None
+            self.extra.pop(player_id, None)
+            
+    def get_save_data(self, player_id: int) -> Dict:
+        """单个玩家的存档数据（格式同 Player.get_save_data）"""
+        extra = self.extra.get(player_id, {})
+        return {
+            'name': self.names[player_id],
+            'realm': realms.NAMES[self.realm_id[player_id]],
+            'cultivation': int(self.cultivation[player_id]),
+            'lifetime': int(self.lifetime[player_id]),
+            'stats': {**dict(zip(self.STAT_NAMES, self.stats[player_id].tolist())), **extra.get('stats', {})},
+            'resources': {**dict(zip(self.RESOURCE_NAMES, self.resources[player_id].tolist())),
+                          **extra.get('resources', {})},
+            'skills': {**dict(zip(self.SKILL_NAMES, self.skills[player_id].tolist())), **extra.get('skills', {})},
+            'achievements': list(self.achievements[player_id])
+        }
+        
+    def load_from_data(self, player_id: int, data: Dict):
+        """从存档数据恢复单个玩家（缺省字段保持原值，同 Player.load_from_data）"""
+        self.names[player_id] = data.get('name', self.names[player_id])
+        if 'realm' in data:
+            self.realm_id[player_id] = realms.realm_id(data['realm'])
+        self.cultivation[player_id] = data.get('cultivation', self.cultivation[player_id])
+        self.lifetime[player_id] = data.get('lifetime', self.lifetime[player_id])
+        for field, names in (('stats', self.STAT_NAMES), ('resources', self.RESOURCE_NAMES),
+                             ('skills', self.SKILL_NAMES)):
+            column = getattr(self, field)
+            for key, value in data.get(field, {}).items():
+                if key in names:
+                    column[player_id, names.index(key)] = value
+                else:
+                    self.extra.setdefault(player_id, {}).setdefault(field, {})[key] = value
+        self.achievements[player_id] = list(data.get('achievements', []))
+        
+    def to_player(self, player_id: int) -> Player:
+        """取出为独立的 Player 对象"""
+        player = Player(self.names[player_id])
+        player.load_from_data(self.get_save_data(player_id))
+        return player
+        
+    def stat(self, name: str) -> np.ndarray:
+        """某项属性的整列视图（可原地修改）"""
+        return self.stats[:, self._stat[name]]
+        
+    def cultivation_gain(self, player_ids: np.ndarray) -> np.ndarray:
+        """单次修炼的修为收益（规则同 Player.cultivation_gain）"""
+        stats = self.stats[player_ids]
+        return (Player.BASE_GAIN + stats[:, self._stat['灵根']] // 2 +
+                (stats[:, self._stat['悟性']] > Player.INSIGHT_BONUS_ABOVE))
+                
+    def cultivate(self, player_ids: np.ndarray = None) -> Dict[str, np.ndarray]:
+        """全体（或指定玩家）修炼一次，修为达到门槛的玩家随即尝试突破"""
+        player_ids = self.ids() if player_ids is None else np.asarray(player_ids)
+        self.cultivation[player_ids] += self.cultivation_gain(player_ids).astype(self.cultivation.dtype)
+        ready = player_ids[self.cultivation[player_ids] >= Player.BREAKTHROUGH_AT]
+        return self.breakthrough(ready)
+        
+    def breakthrough(self, player_ids: np.ndarray) -> Dict[str, np.ndarray]:
+        """批量尝试突破（规则同 Player.breakthrough），返回成功与失败的玩家编号"""
+        player_ids = np.asarray(player_ids, dtype=np.intp)
+        # 已达最高境界的玩家不再突破，修为保持不变
+        player_ids = player_ids[self.realm_id[player_ids] < realms.HIGHEST]
+        cost = np.array(realms.BREAKTHROUGH_COST)[self.realm_id[player_ids]]
+        luck = self.stats[player_ids, self._stat['机缘']] + self.rng.integers(1, 11, len(player_ids))
+        succeeded = player_ids[luck > cost]
+        failed = player_ids[luck <= cost]
+        
+        self.realm_id[succeeded] += 1
+        self.cultivation[succeeded] = 0
+        self.stats[succeeded, self._stat['体质']] += 1
+        self.stats[succeeded, self._stat['灵根']] += 1
+        self.resources[succeeded, self.RESOURCE_NAMES.index('灵石')] += Player.BREAKTHROUGH_REWARD_STONES
+        self.cultivation[failed] = Player.FAILED_BREAKTHROUGH_CULTIVATION
+        return {'succeeded': succeeded, 'failed': failed}
+        
+    def realm_counts(self) -> Dict[str, int]:
+        """各境界的人数"""
+        counts = np.bincount(self.realm_id[self.alive], minlength=len(realms.NAMES))
+        return dict(zip(realms.NAMES, counts.tolist()))
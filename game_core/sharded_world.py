@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分片多地区世界模拟
+每个地区是一个独立分片（自己的 NPC 群体、天气灵气和地区事件），各分片在
+ProcessPoolExecutor 上并行推进；跨地区的 NPC 迁移在回合边界以批量消息交换。
+
+分片对象本身随任务在进程间传递：工作进程推进一段回合后把分片连同发往
+其他地区的迁移批次一起返回，主进程按目的地分拣后作为下一段的迁入消息。
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from game_core.npc_population import NPCPopulation
+from game_core.world_simulator import WorldSimulator
+from game_modules.world_building import WorldGeography
+from game_utils.event_store import EventStore
+
+def all_regions() -> List[str]:
+    """全部地区：世界模拟器的十个地点与地理志中的地点（去重，保持顺序）"""
+    regions = list(WorldSimulator.ALL_LOCATIONS)
+    for location in WorldGeography().locations:
+        if location not in regions:
+            regions.append(location)
+    return regions
+
+class RegionShard:
+    """单个地区分片"""
+    
+    MIGRATION_CHANCE = 0.01  # 每回合每人迁往其他地区的概率
+    
+    def __init__(self, region: str, neighbours: List[str], npcs: int, seed: int):
+        self.region = region
+        self.neighbours = neighbours  # 可迁往的地区
+        self.rng = np.random.default_rng(seed)
+        self.population = NPCPopulation([region], npcs, self.rng, indexed=False)
+        self.population.spawn(npcs)
+        self.events = EventStore()
+        self.tick_count = 0
+        self.weather = WorldSimulator.WEATHERS[0]
+        self.spirit = WorldSimulator.BASE_SPIRIT
+        self.stats = {'died': 0, 'spawned': 0, 'broke_through': 0, 'emigrated': 0, 'immigrated': 0}
+        
+    def run(self, ticks: int, arrivals: List[Dict[str, np.ndarray]]) -> Dict[str, List[Dict[str, np.ndarray]]]:
+        """先接收迁入批次，再推进若干回合，返回按目的地分组的迁出批次"""
+        population = self.population
+        for batch in arrivals:
+            population.insert(batch)
+            self.stats['immigrated'] += len(batch['age'])
+            
+        outbox = {}
+        for _ in range(ticks):
+            self.tick_count += 1
+            self._update_climate()
+            self.events.expire(self.tick_count)
+            if self.rng.random() < WorldSimulator.REGIONAL_EVENT_CHANCE:
+                event = WorldSimulator.REGIONAL_EVENTS[self.rng.integers(len(WorldSimulator.REGIONAL_EVENTS))]
+                self.events.add(dict(event), self.tick_count, self.region)
+                
+            changes = population.step()
+            for key in ('died', 'spawned', 'broke_through'):
+                self.stats[key] += len(changes[key])
+            for destination, batch in self._emigrate().items():
+                outbox.setdefault(destination, []).append(batch)
+        return outbox
+        
+    def _update_climate(self):
+        """本地区的天气与灵气"""
+        weathers = WorldSimulator.WEATHERS
+        self.weather = weathers[self.rng.choice(len(weathers), p=WorldSimulator.WEATHER_WEIGHTS)]
+        season = WorldSimulator.SEASONS[(self.tick_count // 4) % 4]
+        spirit = (WorldSimulator.BASE_SPIRIT + WorldSimulator.SEASON_MODIFIER[season] +
+                  WorldSimulator.WEATHER_MODIFIER[self.weather] + int(self.rng.integers(-10, 11)))
+        self.spirit = max(10, min(100, spirit))
+        
+    def _emigrate(self) -> Dict[str, Dict[str, np.ndarray]]:
+        """按概率挑出迁出者，按目的地打包"""
+        population = self.population
+        if not self.neighbours:
+            return {}
+        leaving = np.flatnonzero(population.alive & (self.rng.random(population.capacity) < self.MIGRATION_CHANCE))
+        if not len(leaving):
+            return {}
+        destinations = self.rng.integers(0, len(self.neighbours), len(leaving))
+        batch = population.extract(leaving)
+        self.stats['emigrated'] += len(leaving)
+        outbox = {}
+        for destination in np.unique(destinations):
+            selected = destinations == destination
+            outbox[self.neighbours[destination]] = {column: values[selected] for column, values in batch.items()}
+        return outbox
+        
+    def summary(self) -> Dict:
+        """分片概况"""
+        realms = np.bincount(self.population.realm_id[self.population.alive],
+                             minlength=len(NPCPopulation.REALMS))
+        return {
+            'population': len(self.population),
+            'realms': dict(zip(NPCPopulation.REALMS, realms.tolist())),
+            'weather': self.weather,
+            'spirit': self.spirit,
+            'events': len(self.events),
+            **self.stats
+        }
+
+def _run_shard(task: Tuple[RegionShard, int, List[Dict[str, np.ndarray]]]):
+    """工作进程入口：推进一个分片，返回分片与迁出批次"""
+    shard, ticks, arrivals = task
+    outbox = shard.run(ticks, arrivals)
+    return shard, outbox
+
+class ShardedWorld:
+    """多地区分片世界"""
+    
+    def __init__(self, regions: List[str] = None, npcs_per_region: int = 1000,
+                 workers: int = None, seed: int = 0):
+        self.regions = regions or all_regions()
+        self.workers = os.cpu_count() if workers is None else workers  # 0 或 1 时在本进程内顺序推进
+        seeds = np.random.SeedSequence(seed).spawn(len(self.regions))
+        self.shards = [
+            RegionShard(region, [other for other in self.regions if other != region], npcs_per_region,
+                        int(region_seed.generate_state(1)[0]))
+            for region, region_seed in zip(self.regions, seeds)
+        ]
+        self.inboxes = {region: [] for region in self.regions}  # 下一段开始时各地区的迁入批次
+        self.tick_count = 0
+        self._executor = None
+        
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        
+    def close(self):
+        """关闭进程池"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+            
+    def _map(self, tasks):
+        if self.workers <= 1:
+            return map(_run_shard, tasks)
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor.map(_run_shard, tasks)
+        
+    def run(self, ticks: int, exchange_every: int = 1) -> Dict:
+        """推进 ticks 回合；每 exchange_every 回合在边界交换一次迁移消息"""
+        start = time.perf_counter()
+        migrations = 0
+        remaining = ticks
+        while remaining > 0:
+            step = min(exchange_every, remaining)
+            tasks = [(shard, step, self.inboxes[shard.region]) for shard in self.shards]
+            results = list(self._map(tasks))
+            
+            self.shards = [shard for shard, _ in results]
+            self.inboxes = {region: [] for region in self.regions}
+            for _, outbox in results:
+                for destination, batches in outbox.items():
+                    self.inboxes[destination].extend(batches)
+                    migrations += sum(len(batch['age']) for batch in batches)
+            remaining -= step
+            self.tick_count += step
+            
+        elapsed = time.perf_counter() - start
+        return {
+            'ticks': ticks,
+            'elapsed': elapsed,
+            'ticks_per_second': ticks / elapsed if elapsed > 0 else float('inf'),
+            'migrations': migrations,
+            'population': self.population()
+        }
+        
+    def population(self) -> int:
+        """全部地区的 NPC 总数（含途中尚未迁入的）"""
+        in_transit = sum(len(batch['age']) for batches in self.inboxes.values() for batch in batches)
+        return sum(len(shard.population) for shard in self.shards) + in_transit
+        
+    def region_summaries(self) -> Dict[str, Dict]:
+        """各地区概况"""
+        return {shard.region: shard.summary() for shard in self.shards}
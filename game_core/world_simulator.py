@@ -5,68 +5,89 @@
 负责生成和管理游戏世界的动态内容
 """
 
-import random
 from typing import Dict, List
 from datetime import datetime
 
+import numpy as np
+
+from game_core.npc_population import NPCPopulation
+from game_utils.event_store import EventStore
+from game_utils.renderer import echo
+from game_utils.rng import stream, numpy_stream
+
+_rng = stream("world")  # 本模块的随机数流
+
 class WorldSimulator:
     """世界模拟器类"""
     
-    def __init__(self):
+    ALL_LOCATIONS = [
+        "青云山脉", "幽冥谷", "天机城", "万宝阁",
+        "紫霄宫", "血魔宗", "逍遥派", "昆仑仙境",
+        "蓬莱岛", "九幽冥府"
+    ]
+    
+    SEASONS = ['春季', '夏季', '秋季', '冬季']
+    WEATHERS = ['晴朗', '多云', '小雨', '雷暴', '大雾']
+    WEATHER_WEIGHTS = [0.4, 0.3, 0.15, 0.1, 0.05]
+    BASE_SPIRIT = 50
+    SEASON_MODIFIER = {'春季': 10, '夏季': 5, '秋季': 0, '冬季': -5}
+    WEATHER_MODIFIER = {'晴朗': 5, '多云': 0, '小雨': -3, '雷暴': 15, '大雾': -10}
+    WORLD_EVENT_CHANCE = 0.15
+    REGIONAL_EVENT_CHANCE = 0.1
+    MAX_EVENT_DURATION = 5  # 世界事件与地区事件的最长持续回合
+    REGIONAL_EVENTS = [
+        {'name': '秘境开启', 'description': '此地秘境入口显现', 'effect': '探索收获提升', 'duration': 4},
+        {'name': '兽潮', 'description': '妖兽成群出没', 'effect': '战斗频繁', 'duration': 3},
+        {'name': '宝物出世', 'description': '有宝光冲天而起', 'effect': '可能寻得法宝', 'duration': 2}
+    ]
+    
+    def __init__(self, max_npcs: int = 10, index_npcs: bool = True):
         self.world_state = {
             'season': '春季',
             'weather': '晴朗',
             '灵气浓度': 50,
-            'world_events': [],
-            'npc_cultivators': [],
             'locations': self._generate_locations()
         }
         self.time_cycle = 0
+        self.events = EventStore()  # 进行中的世界事件与地区事件，按到期回合组织
+        self.rng = numpy_stream("world")  # 批量抽样用的 NumPy 随机数流
+        # NPC 修士按列存储；百万级群体只做批量模拟、不需要按条件查询时，可关闭索引省去每回合的维护开销
+        self.npcs = NPCPopulation(self.world_state['locations'], max_npcs, self.rng, indexed=index_npcs)
         
     def _generate_locations(self) -> List[str]:
         """生成世界地点"""
-        locations = [
-            "青云山脉", "幽冥谷", "天机城", "万宝阁",
-            "紫霄宫", "血魔宗", "逍遥派", "昆仑仙境",
-            "蓬莱岛", "九幽冥府"
-        ]
-        return locations[:6]  # 初始开放6个地点
+        return self.ALL_LOCATIONS[:6]  # 初始开放6个地点
         
     def update_world_state(self):
         """更新世界状态"""
         self.time_cycle += 1
         
         # 季节变化
-        seasons = ['春季', '夏季', '秋季', '冬季']
-        self.world_state['season'] = seasons[(self.time_cycle // 4) % 4]
+        self.world_state['season'] = self.SEASONS[(self.time_cycle // 4) % 4]
         
         # 天气变化
-        weathers = ['晴朗', '多云', '小雨', '雷暴', '大雾']
-        weather_weights = [0.4, 0.3, 0.15, 0.1, 0.05]
-        self.world_state['weather'] = random.choices(weathers, weights=weather_weights)[0]
+        self.world_state['weather'] = _rng.choices(self.WEATHERS, weights=self.WEATHER_WEIGHTS)[0]
         
         # 灵气浓度波动
-        base_spirit = 50
-        season_modifier = {'春季': 10, '夏季': 5, '秋季': 0, '冬季': -5}
-        weather_modifier = {'晴朗': 5, '多云': 0, '小雨': -3, '雷暴': 15, '大雾': -10}
-        
-        spirit_level = (base_spirit + 
-                       season_modifier[self.world_state['season']] + 
-                       weather_modifier[self.world_state['weather']] +
-                       random.randint(-10, 10))
+        spirit_level = (self.BASE_SPIRIT + 
+                       self.SEASON_MODIFIER[self.world_state['season']] + 
+                       self.WEATHER_MODIFIER[self.world_state['weather']] +
+                       _rng.randint(-10, 10))
         self.world_state['灵气浓度'] = max(10, min(100, spirit_level))
         
-        # 生成世界事件
+        # 清理到期事件，再生成新事件
+        self.events.expire(self.time_cycle)
         self._generate_world_events()
         
         # 更新NPC状态
         self._update_npc_states()
         
-    def _generate_world_events(self):
-        """生成世界事件"""
-        event_chance = random.random()
+    def _generate_world_events(self) -> int:
+        """生成世界事件，返回本回合新增的事件数"""
+        generated = 0
+        event_chance = _rng.random()
         
-        if event_chance < 0.15:  # 15%概率生成事件
+        if event_chance < self.WORLD_EVENT_CHANCE:  # 15%概率生成事件
             events = [
                 {
                     'name': '灵气潮汐',
@@ -94,41 +115,108 @@ class WorldSimulator:
                 }
             ]
             
-            event = random.choice(events)
-            event['start_time'] = self.time_cycle
-            self.world_state['world_events'].append(event)
-            
-            # 清理过期事件
-            self.world_state['world_events'] = [
-                e for e in self.world_state['world_events'] 
-                if self.time_cycle - e['start_time'] < e['duration']
-            ]
+            event = _rng.choice(events)
+            self.events.add(event, self.time_cycle)
+            generated += 1
             
-    def _update_npc_states(self):
-        """更新NPC状态"""
-        # 生成新的NPC修士
-        if len(self.world_state['npc_cultivators']) < 10 and random.random() < 0.3:
-            npc = self._generate_npc_cultivator()
-            self.world_state['npc_cultivators'].append(npc)
-            
-        # 更新现有NPC位置和状态
-        for npc in self.world_state['npc_cultivators']:
-            if random.random() < 0.4:  # 40%概率移动
-                npc['location'] = random.choice(self.world_state['locations'])
-                
-    def _generate_npc_cultivator(self) -> Dict:
-        """生成NPC修士"""
-        realms = ["练气期", "筑基期", "金丹期", "元婴期"]
-        names = ["李青云", "王玄机", "张无忌", "赵敏", "周芷若", "小龙女", "杨过", "令狐冲"]
+        if _rng.random() < self.REGIONAL_EVENT_CHANCE:  # 10%概率在某地发生地区事件
+            self.add_regional_event(_rng.choice(self.world_state['locations']),
+                                    _rng.choice(self.REGIONAL_EVENTS))
+            generated += 1
+        return generated
+        
+    def add_regional_event(self, location: str, event: Dict, start_time: int = None) -> int:
+        """在指定地点加入限时事件，返回事件编号"""
+        start_time = self.time_cycle if start_time is None else start_time
+        return self.events.add(dict(event), start_time, location)
+        
+    def fast_forward(self, n_ticks: int) -> Dict:
+        """快进 n_ticks 个世界回合（闭关等场景），一次性批量抽样，返回期间概况
+        
+        天气与灵气按回合整列抽样；NPC 用 NPCPopulation.advance 按闭式近似批量推进；
+        期间到期的事件直接清理，只逐回合模拟最后几个回合的事件生成（更早生成的事件在结束时已到期）。
+        """
+        if n_ticks <= 0:
+            return {'ticks': 0}
+        rng = self.rng
+        start = self.time_cycle
+        ticks = np.arange(start + 1, start + n_ticks + 1)
+        
+        season_ids = (ticks // 4) % 4
+        weather_ids = rng.choice(len(self.WEATHERS), size=n_ticks, p=self.WEATHER_WEIGHTS)
+        season_modifier = np.array([self.SEASON_MODIFIER[season] for season in self.SEASONS])
+        weather_modifier = np.array([self.WEATHER_MODIFIER[weather] for weather in self.WEATHERS])
+        spirit = np.clip(self.BASE_SPIRIT + season_modifier[season_ids] + weather_modifier[weather_ids] +
+                         rng.integers(-10, 11, n_ticks), 10, 100)
         
+        # 事件：只有最后 max_duration 个回合生成的事件在快进结束时仍可能进行中
+        tail = min(n_ticks, self.MAX_EVENT_DURATION)
+        world_events = int(rng.binomial(n_ticks - tail, self.WORLD_EVENT_CHANCE))
+        regional_events = int(rng.binomial(n_ticks - tail, self.REGIONAL_EVENT_CHANCE))
+        self.time_cycle = start + n_ticks - tail
+        self.events.expire(self.time_cycle)
+        for _ in range(tail):
+            self.time_cycle += 1
+            self.events.expire(self.time_cycle)
+            world_events += self._generate_world_events()
+        
+        npc_changes = self.npcs.advance(n_ticks)
+        
+        self.world_state['season'] = self.SEASONS[season_ids[-1]]
+        self.world_state['weather'] = self.WEATHERS[weather_ids[-1]]
+        self.world_state['灵气浓度'] = int(spirit[-1])
+        
+        weather_counts = np.bincount(weather_ids, minlength=len(self.WEATHERS))
         return {
-            'name': random.choice(names),
-            'realm': random.choice(realms),
-            'personality': random.choice(['友善', '冷漠', '狡诈', '正直']),
-            'location': random.choice(self.world_state['locations']),
-            'relationship': '陌生'  # 与玩家的关系
+            'ticks': n_ticks,
+            'spirit_mean': float(spirit.mean()),
+            'spirit_min': int(spirit.min()),
+            'spirit_max': int(spirit.max()),
+            'weather_counts': dict(zip(self.WEATHERS, weather_counts.tolist())),
+            'events': world_events + regional_events,
+            'npcs_died': npc_changes['died'],
+            'npcs_spawned': npc_changes['spawned'],
+            'npc_breakthroughs': npc_changes['broke_through']
         }
         
+    def _update_npc_states(self):
+        """更新NPC状态（移动、出生、衰老按整列批量计算）"""
+        return self.npcs.step()
+        
+    @property
+    def max_npcs(self) -> int:
+        """NPC 修士数量上限"""
+        return self.npcs.capacity
+        
+    @max_npcs.setter
+    def max_npcs(self, value: int):
+        self.npcs.resize(value)
+        
+    def populate(self, n: int):
+        """立即生成 n 个 NPC 修士（不超过上限）"""
+        return self.npcs.spawn(n)
+        
+    def get_save_data(self) -> Dict:
+        """获取存档数据（NPC 与事件展开为字典列表）"""
+        save_data = dict(self.world_state)
+        save_data['world_events'] = self.events.all_events()
+        save_data['npc_cultivators'] = self.npcs.records()
+        save_data['time_cycle'] = self.time_cycle
+        save_data['max_npcs'] = self.max_npcs
+        return save_data
+        
+    def load_from_data(self, data: Dict):
+        """从存档数据恢复世界状态"""
+        data = dict(data)
+        npcs = data.pop('npc_cultivators', [])
+        self.events.load(data.pop('world_events', []))
+        self.time_cycle = data.pop('time_cycle', self.time_cycle)
+        self.max_npcs = max(data.pop('max_npcs', self.max_npcs), len(npcs))
+        # 地点表与 NPC 群体共用同一个列表对象，原地更新
+        self.world_state['locations'][:] = data.pop('locations', self.world_state['locations'])
+        self.world_state.update(data)
+        self.npcs.load_records(npcs)
+        
     def get_current_weather(self) -> str:
         """获取当前天气"""
         return self.world_state['weather']
@@ -137,16 +225,33 @@ class WorldSimulator:
         """获取当前灵气浓度"""
         return self.world_state['灵气浓度']
         
-    def get_active_events(self) -> List[Dict]:
-        """获取当前活动事件"""
-        return self.world_state['world_events']
+    def get_active_events(self, location: str = None) -> List[Dict]:
+        """获取当前活动事件（指定地点时包含该地的地区事件）"""
+        return self.events.active_near(location)
         
     def get_nearby_cultivators(self, location: str = None) -> List[Dict]:
         """获取附近的修士"""
         if location:
-            return [npc for npc in self.world_state['npc_cultivators'] 
-                   if npc['location'] == location]
-        return self.world_state['npc_cultivators'][:3]  # 返回最近的3个
+            return self.find_cultivators(location=location)
+        return self.find_cultivators(limit=3)  # 返回最近的3个
+        
+    def find_cultivators(self, location: str = None, realm: str = None, personality: str = None,
+                         limit: int = None) -> List[Dict]:
+        """按地点、境界、性格查询修士（走索引，耗时与结果数量成正比）"""
+        npcs = self.npcs
+        try:
+            location_id = None if location is None else npcs.locations.index(location)
+            realm_id = None if realm is None else npcs.REALMS.index(realm)
+            personality_id = None if personality is None else npcs.PERSONALITIES.index(personality)
+        except ValueError:
+            return []
+        return npcs.records(npcs.find(location_id, realm_id, personality_id, limit))
+        
+    def count_cultivators_by_location(self) -> Dict[str, int]:
+        """各地点的修士数量"""
+        locations = self.npcs.locations
+        return {locations[location_id]: count
+                for location_id, count in self.npcs.count_by('location_id').items()}
         
     def get_available_locations(self) -> List[str]:
         """获取可前往的地点"""
@@ -155,7 +260,7 @@ class WorldSimulator:
     def travel_to_location(self, location: str) -> bool:
         """前往指定地点"""
         if location in self.world_state['locations']:
-            print(f"前往 {location}...")
+            echo(f"前往 {location}...")
             # 可以添加旅行时间和事件
             return True
         return False
\ No newline at end of file
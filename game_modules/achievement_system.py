@@ -3,10 +3,70 @@
 """
 成就系统模块
 追踪和奖励玩家达成的各种成就
+成就条件在创建时编译为谓词，并按所依赖的玩家字段（境界、修为、寿元）建立有序索引；
+每回合只比较这几个字段与上次检查时的值，仅重新评估条件刚由假变真的成就，
+成就再多，一个回合的检查也只是几次比较。
 """
 
-from typing import Dict, List
+import re
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional
 from datetime import datetime
+from game_utils import realms
+from game_utils.renderer import echo
+
+# 条件可引用的字段 -> Player 上对应的属性（境界按编号比较）
+FIELDS = {
+    'realm': 'realm_id',
+    'cultivation': 'cultivation',
+    'lifetime': 'lifetime'
+}
+# 简写 "字段:值" 的比较方式：境界、修为为“达到”，寿元为“不超过”
+DEFAULT_OPS = {
+    'realm': '>=',
+    'cultivation': '>=',
+    'lifetime': '<='
+}
+_CLAUSE = re.compile(r"^\s*(\w+)\s*(>=|<=|:)\s*(\S+?)\s*$")
+
+class Predicate:
+    """编译后的单个条件：字段 >= 值 或 字段 <= 值"""
+    
+    __slots__ = ('field', 'attribute', 'op', 'value')
+    
+    def __init__(self, field: str, op: str, value: int):
+        self.field = field
+        self.attribute = FIELDS[field]
+        self.op = op
+        self.value = value
+        
+    def test(self, value: int) -> bool:
+        """字段取值是否满足条件"""
+        return value >= self.value if self.op == '>=' else value <= self.value
+        
+    def __repr__(self) -> str:
+        return f"Predicate({self.field} {self.op} {self.value})"
+        
+def compile_condition(condition: str) -> List[Predicate]:
+    """把条件字符串编译为谓词列表（逗号分隔的各项同时满足）
+    
+    每项写作 "字段>=值"、"字段<=值"，或简写 "字段:值"（比较方式见 DEFAULT_OPS）；
+    境界的值为境界名称。格式不对或字段未知时抛出 ValueError。
+    """
+    predicates = []
+    for clause in condition.split(","):
+        match = _CLAUSE.match(clause)
+        if match is None or match.group(1) not in FIELDS:
+            raise ValueError(f"无法解析成就条件: {condition}")
+        field, op, text = match.groups()
+        if op == ':':
+            op = DEFAULT_OPS[field]
+        try:
+            value = realms.realm_id(text) if field == 'realm' else int(text)
+        except (KeyError, ValueError):
+            raise ValueError(f"无法解析成就条件: {condition}") from None
+        predicates.append(Predicate(field, op, value))
+    return predicates
 
 class Achievement:
     """成就类"""
@@ -15,63 +75,94 @@ class Achievement:
         self.name = name
         self.description = description
         self.condition = condition  # 达成条件
+        self.predicates = compile_condition(condition)  # 编译后的条件
         self.reward = reward  # 奖励
         self.unlocked = False
         self.unlock_time = None
         
+    def is_satisfied(self, player) -> bool:
+        """玩家当前是否满足全部条件"""
+        for predicate in self.predicates:
+            if not predicate.test(getattr(player, predicate.attribute)):
+                return False
+        return True
+        
     def check_unlock(self, player_stats: Dict) -> bool:
-        """检查是否达成成就"""
+        """检查是否达成成就（player_stats 为 realm/cultivation/lifetime/resources/stats 字典）"""
         if self.unlocked:
             return False
             
-        # 解析条件字符串
-        try:
-            # 简单条件检查示例
-            if "realm:" in self.condition:
-                required_realm = self.condition.split(":")[1]
-                if player_stats.get('realm') == required_realm:
-                    return self._unlock_achievement(player_stats)
-                    
-            elif "cultivation:" in self.condition:
-                required_cultivation = int(self.condition.split(":")[1])
-                if player_stats.get('cultivation', 0) >= required_cultivation:
-                    return self._unlock_achievement(player_stats)
-                    
-            elif "lifetime:" in self.condition:
-                max_lifetime = int(self.condition.split(":")[1])
-                if player_stats.get('lifetime', 0) <= max_lifetime:
-                    return self._unlock_achievement(player_stats)
-                    
-        except Exception as e:
-            print(f"成就条件解析错误: {e}")
-            
-        return False
+        for predicate in self.predicates:
+            if predicate.field == 'realm':
+                value = realms.realm_id(player_stats.get('realm', realms.NAMES[realms.MORTAL]))
+            else:
+                value = player_stats.get(predicate.field, 0)
+            if not predicate.test(value):
+                return False
+        return self._unlock_achievement(player_stats)
         
     def _unlock_achievement(self, player_stats: Dict) -> bool:
         """解锁成就"""
         self.unlocked = True
         self.unlock_time = datetime.now()
-        print(f"🎉 成就解锁：{self.name}")
-        print(f"描述：{self.description}")
+        echo(f"🎉 成就解锁：{self.name}")
+        echo(f"描述：{self.description}")
         
         # 发放奖励
         for reward_type, amount in self.reward.items():
             if reward_type == "灵石":
                 player_stats['resources']['灵石'] += amount
             elif reward_type == "属性":
-                # 假设格式为 "体质:+2"
+                # 假设格式为 "体质:+2"，"全属性" 表示每项属性都增加
                 stat, value = amount.split(":+")
-                player_stats['stats'][stat] += int(value)
-                
-        print(f"获得奖励：{self.reward}")
+                for name in (player_stats['stats'] if stat == "全属性" else [stat]):
+                    player_stats['stats'][name] += int(value)
+                    
+        echo(f"获得奖励：{self.reward}")
         return True
-
+        
+class FieldIndex:
+    """单个字段上的谓词索引：按阈值排序，取值变化时二分找出由假变真的谓词"""
+    
+    def __init__(self):
+        self.at_least = []               # ">=" 的阈值（升序）
+        self.at_least_achievements = []  # 与阈值一一对应的成就
+        self.at_most = []                # "<=" 的阈值（升序）
+        self.at_most_achievements = []
+        
+    def add(self, predicate: Predicate, achievement: Achievement):
+        """登记一个谓词"""
+        if predicate.op == '>=':
+            thresholds, achievements = self.at_least, self.at_least_achievements
+        else:
+            thresholds, achievements = self.at_most, self.at_most_achievements
+        position = bisect_right(thresholds, predicate.value)
+        thresholds.insert(position, predicate.value)
+        achievements.insert(position, achievement)
+        
+    def newly_true(self, old: Optional[int], new: int) -> List[Achievement]:
+        """取值由 old 变为 new 时条件由假变真的成就（old 为 None 时返回当前满足的全部）"""
+        found = []
+        if old is None or new > old:
+            low = 0 if old is None else bisect_right(self.at_least, old)
+            found.extend(self.at_least_achievements[low:bisect_right(self.at_least, new)])
+        if old is None or new < old:
+            high = len(self.at_most) if old is None else bisect_left(self.at_most, old)
+            found.extend(self.at_most_achievements[bisect_left(self.at_most, new):high])
+        return found
+        
 class AchievementSystem:
     """成就系统"""
     
     def __init__(self):
-        self.achievements = self._initialize_achievements()
-        
+        self.achievements = {}  # 成就名 -> 成就（按登记顺序）
+        self._order = {}        # 成就名 -> 登记序号，同回合解锁多个时按此排序
+        self._index = {}        # 字段 -> FieldIndex
+        self._player = None     # 上次检查的玩家
+        self._last = {}         # 字段 -> 上次检查时的取值
+        for achievement in self._initialize_achievements().values():
+            self.add_achievement(achievement)
+            
     def _initialize_achievements(self) -> Dict[str, Achievement]:
         """初始化成就"""
         achievements = {
@@ -108,25 +199,46 @@ class AchievementSystem:
             "长寿仙人": Achievement(
                 "长寿仙人",
                 "寿元超过500年",
-                "lifetime:500",
+                "lifetime>=500",
                 {"灵石": 1000}
             )
         }
         return achievements
         
+    def add_achievement(self, achievement: Achievement):
+        """登记成就，并把它的每个条件加入对应字段的索引"""
+        self._order[achievement.name] = len(self._order)
+        self.achievements[achievement.name] = achievement
+        for predicate in achievement.predicates:
+            self._index.setdefault(predicate.field, FieldIndex()).add(predicate, achievement)
+            # 下次检查时该字段按“从未检查过”处理，新成就随之得到评估
+            self._last.pop(predicate.field, None)
+            
     def check_achievements(self, player) -> List[str]:
-        """检查所有成就"""
+        """检查成就：只评估依赖字段有变化、且有条件刚由假变真的未解锁成就"""
+        if player is not self._player:
+            # 换了玩家（如读档）：所有字段重新评估
+            self._player = player
+            self._last = {}
+            
+        candidates = {}
+        for field, index in self._index.items():
+            value = getattr(player, FIELDS[field])
+            old = self._last.get(field)
+            if value == old:
+                continue
+            self._last[field] = value
+            for achievement in index.newly_true(old, value):
+                if not achievement.unlocked:
+                    candidates[achievement.name] = achievement
+        if not candidates:
+            return []
+            
         unlocked = []
-        player_stats = {
-            'realm': player.realm,
-            'cultivation': player.cultivation,
-            'lifetime': player.lifetime,
-            'resources': player.resources,
-            'stats': player.stats
-        }
-        
-        for name, achievement in self.achievements.items():
-            if achievement.check_unlock(player_stats):
+        player_stats = {'resources': player.resources, 'stats': player.stats}
+        for name in sorted(candidates, key=self._order.__getitem__):
+            achievement = candidates[name]
+            if achievement.is_satisfied(player) and achievement._unlock_achievement(player_stats):
                 unlocked.append(name)
                 
         return unlocked
@@ -141,22 +253,22 @@ class AchievementSystem:
         
     def show_achievements(self, player):
         """显示成就状态"""
-        print("\n=== 成就系统 ===")
+        echo("\n=== 成就系统 ===")
         
         # 显示已解锁成就
         unlocked = self.get_unlocked_achievements()
         if unlocked:
-            print("✅ 已解锁成就：")
+            echo("✅ 已解锁成就：")
             for achievement in unlocked:
-                print(f"  🎉 {achievement.name} - {achievement.description}")
-                print(f"     解锁时间：{achievement.unlock_time.strftime('%Y-%m-%d %H:%M')}")
+                echo(f"  🎉 {achievement.name} - {achievement.description}")
+                echo(f"     解锁时间：{achievement.unlock_time.strftime('%Y-%m-%d %H:%M')}")
         else:
-            print("❌ 暂无已解锁成就")
+            echo("❌ 暂无已解锁成就")
             
         # 显示可达成的成就
         locked = self.get_locked_achievements()
         if locked:
-            print("\n🎯 可达成成就：")
+            echo("\n🎯 可达成成就：")
             for achievement in locked:
-                print(f"  🔒 {achievement.name} - {achievement.description}")
-                print(f"     条件：{achievement.condition}")
\ No newline at end of file
+                echo(f"  🔒 {achievement.name} - {achievement.description}")
+                echo(f"     条件：{achievement.condition}")
\ No newline at end of file
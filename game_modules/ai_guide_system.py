@@ -5,10 +5,13 @@ AI智能引导系统
 主动引导玩家游戏，提供个性化建议和互动
 """
 
-import random
 import time
 from typing import Dict, List, Tuple
 from datetime import datetime
+from game_modules.battle_system import battle_odds, snapshot_player
+from game_utils.rng import stream
+
+_rng = stream("guide")  # 本模块的随机数流
 
 class AIGuide:
     """AI引导员类"""
@@ -28,7 +31,7 @@ class AIGuide:
             {"name": "灵儿小师妹", "style": "活泼可爱", "tone": "鼓励"},
             {"name": "无尘真人", "style": "严肃认真", "tone": "督促"}
         ]
-        return random.choice(personalities)
+        return _rng.choice(personalities)
         
     def greet_player(self) -> str:
         """问候玩家"""
@@ -38,7 +41,7 @@ class AIGuide:
             f"师兄师姐，今天想先做什么呢？",
             f"道友安好，今日天机显示你运势颇佳哦～"
         ]
-        return random.choice(greetings)
+        return _rng.choice(greetings)
         
     def analyze_player_state(self, player, world_state) -> Dict[str, any]:
         """分析玩家当前状态"""
@@ -54,6 +57,21 @@ class AIGuide:
         }
         return analysis
         
+    def battle_forecast(self, player, enemy) -> str:
+        """战前计算精确胜率，给出建议"""
+        estimate = battle_odds(snapshot_player(player), enemy)
+        win_rate = estimate['win_rate']
+        if win_rate >= 0.8:
+            advice = "稳操胜券，放手一搏吧！"
+        elif win_rate >= 0.5:
+            advice = "有几分把握，但要小心应对。"
+        elif win_rate >= 0.2:
+            advice = "凶多吉少，量力而行..."
+        else:
+            advice = "实力悬殊，能避则避！"
+        return (f"🤖 {self.personality['name']}：胜率 {win_rate:.0%}，"
+                f"约 {estimate['mean_rounds']:.0f} 回合分出胜负。{advice}")
+        
     def provide_guidance(self, player, world_state) -> List[str]:
         """提供个性化引导建议"""
         analysis = self.analyze_player_state(player, world_state)
@@ -76,14 +94,14 @@ class AIGuide:
             suggestions.append("📈 某些属性偏低，可以通过学习功法或寻找机缘来提升。")
             
         # 随机添加趣味建议
-        if random.random() < 0.3:
+        if _rng.random() < 0.3:
             fun_suggestions = [
                 "🎮 想不想试试挑战附近的妖兽？",
                 "📚 最近有不少新功法可以学习哦～",
                 "👥 听说城里来了个神秘商人...",
                 "🏔️ 青云山脉最近发现了新的灵草..."
             ]
-            suggestions.append(random.choice(fun_suggestions))
+            suggestions.append(_rng.choice(fun_suggestions))
             
         return suggestions
         
@@ -113,7 +131,7 @@ class AIGuide:
         }
         
         options = dialogues.get(topic, ["这个话题很有意思呢！"])
-        return random.choice(options)
+        return _rng.choice(options)
         
     def give_missions(self, player) -> List[Dict]:
         """给予日常任务"""
@@ -168,7 +186,7 @@ class AIGuide:
             f"🌟 哇！又解锁了一个成就，为你骄傲！",
             f"🏆 干得漂亮！这个成就可不是人人都能拿到的！"
         ]
-        return random.choice(celebrations)
+        return _rng.choice(celebrations)
 
 class AIGuideSystem:
     """AI引导系统主类"""
@@ -223,7 +241,7 @@ class AIGuideSystem:
         }
         
         next_actions = suggestion_chains.get(current_action, ["修炼", "探索"])
-        next_action = random.choice(next_actions)
+        next_action = _rng.choice(next_actions)
         
         return f"做完{current_action}之后，建议你可以试试{next_action}哦～"
         
@@ -255,4 +273,4 @@ class AIGuideSystem:
         }
         
         responses = emotional_responses.get(event_type, ["嗯嗯，我知道了～"])
-        return random.choice(responses)
\ No newline at end of file
+        return _rng.choice(responses)
\ No newline at end of file
@@ -5,9 +5,13 @@
 完整的丹药体系，参照《凡人修仙传》等经典作品
 """
 
-import random
 from typing import Dict, List, Tuple
 from datetime import datetime
+from game_utils.console_io import prompt
+from game_utils.renderer import echo
+from game_utils.rng import stream
+
+_rng = stream("alchemy")  # 本模块的随机数流
 
 class AlchemyIngredient:
     """炼丹原料类"""
@@ -97,7 +101,7 @@ class MasterAlchemist:
         if self.alchemy_level >= formula.level:
             if formula.name not in [f.name for f in self.known_formulas]:
                 self.known_formulas.append(formula)
-                print(f"成功学会丹方：{formula.name}")
+                echo(f"成功学会丹方：{formula.name}")
                 return True
         return False
         
@@ -238,21 +242,21 @@ class AlchemySystem:
     def alchemy_interface(self, player_name: str, player_stats: Dict):
         """炼丹主界面"""
         alchemist = self.get_player_alchemist(player_name)
-        print("\n=== 炼丹堂 ===")
-        print(f"炼丹等级：{alchemist.alchemy_level}")
-        print(f"控火能力：{alchemist.fire_control:.1f}")
-        print(f"炼丹运气：{alchemist.luck}")
+        echo("\n=== 炼丹堂 ===")
+        echo(f"炼丹等级：{alchemist.alchemy_level}")
+        echo(f"控火能力：{alchemist.fire_control:.1f}")
+        echo(f"炼丹运气：{alchemist.luck}")
         
         while True:
-            print("\n操作选项：")
-            print("1. 查看已学丹方")
-            print("2. 学习新丹方")
-            print("3. 开始炼丹")
-            print("4. 练习控火")
-            print("5. 查看丹炉")
-            print("6. 返回")
+            echo("\n操作选项：")
+            echo("1. 查看已学丹方")
+            echo("2. 学习新丹方")
+            echo("3. 开始炼丹")
+            echo("4. 练习控火")
+            echo("5. 查看丹炉")
+            echo("6. 返回")
             
-            choice = input("请选择: ")
+            choice = prompt("请选择: ")
             
             if choice == "1":
                 self.show_known_formulas(alchemist)
@@ -267,20 +271,20 @@ class AlchemySystem:
             elif choice == "6":
                 break
             else:
-                print("无效选择")
+                echo("无效选择")
                 
     def show_known_formulas(self, alchemist: MasterAlchemist):
         """显示已学丹方"""
-        print("\n已掌握丹方：")
+        echo("\n已掌握丹方：")
         for formula in alchemist.known_formulas:
-            print(f"  • {formula.name} (等级{formula.level})")
-            print(f"    需要原料：{', '.join([f'{name}×{qty}' for name, qty in formula.ingredients])}")
-            print(f"    效果：{formula.effects}")
-            print()
+            echo(f"  • {formula.name} (等级{formula.level})")
+            echo(f"    需要原料：{', '.join([f'{name}×{qty}' for name, qty in formula.ingredients])}")
+            echo(f"    效果：{formula.effects}")
+            echo()
             
     def learn_new_formula(self, alchemist: MasterAlchemist):
         """学习新丹方"""
-        print("\n可学习的丹方：")
+        echo("\n可学习的丹方：")
         available_formulas = []
         
         for name, formula in self.formulas.items():
@@ -289,47 +293,47 @@ class AlchemySystem:
                 available_formulas.append((name, formula))
                 
         for i, (name, formula) in enumerate(available_formulas, 1):
-            print(f"{i}. {name} (等级{formula.level})")
+            echo(f"{i}. {name} (等级{formula.level})")
             
         if not available_formulas:
-            print("暂无可学习的丹方")
+            echo("暂无可学习的丹方")
             return
             
         try:
-            choice = int(input("选择要学习的丹方: ")) - 1
+            choice = int(prompt("选择要学习的丹方: ")) - 1
             if 0 <= choice < len(available_formulas):
                 formula = available_formulas[choice][1]
                 if alchemist.learn_formula(formula):
                     # 消耗资源
                     cost = formula.level * 50
-                    print(f"学习成功！消耗灵石 {cost}")
+                    echo(f"学习成功！消耗灵石 {cost}")
                 else:
-                    print("学习失败")
+                    echo("学习失败")
         except ValueError:
-            print("输入错误")
+            echo("输入错误")
             
     def start_alchemy(self, alchemist: MasterAlchemist, player_stats: Dict):
         """开始炼丹"""
         if not alchemist.known_formulas:
-            print("还未掌握任何丹方")
+            echo("还未掌握任何丹方")
             return
             
-        print("选择要炼制的丹药：")
+        echo("选择要炼制的丹药：")
         for i, formula in enumerate(alchemist.known_formulas, 1):
-            print(f"{i}. {formula.name}")
+            echo(f"{i}. {formula.name}")
             
         try:
-            choice = int(input("选择丹方: ")) - 1
+            choice = int(prompt("选择丹方: ")) - 1
             if 0 <= choice < len(alchemist.known_formulas):
                 formula = alchemist.known_formulas[choice]
                 self.perform_alchemy(alchemist, formula, player_stats)
         except ValueError:
-            print("输入错误")
+            echo("输入错误")
             
     def perform_alchemy(self, alchemist: MasterAlchemist, formula: AlchemyFormula, 
                        player_stats: Dict):
         """执行炼丹过程"""
-        print(f"\n开始炼制 {formula.name}...")
+        echo(f"\n开始炼制 {formula.name}...")
         
         # 检查原料
         missing_ingredients = []
@@ -340,27 +344,27 @@ class AlchemySystem:
                 missing_ingredients.append(f"{ingredient_name}(缺少{required_qty-available}个)")
                 
         if missing_ingredients:
-            print(f"原料不足：{', '.join(missing_ingredients)}")
+            echo(f"原料不足：{', '.join(missing_ingredients)}")
             return
             
         # 选择丹炉
-        print("选择丹炉：")
+        echo("选择丹炉：")
         usable_furnaces = [f for f in self.furnaces.values() 
                           if f.level <= alchemist.alchemy_level]
         for i, furnace in enumerate(usable_furnaces, 1):
-            print(f"{i}. {furnace.name} (等级{furnace.level})")
+            echo(f"{i}. {furnace.name} (等级{furnace.level})")
             
         try:
-            furnace_choice = int(input("选择丹炉: ")) - 1
+            furnace_choice = int(prompt("选择丹炉: ")) - 1
             if 0 <= furnace_choice < len(usable_furnaces):
                 furnace = usable_furnaces[furnace_choice]
                 
                 # 选择火焰类型
-                print("选择火焰：")
+                echo("选择火焰：")
                 for i, fire_type in enumerate(furnace.fire_types, 1):
-                    print(f"{i}. {fire_type}")
+                    echo(f"{i}. {fire_type}")
                     
-                fire_choice = int(input("选择火焰: ")) - 1
+                fire_choice = int(prompt("选择火焰: ")) - 1
                 if 0 <= fire_choice < len(furnace.fire_types):
                     fire_type = furnace.fire_types[fire_choice]
                     
@@ -371,44 +375,48 @@ class AlchemySystem:
                         alchemist.luck, ingredients_quality
                     )
                     
-                    print(f"炼制成功率：{success_rate*100:.1f}%")
+                    echo(f"炼制成功率：{success_rate*100:.1f}%")
                     
                     # 炼制过程
-                    if random.random() < success_rate:
-                        print("🔥 炼制成功！")
+                    if _rng.random() < success_rate:
+                        echo("🔥 炼制成功！")
                         # 获得丹药
-                        print(f"获得 {formula.name} x1")
+                        echo(f"获得 {formula.name} x1")
                         # 提升经验
                         exp_gain = formula.level * 10
                         alchemist.experience += exp_gain
-                        print(f"炼丹经验+{exp_gain}")
+                        echo(f"炼丹经验+{exp_gain}")
                         
                         # 检查升级
                         if alchemist.experience >= alchemist.alchemy_level * 100:
                             alchemist.alchemy_level += 1
-                            print(f"炼丹等级提升至 {alchemist.alchemy_level}!")
+                            echo(f"炼丹等级提升至 {alchemist.alchemy_level}!")
                     else:
-                        print("💥 炼制失败...")
+                        echo("💥 炼制失败...")
                         # 消耗原料但有一定概率保留下部分
                         preservation_chance = 0.3
-                        print("部分原料在高温中损毁...")
+                        echo("部分原料在高温中损毁...")
                         
         except ValueError:
-            print("输入错误")
+            echo("输入错误")
             
     def practice_fire_control(self, alchemist: MasterAlchemist):
         """练习控火能力"""
-        hours = int(input("练习时长(小时): "))
+        try:
+            hours = int(prompt("练习时长(小时): "))
+        except ValueError:
+            echo("输入错误")
+            return
         alchemist.improve_fire_control(hours)
-        print(f"控火能力提升至 {alchemist.fire_control:.1f}")
+        echo(f"控火能力提升至 {alchemist.fire_control:.1f}")
         
     def show_furnaces(self, alchemist: MasterAlchemist):
         """显示丹炉信息"""
-        print("\n可用丹炉：")
+        echo("\n可用丹炉：")
         for name, furnace in self.furnaces.items():
             if furnace.level <= alchemist.alchemy_level:
-                print(f"  • {furnace.name}")
-                print(f"    等级：{furnace.level}")
-                print(f"    支持火焰：{', '.join(furnace.fire_types)}")
-                print(f"    特殊效果：{', '.join(furnace.special_effects)}")
-                print()
\ No newline at end of file
+                echo(f"  • {furnace.name}")
+                echo(f"    等级：{furnace.level}")
+                echo(f"    支持火焰：{', '.join(furnace.fire_types)}")
+                echo(f"    特殊效果：{', '.join(furnace.special_effects)}")
+                echo()
\ No newline at end of file
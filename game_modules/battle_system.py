@@ -3,10 +3,219 @@
 """
 战斗系统模块
 处理修士之间的战斗和冲突
+
+战斗结算与展示分离：simulate() 是不读输入、不输出、不修改玩家的纯函数，返回 BattleResult；
+simulate_many() 用 NumPy 对大量同条件战斗逐回合整列推进，只统计胜负与回合数，用于数值平衡；
+estimate_battle() 在此基础上给出胜率、回合分布和期望收益；
+伤害是小范围的离散均匀分布，battle_odds() 据此精确计算同样的结果（按境界与体质缓存），供战前预估。
+BattleSystem.start_battle() 先结算整场战斗，再逐回合展示并发放奖励。
 """
 
-import random
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from game_utils.console_io import prompt
+from game_utils import realms
+from game_utils.renderer import echo
+from game_utils.rng import stream, numpy_stream
+
+_rng = stream("battle")  # 本模块的随机数流
+
+# 数值表（各境界的加成与倍率见 game_utils.realms，按境界编号取值）
+PLAYER_BASE_HP = 100
+PLAYER_BASE_DAMAGE = 20
+PLAYER_DAMAGE_ROLL = (-5, 10)  # 玩家伤害浮动（含两端）
+ENEMY_BASE_HP = 80
+ENEMY_BASE_DAMAGE = 15
+ENEMY_DAMAGE_ROLL = (-3, 8)    # 敌人伤害浮动（含两端）
+VICTORY_REWARDS = {"灵石": (20, 100), "经验值": (10, 30)}  # 胜利奖励范围（含两端）
+DEFEAT_STONE_LOSS = 20         # 失败时最多损失的灵石
+DEFEAT_CULTIVATION_LOSS = 5    # 失败时最多损失的修为
+ESTIMATE_FIGHTS = 4000         # 战前预估的模拟场数（约 1 毫秒，胜率误差约 ±1.5%）
+
+def snapshot_player(player) -> Dict:
+    """提取战斗用到的玩家数据（灵石与修为用于估算失败损失）"""
+    return {'realm': player.realm, 'realm_id': player.realm_id, '体质': player.stats['体质'],
+            '灵石': player.resources.get('灵石', 0), '修为': player.cultivation}
+
+def _realm_id(combatant: Dict) -> int:
+    """参战者的境界编号（快照自带编号时直接使用）"""
+    realm_id = combatant.get('realm_id')
+    return realms.realm_id(combatant['realm']) if realm_id is None else realm_id
+
+def player_hp(snapshot: Dict) -> int:
+    """玩家血量"""
+    return PLAYER_BASE_HP + realms.PLAYER_HP_BONUS[_realm_id(snapshot)] + snapshot['体质'] * 10
+
+def player_base_damage(snapshot: Dict) -> int:
+    """玩家伤害（不含浮动）"""
+    return PLAYER_BASE_DAMAGE + realms.PLAYER_DAMAGE_BONUS[_realm_id(snapshot)] + snapshot['体质']
+
+def enemy_hp(enemy: Dict) -> int:
+    """敌人血量"""
+    return ENEMY_BASE_HP * realms.ENEMY_HP_MULTIPLIER[_realm_id(enemy)]
+
+def enemy_base_damage(enemy: Dict) -> int:
+    """敌人伤害（不含浮动）"""
+    return int(ENEMY_BASE_DAMAGE * realms.ENEMY_DAMAGE_MULTIPLIER[_realm_id(enemy)])
+
+class BattleResult:
+    """单场战斗结果"""
+    
+    def __init__(self, victory: bool, player_hp: int, enemy_hp: int, rounds: List[Tuple[int, int]]):
+        self.victory = victory
+        self.player_hp = player_hp  # 战斗结束时双方剩余血量（可能为负）
+        self.enemy_hp = enemy_hp
+        self.rounds = rounds        # 每回合 (玩家伤害, 敌人伤害)；玩家获胜的回合敌人伤害为 None
+        
+    @property
+    def round_count(self) -> int:
+        """回合数"""
+        return len(self.rounds)
+
+def simulate(player_snapshot: Dict, enemy: Dict, rng=None) -> BattleResult:
+    """结算一场战斗：玩家先手，双方轮流攻击直到一方血量归零"""
+    return _fight(player_hp(player_snapshot), player_base_damage(player_snapshot), PLAYER_DAMAGE_ROLL,
+                  enemy_hp(enemy), enemy_base_damage(enemy), ENEMY_DAMAGE_ROLL, rng or _rng)
+
+def duel(first: Dict, second: Dict, rng=None) -> BattleResult:
+    """两名修士切磋（双方都按玩家数值表计算），first 先手；victory 表示 first 获胜"""
+    return _fight(player_hp(first), player_base_damage(first), PLAYER_DAMAGE_ROLL,
+                  player_hp(second), player_base_damage(second), PLAYER_DAMAGE_ROLL, rng or _rng)
+
+def _fight(hp: int, damage_base: int, roll: Tuple[int, int],
+           foe_hp: int, foe_damage_base: int, foe_roll: Tuple[int, int], rng) -> BattleResult:
+    """先手方与后手方轮流攻击直到一方血量归零"""
+    rounds = []
+    while True:
+        damage = max(1, damage_base + rng.randint(*roll))
+        foe_hp -= damage
+        if foe_hp <= 0:
+            rounds.append((damage, None))
+            return BattleResult(True, hp, foe_hp, rounds)
+        foe_damage = max(1, foe_damage_base + rng.randint(*foe_roll))
+        hp -= foe_damage
+        rounds.append((damage, foe_damage))
+        if hp <= 0:
+            return BattleResult(False, hp, foe_hp, rounds)
+
+def simulate_many(player_snapshot: Dict, enemy: Dict, n: int, rng: np.random.Generator = None) -> Dict:
+    """同条件战斗 n 场，逐回合对仍在进行的战斗整列抽样，已分出胜负的行随即移出
+
+    返回胜场、胜率、回合数统计，以及 round_counts / win_round_counts（第 i 项为在第 i+1 回合结束的场数 / 其中的胜场）
+    """
+    rng = rng if rng is not None else numpy_stream("battle")
+    damage_base = player_base_damage(player_snapshot)
+    foe_damage_base = enemy_base_damage(enemy)
+    hp = np.full(n, player_hp(player_snapshot), dtype=np.int32)
+    foe_hp = np.full(n, enemy_hp(enemy), dtype=np.int32)
+    
+    round_counts = []
+    win_round_counts = []
+    round_num = 0
+    while len(hp):
+        round_num += 1
+        low, high = PLAYER_DAMAGE_ROLL
+        foe_hp -= np.maximum(1, damage_base + rng.integers(low, high + 1, len(hp), dtype=np.int32))
+        alive = foe_hp > 0
+        won = len(hp) - int(np.count_nonzero(alive))
+        hp, foe_hp = hp[alive], foe_hp[alive]
+        
+        low, high = ENEMY_DAMAGE_ROLL
+        hp -= np.maximum(1, foe_damage_base + rng.integers(low, high + 1, len(hp), dtype=np.int32))
+        alive = hp > 0
+        lost = len(hp) - int(np.count_nonzero(alive))
+        hp, foe_hp = hp[alive], foe_hp[alive]
+        
+        round_counts.append(won + lost)
+        win_round_counts.append(won)
+        
+    wins = sum(win_round_counts)
+    total_rounds = sum(count * round_num for round_num, count in enumerate(round_counts, 1))
+    return {
+        'fights': n,
+        'wins': wins,
+        'win_rate': wins / n if n else 0.0,
+        'mean_rounds': total_rounds / n if n else 0.0,
+        'max_rounds': len(round_counts),
+        'round_counts': round_counts,
+        'win_round_counts': win_round_counts
+    }
+
+def estimate_battle(player_snapshot: Dict, enemy: Dict, n: int = ESTIMATE_FIGHTS,
+                    rng: np.random.Generator = None) -> Dict:
+    """蒙特卡洛预估战斗结果：胜率、回合分布（回合数 -> 概率）与期望收益（失败损失计为负值）"""
+    stats = simulate_many(player_snapshot, enemy, n, rng)
+    round_distribution = {round_num: count / n
+                          for round_num, count in enumerate(stats['round_counts'], 1) if count}
+    return _odds(player_snapshot, stats['win_rate'], round_distribution)
+
+def battle_odds(player_snapshot: Dict, enemy: Dict) -> Dict:
+    """精确计算战斗结果，返回值与 estimate_battle() 相同；同一组境界与体质只计算一次"""
+    win_rate, round_probabilities = exact_outcome(player_snapshot['realm'], player_snapshot['体质'],
+                                                  enemy['realm'])
+    round_distribution = {round_num: probability
+                          for round_num, probability in enumerate(round_probabilities, 1) if probability > 0}
+    return _odds(player_snapshot, win_rate, round_distribution)
+
+def _odds(player_snapshot: Dict, win_rate: float, round_distribution: Dict[int, float]) -> Dict:
+    """由胜率和回合分布组装预估结果，期望收益按胜负概率加权"""
+    lose_rate = 1 - win_rate
+    stones = player_snapshot.get('灵石', 0)
+    cultivation = player_snapshot.get('修为', 0)
+    mean_reward = {item: (low + high) / 2 for item, (low, high) in VICTORY_REWARDS.items()}
+    return {
+        'win_rate': win_rate,
+        'mean_rounds': sum(round_num * probability for round_num, probability in round_distribution.items()),
+        'round_distribution': round_distribution,
+        'expected_rewards': {
+            '灵石': win_rate * mean_reward['灵石'] - lose_rate * min(DEFEAT_STONE_LOSS, stones),
+            '修为': win_rate * mean_reward['经验值'] - lose_rate * min(DEFEAT_CULTIVATION_LOSS, cultivation)
+        }
+    }
+
+def _damage_pmf(base: int, roll: Tuple[int, int]) -> np.ndarray:
+    """单次伤害的概率分布（下标为伤害值），max(1, base + 均匀浮动)"""
+    low, high = roll
+    damage = np.maximum(1, base + np.arange(low, high + 1))
+    return np.bincount(damage) / len(damage)
+
+def _survival(hp: int, pmf: np.ndarray) -> np.ndarray:
+    """承受第 k 次攻击后仍存活的概率（k = 0, 1, ...，直到必死）
+
+    按累计承受伤害做动态规划：分布向量的下标为已承受伤害（只保留小于血量的部分），
+    每次攻击与单次伤害分布卷积一次。每次伤害至少 1 点，最多 hp 次攻击后存活概率归零。
+    """
+    taken = np.zeros(hp)
+    taken[0] = 1.0
+    survival = [1.0]
+    while survival[-1] > 0:
+        taken = np.convolve(taken, pmf)[:hp]
+        survival.append(float(taken.sum()))
+    return np.array(survival)
+
+@lru_cache(maxsize=1024)
+def exact_outcome(player_realm: str, constitution: int, enemy_realm: str) -> Tuple[float, Tuple[float, ...]]:
+    """精确胜率与各回合结束的概率（第 i 项为在第 i+1 回合结束）
+
+    双方伤害相互独立，状态 (玩家血量, 敌人血量) 上的动态规划可拆成两方各自的存活概率：
+    玩家在第 k 回合获胜 = 敌人恰好在第 k 次受击时倒下 且 玩家挺过了前 k-1 次攻击。
+    """
+    snapshot = {'realm': player_realm, '体质': constitution}
+    foe = {'realm': enemy_realm}
+    enemy_alive = _survival(enemy_hp(foe), _damage_pmf(player_base_damage(snapshot), PLAYER_DAMAGE_ROLL))
+    player_alive = _survival(player_hp(snapshot), _damage_pmf(enemy_base_damage(foe), ENEMY_DAMAGE_ROLL))
+    
+    rounds = max(len(enemy_alive), len(player_alive)) - 1
+    enemy_alive = np.pad(enemy_alive, (0, rounds + 1 - len(enemy_alive)))
+    player_alive = np.pad(player_alive, (0, rounds + 1 - len(player_alive)))
+    win = (enemy_alive[:-1] - enemy_alive[1:]) * player_alive[:-1]
+    lose = enemy_alive[1:] * (player_alive[:-1] - player_alive[1:])
+    ended = win + lose
+    last = int(np.flatnonzero(ended)[-1]) + 1
+    return float(win.sum()), tuple(ended[:last].tolist())
 
 class BattleSystem:
     """战斗系统"""
@@ -16,101 +225,61 @@ class BattleSystem:
         
     def start_battle(self, player, enemy) -> bool:
         """开始战斗"""
-        print(f"\n⚔️ 战斗开始！")
-        print(f"对手：{enemy['name']} ({enemy['realm']})")
+        echo(f"\n⚔️ 战斗开始！")
+        echo(f"对手：{enemy['name']} ({enemy['realm']})")
         
-        player_hp = self._calculate_hp(player)
-        enemy_hp = self._calculate_enemy_hp(enemy)
+        result = simulate(snapshot_player(player), enemy)
+        hp = player_hp(snapshot_player(player))
+        foe_hp = enemy_hp(enemy)
         
-        round_num = 1
-        
-        while player_hp > 0 and enemy_hp > 0:
-            print(f"\n--- 第 {round_num} 回合 ---")
+        for round_num, (player_damage, enemy_damage) in enumerate(result.rounds, 1):
+            echo(f"\n--- 第 {round_num} 回合 ---")
             
             # 玩家攻击
-            player_damage = self._calculate_damage(player, enemy)
-            enemy_hp -= player_damage
-            print(f"你造成 {player_damage} 点伤害")
+            foe_hp -= player_damage
+            echo(f"你造成 {player_damage} 点伤害")
             
-            if enemy_hp <= 0:
-                print(" побед了！")
+            if enemy_damage is None:
+                echo(" побед了！")
                 self._handle_victory(player, enemy)
                 return True
                 
             # 敌人攻击
-            enemy_damage = self._calculate_enemy_damage(enemy, player)
-            player_hp -= enemy_damage
-            print(f"{enemy['name']} 造成 {enemy_damage} 点伤害")
+            hp -= enemy_damage
+            echo(f"{enemy['name']} 造成 {enemy_damage} 点伤害")
             
-            if player_hp <= 0:
-                print("你败了...")
+            if hp <= 0:
+                echo("你败了...")
                 self._handle_defeat(player)
                 return False
                 
-            print(f"你的血量：{max(0, player_hp)}")
-            print(f"敌人血量：{max(0, enemy_hp)}")
-            
-            round_num += 1
+            echo(f"你的血量：{max(0, hp)}")
+            echo(f"敌人血量：{max(0, foe_hp)}")
             
             # 战斗间隔
-            input("按回车继续...")
+            prompt("按回车继续...")
             
-    def _calculate_hp(self, player) -> int:
-        """计算玩家血量"""
-        base_hp = 100
-        realm_bonus = {"练气期": 0, "筑基期": 50, "金丹期": 100, "元婴期": 200}
-        hp = base_hp + realm_bonus.get(player.realm, 0) + (player.stats['体质'] * 10)
-        return hp
-        
-    def _calculate_enemy_hp(self, enemy) -> int:
-        """计算敌人血量"""
-        base_hp = 80
-        realm_multipliers = {"练气期": 1, "筑基期": 2, "金丹期": 4, "元婴期": 8}
-        multiplier = realm_multipliers.get(enemy['realm'], 1)
-        return base_hp * multiplier
-        
-    def _calculate_damage(self, player, enemy) -> int:
-        """计算玩家伤害"""
-        base_damage = 20
-        realm_bonus = {"练气期": 0, "筑基期": 10, "金丹期": 25, "元婴期": 50}
-        damage = (base_damage + 
-                 realm_bonus.get(player.realm, 0) + 
-                 player.stats['体质'] + 
-                 random.randint(-5, 10))
-        return max(1, damage)
-        
-    def _calculate_enemy_damage(self, enemy, player) -> int:
-        """计算敌人伤害"""
-        base_damage = 15
-        realm_multipliers = {"练气期": 1, "筑基期": 1.5, "金丹期": 2.5, "元婴期": 4}
-        multiplier = realm_multipliers.get(enemy['realm'], 1)
-        damage = int(base_damage * multiplier) + random.randint(-3, 8)
-        return max(1, damage)
-        
     def _handle_victory(self, player, enemy):
         """处理胜利结果"""
-        rewards = {
-            "灵石": random.randint(20, 100),
-            "经验值": random.randint(10, 30)
-        }
+        rewards = {item: _rng.randint(low, high) for item, (low, high) in VICTORY_REWARDS.items()}
         
-        print(f"获得奖励：")
+        echo(f"获得奖励：")
         for item, amount in rewards.items():
             if item == "灵石":
                 player.add_resource(item, amount)
-            print(f"- {item}: {amount}")
+            echo(f"- {item}: {amount}")
             
         # 修为提升
         cultivation_gain = rewards["经验值"]
         player.cultivation += cultivation_gain
-        print(f"修为+{cultivation_gain}")
+        echo(f"修为+{cultivation_gain}")
         
     def _handle_defeat(self, player):
         """处理失败结果"""
         # 损失一些资源
-        loss = min(20, player.resources['灵石'])
+        loss = min(DEFEAT_STONE_LOSS, player.resources['灵石'])
         player.resources['灵石'] -= loss
-        print(f"损失灵石 {loss} 枚")
+        echo(f"损失灵石 {loss} 枚")
         
         # 小幅度修为下降
-        player.cultivation = max(0, player.cultivation - 5)
\ No newline at end of file
+        player.cultivation = max(0, player.cultivation - DEFEAT_CULTIVATION_LOSS)
\ No newline at end of file
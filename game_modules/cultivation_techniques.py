@@ -7,6 +7,8 @@
 
 import random
 from typing import Dict, List
+from game_utils import realms
+from game_utils.renderer import echo
 
 class CultivationTechnique:
     """修炼功法类"""
@@ -16,6 +18,7 @@ class CultivationTechnique:
         self.level = level  # 功法等级：1-9
         self.effects = effects  # 功法效果
         self.requirements = requirements  # 修炼要求
+        self.required_realm_id = realms.realm_id(requirements.get("境界", "凡人"))  # 境界要求的编号
         self.mastery = 0  # 掌握程度 0-100
         
     def get_effect(self, stat: str) -> float:
@@ -79,15 +82,7 @@ class TechniqueSystem:
     def _check_requirements(self, technique: CultivationTechnique, player) -> bool:
         """检查修炼要求"""
         # 境界要求
-        realm_levels = {
-            "凡人": 0, "练气期": 1, "筑基期": 2, "金丹期": 3,
-            "元婴期": 4, "化神期": 5, "合体期": 6, "大乘期": 7, "渡劫期": 8
-        }
-        
-        required_realm_level = realm_levels.get(technique.requirements.get("境界", "凡人"), 0)
-        player_realm_level = realm_levels.get(player.realm, 0)
-        
-        if player_realm_level < required_realm_level:
+        if player.realm_id < technique.required_realm_id:
             return False
             
         # 属性要求
@@ -104,24 +99,24 @@ class TechniqueSystem:
     def learn_technique(self, technique_name: str, player) -> bool:
         """学习功法"""
         if technique_name not in self.available_techniques:
-            print("未知功法")
+            echo("未知功法")
             return False
             
         technique = self.available_techniques[technique_name]
         
         if not self._check_requirements(technique, player):
-            print("不满足修炼条件")
+            echo("不满足修炼条件")
             return False
             
         # 消耗资源学习
         cost = technique.level * 20
         if not player.consume_resource("灵石", cost):
-            print(f"灵石不足，需要 {cost} 枚")
+            echo(f"灵石不足，需要 {cost} 枚")
             return False
             
         # 学习成功
         self.learned_techniques[technique_name] = technique
-        print(f"成功学会《{technique_name}》")
+        echo(f"成功学会《{technique_name}》")
         
         # 初始掌握度
         technique.mastery = 10
@@ -130,7 +125,7 @@ class TechniqueSystem:
     def practice_technique(self, technique_name: str, player, hours: int = 1):
         """练习功法"""
         if technique_name not in self.learned_techniques:
-            print("未学会此功法")
+            echo("未学会此功法")
             return
             
         technique = self.learned_techniques[technique_name]
@@ -140,12 +135,12 @@ class TechniqueSystem:
         mastery_gain = min(practice_efficiency, 100 - technique.mastery)
         technique.mastery += mastery_gain
         
-        print(f"练习《{technique_name}》{hours}小时")
-        print(f"掌握度+{mastery_gain:.1f}，当前掌握度：{technique.mastery:.1f}%")
+        echo(f"练习《{technique_name}》{hours}小时")
+        echo(f"掌握度+{mastery_gain:.1f}，当前掌握度：{technique.mastery:.1f}%")
         
         # 根据掌握度获得属性加成
         if technique.mastery >= 50 and technique.mastery - mastery_gain < 50:
-            print("功法掌握达到熟练，获得永久属性加成！")
+            echo("功法掌握达到熟练，获得永久属性加成！")
             # 可以在这里添加永久属性加成
             
     def get_total_effects(self, player) -> Dict[str, float]:
@@ -5,76 +5,50 @@
 让玩家可以种植灵草、培育灵药等
 """
 
-import random
-import time
+import heapq
+from array import array
 from typing import Dict, List
-from datetime import datetime, timedelta
+from game_utils.console_io import prompt
+from game_utils.game_clock import GameClock
+from game_utils.renderer import echo, output_enabled
+from game_utils.rng import stream
+
+_rng = stream("farming")  # 本模块的随机数流
 
 class Crop:
-    """作物类"""
+    """作物品种（种植模板）"""
     
     def __init__(self, name: str, growth_time: int, rarity: str, requirements: Dict):
         self.name = name
         self.growth_time = growth_time  # 生长时间（游戏回合）
         self.rarity = rarity  # 稀有度：普通、稀有、传说
         self.requirements = requirements  # 种植要求
-        self.plant_time = None  # 种植时间
-        self.current_stage = 0  # 当前生长阶段
-        self.is_ready = False   # 是否成熟
-        self.quality = 1.0      # 品质系数
-        
-    def plant(self, current_time):
-        """种植作物"""
-        self.plant_time = current_time
-        self.current_stage = 1
-        print(f"🌱 成功种植{self.name}！")
-        
-    def grow(self, current_time, player_stats: Dict):
-        """作物生长"""
-        if not self.plant_time:
-            return False
-            
-        # 计算经过的时间
-        time_passed = current_time - self.plant_time
+        self.type_id = -1  # 在作物目录中的编号
         
-        # 根据时间推进生长阶段
-        expected_stage = min(int(time_passed / (self.growth_time / 4)) + 1, 4)
+    def stage_tick(self, plant_tick: int, stage: int) -> float:
+        """进入指定生长阶段的回合"""
+        return plant_tick + (stage - 1) * (self.growth_time / 4)
         
-        if expected_stage > self.current_stage:
-            self.current_stage = expected_stage
-            stage_names = ["种子", "发芽", "成长", "成熟"]
-            print(f"🌿 {self.name}进入了{stage_names[self.current_stage-1]}阶段！")
-            
-            # 成熟时计算品质
-            if self.current_stage == 4:
-                self.is_ready = True
-                self._calculate_quality(player_stats)
-                quality_desc = ["普通", "良好", "优秀", "完美"]
-                quality_index = min(int(self.quality * 3), 3)
-                print(f"✅ {self.name}已经成熟！品质：{quality_desc[quality_index]}")
-                
-            return True
-        return False
+    def expected_stage(self, plant_tick: int, current_time: int) -> int:
+        """按经过的回合计算应处的生长阶段"""
+        time_passed = current_time - plant_tick
+        return min(int(time_passed / (self.growth_time / 4)) + 1, 4)
         
-    def _calculate_quality(self, player_stats: Dict):
+    def roll_quality(self, player_stats: Dict) -> float:
         """计算作物品质"""
         base_quality = 0.7
         # 根据玩家属性调整品质
         quality_bonus = (
             player_stats.get('灵根', 0) * 0.02 +
             player_stats.get('悟性', 0) * 0.01 +
-            random.uniform(-0.2, 0.3)
+            _rng.uniform(-0.2, 0.3)
         )
-        self.quality = max(0.1, min(1.0, base_quality + quality_bonus))
+        return max(0.1, min(1.0, base_quality + quality_bonus))
         
-    def harvest(self) -> Dict[str, int]:
-        """收获作物"""
-        if not self.is_ready:
-            return {}
-            
-        # 根据稀有度和品质计算收获数量
+    def harvest_rewards(self, quality: float) -> Dict[str, int]:
+        """根据稀有度和品质计算收获"""
         base_yield = {"普通": 2, "稀有": 1, "传说": 1}[self.rarity]
-        yield_multiplier = self.quality * 2
+        yield_multiplier = quality * 2
         
         rewards = {}
         if self.name == "聚灵草":
@@ -86,65 +60,150 @@ class Crop:
         elif self.name == "九转灵果":
             rewards['高级材料'] = 1
             rewards['灵石'] = int(50 * yield_multiplier)
-            
-        print(f"🎉 收获{self.name}！获得：{rewards}")
         return rewards
 
 class FarmPlot:
-    """农田地块"""
+    """农田地块
+    
+    每个格子的作物状态存放在紧凑的并行数组中（作物编号、种植回合、生长阶段、品质），
+    不再为每株作物创建对象，万格规模的灵田也只占用几百KB。
+    """
+    
+    EMPTY = -1
+    STAGE_NAMES = ["种子", "发芽", "成长", "成熟"]
     
-    def __init__(self, plot_id: int, size: int = 4):
+    def __init__(self, plot_id: int, size: int = 4, catalogue: List[Crop] = None):
         self.plot_id = plot_id
         self.size = size
-        self.crops = [None] * size  # 每个格子的作物
+        self.catalogue = catalogue if catalogue is not None else []  # 作物编号 -> 品种
+        self.crop_type = array('h', [self.EMPTY]) * size  # 作物编号，-1 表示空闲
+        self.plant_tick = array('q', [0]) * size          # 种植回合
+        self.stage = array('b', [0]) * size               # 生长阶段 1-4，0 表示空闲
+        self.quality = array('f', [0.0]) * size           # 品质系数
         self.fertilizer_level = 0   # 肥料等级
         self.water_level = 100      # 水分等级
-        self.last_watered = None    # 最后浇水时间
+        self.last_watered = None    # 最后浇水回合
+        
+    def is_empty(self, slot: int) -> bool:
+        """格子是否空闲"""
+        return self.crop_type[slot] == self.EMPTY
+        
+    def is_ready(self, slot: int) -> bool:
+        """格子中的作物是否成熟"""
+        return self.stage[slot] == 4
         
-    def plant_crop(self, slot: int, crop: Crop, current_time) -> bool:
+    def crop_at(self, slot: int) -> Crop:
+        """获取格子中作物的品种"""
+        type_id = self.crop_type[slot]
+        return None if type_id == self.EMPTY else self.catalogue[type_id]
+        
+    def empty_slots(self) -> List[int]:
+        """所有空闲格子"""
+        return [i for i, type_id in enumerate(self.crop_type) if type_id == self.EMPTY]
+        
+    def ready_slots(self) -> List[int]:
+        """所有作物已成熟的格子"""
+        return [i for i, stage in enumerate(self.stage) if stage == 4]
+        
+    def plant_crop(self, slot: int, crop: Crop, current_time: int) -> bool:
         """在指定位置种植作物"""
-        if 0 <= slot < self.size and self.crops[slot] is None:
-            self.crops[slot] = crop
-            crop.plant(current_time)
+        if 0 <= slot < self.size and self.is_empty(slot):
+            self.crop_type[slot] = crop.type_id
+            self.plant_tick[slot] = current_time
+            self.stage[slot] = 1
+            self.quality[slot] = 1.0
+            echo(f"🌱 成功种植{crop.name}！")
             return True
         return False
         
-    def water_plot(self):
+    def water_plot(self, current_time: int = None):
         """浇水平台"""
         self.water_level = min(100, self.water_level + 30)
-        self.last_watered = time.time()
-        print("💧 浇水完成！作物生长环境改善。")
+        self.last_watered = current_time
+        echo("💧 浇水完成！作物生长环境改善。")
         return True
         
     def add_fertilizer(self, level: int = 1):
         """施肥"""
         self.fertilizer_level = min(5, self.fertilizer_level + level)
-        print(f"🌾 施肥成功！肥料等级：{self.fertilizer_level}")
+        echo(f"🌾 施肥成功！肥料等级：{self.fertilizer_level}")
         return True
         
-    def update_plots(self, current_time, player_stats: Dict):
-        """更新所有作物"""
-        for i, crop in enumerate(self.crops):
-            if crop:
-                grew = crop.grow(current_time, player_stats)
-                if grew and crop.is_ready:
-                    print(f"第{i+1}格的{crop.name}已经成熟了！")
+    def advance_slot(self, slot: int, stage: int, player_stats: Dict) -> bool:
+        """把格子中的作物推进到指定生长阶段"""
+        if stage <= self.stage[slot]:
+            return False
+            
+        crop = self.crop_at(slot)
+        self.stage[slot] = stage
+        echo(f"🌿 {crop.name}进入了{self.STAGE_NAMES[stage-1]}阶段！")
+        
+        # 成熟时计算品质
+        if stage == 4:
+            quality = crop.roll_quality(player_stats)
+            self.quality[slot] = quality
+            quality_desc = ["普通", "良好", "优秀", "完美"]
+            quality_index = min(int(quality * 3), 3)
+            echo(f"✅ {crop.name}已经成熟！品质：{quality_desc[quality_index]}")
+            
+        return True
+        
+    def update_plots(self, current_time: int, player_stats: Dict):
+        """逐格更新所有作物（FarmingSystem 使用调度堆，只处理到期的格子）"""
+        for i in range(self.size):
+            crop = self.crop_at(i)
+            if crop and not self.is_ready(i):
+                grew = self.advance_slot(i, crop.expected_stage(self.plant_tick[i], current_time), player_stats)
+                if grew and self.is_ready(i) and output_enabled():
+                    echo(f"第{i+1}格的{crop.name}已经成熟了！")
                     
     def harvest_slot(self, slot: int) -> Dict[str, int]:
         """收获指定格子的作物"""
-        if 0 <= slot < self.size and self.crops[slot] and self.crops[slot].is_ready:
-            crop = self.crops[slot]
-            rewards = crop.harvest()
-            self.crops[slot] = None  # 清空格子
+        if 0 <= slot < self.size and self.is_ready(slot):
+            crop = self.crop_at(slot)
+            rewards = crop.harvest_rewards(self.quality[slot])
+            echo(f"🎉 收获{crop.name}！获得：{rewards}")
+            # 清空格子
+            self.crop_type[slot] = self.EMPTY
+            self.stage[slot] = 0
+            self.quality[slot] = 0.0
             return rewards
         return {}
+        
+    def get_save_data(self) -> Dict:
+        """获取存档数据（只记录有作物的格子）"""
+        slots = []
+        for i, type_id in enumerate(self.crop_type):
+            if type_id != self.EMPTY:
+                slots.append({
+                    'slot': i,
+                    'crop': self.catalogue[type_id].name,
+                    'plant_tick': self.plant_tick[i],
+                    'stage': self.stage[i],
+                    'quality': round(self.quality[i], 4)
+                })
+        return {
+            'plot_id': self.plot_id,
+            'size': self.size,
+            'fertilizer_level': self.fertilizer_level,
+            'water_level': self.water_level,
+            'last_watered': self.last_watered,
+            'slots': slots
+        }
 
 class FarmingSystem:
     """种植系统主类"""
     
-    def __init__(self):
+    def __init__(self, clock: GameClock = None):
+        self.clock = clock if clock is not None else GameClock()  # 与游戏引擎共用的时钟
         self.available_crops = self._initialize_crops()
-        self.plots = [FarmPlot(i) for i in range(2)]  # 默认2块地
+        self.crop_catalogue = list(self.available_crops.values())
+        for type_id, crop in enumerate(self.crop_catalogue):
+            crop.type_id = type_id
+        self.plots = [FarmPlot(i, catalogue=self.crop_catalogue) for i in range(2)]  # 默认2块地
+        # 生长调度堆：(下一阶段回合, 序号, 田地编号, 格子, 目标阶段, 种植回合)
+        self.growth_queue = []
+        self._schedule_seq = 0
         self.tools = {
             '浇水壶': 1,
             '肥料': 5,
@@ -164,129 +223,196 @@ class FarmingSystem:
         
     def show_farm_status(self):
         """显示农场状态"""
-        print("\n=== 我的灵田 ===")
+        echo("\n=== 我的灵田 ===")
         
         for plot in self.plots:
-            print(f"\n第{plot.plot_id + 1}号田地:")
-            print(f"水分：{plot.water_level}% | 肥料：{plot.fertilizer_level}级")
+            echo(f"\n第{plot.plot_id + 1}号田地:")
+            echo(f"水分：{plot.water_level}% | 肥料：{plot.fertilizer_level}级")
             
-            for i, crop in enumerate(plot.crops):
+            for i in range(plot.size):
+                crop = plot.crop_at(i)
                 if crop:
-                    stage_names = ["种子", "发芽", "成长", "成熟"]
-                    status = stage_names[crop.current_stage-1] if crop.current_stage > 0 else "空闲"
-                    ready_mark = "✅" if crop.is_ready else "⏳"
-                    print(f"  {i+1}号位：{crop.name} - {status} {ready_mark}")
+                    status = FarmPlot.STAGE_NAMES[plot.stage[i]-1]
+                    ready_mark = "✅" if plot.is_ready(i) else "⏳"
+                    echo(f"  {i+1}号位：{crop.name} - {status} {ready_mark}")
                 else:
-                    print(f"  {i+1}号位：空闲 🌾")
+                    echo(f"  {i+1}号位：空闲 🌾")
                     
-        print(f"\n工具库存：{self.tools}")
+        echo(f"\n工具库存：{self.tools}")
         
     def plant_operation(self, player_stats: Dict):
         """种植操作"""
-        print("\n🌱 种植操作")
-        print("可种植的作物：")
+        echo("\n🌱 种植操作")
+        echo("可种植的作物：")
         for name, crop in self.available_crops.items():
-            print(f"- {name} (生长时间：{crop.growth_time}回合，要求：{crop.requirements})")
+            echo(f"- {name} (生长时间：{crop.growth_time}回合，要求：{crop.requirements})")
             
-        crop_name = input("选择要种植的作物: ")
+        crop_name = prompt("选择要种植的作物: ")
         if crop_name not in self.available_crops:
-            print("未知作物")
+            echo("未知作物")
             return
             
         # 选择地块和位置
-        print("可用田地：")
+        echo("可用田地：")
         for i, plot in enumerate(self.plots):
-            empty_slots = [j for j, crop in enumerate(plot.crops) if crop is None]
+            empty_slots = plot.empty_slots()
             if empty_slots:
-                print(f"第{i+1}号田地 - 可用位置：{[x+1 for x in empty_slots]}")
+                echo(f"第{i+1}号田地 - 可用位置：{[x+1 for x in empty_slots]}")
                 
         try:
-            plot_choice = int(input("选择田地编号: ")) - 1
-            slot_choice = int(input("选择位置编号: ")) - 1
+            plot_choice = int(prompt("选择田地编号: ")) - 1
+            slot_choice = int(prompt("选择位置编号: ")) - 1
             
             if 0 <= plot_choice < len(self.plots):
-                plot = self.plots[plot_choice]
-                crop = self.available_crops[crop_name]
-                
-                if plot.plant_crop(slot_choice, crop, time.time()):
-                    print(f"成功在第{plot_choice+1}号田地第{slot_choice+1}位种植{crop_name}")
+                if self.plant(plot_choice, slot_choice, crop_name):
+                    echo(f"成功在第{plot_choice+1}号田地第{slot_choice+1}位种植{crop_name}")
                 else:
-                    print("种植失败，请检查位置是否可用")
+                    echo("种植失败，请检查位置是否可用")
             else:
-                print("无效的田地编号")
+                echo("无效的田地编号")
                 
         except ValueError:
-            print("输入格式错误")
+            echo("输入格式错误")
             
     def farming_operations(self, operation: str, player_stats: Dict):
         """农事操作"""
         if operation == "浇水":
-            print("选择要浇水的田地：")
+            echo("选择要浇水的田地：")
             for i, plot in enumerate(self.plots):
-                print(f"{i+1}. 第{i+1}号田地 (当前水分：{plot.water_level}%)")
+                echo(f"{i+1}. 第{i+1}号田地 (当前水分：{plot.water_level}%)")
                 
             try:
-                choice = int(input("选择田地: ")) - 1
+                choice = int(prompt("选择田地: ")) - 1
                 if 0 <= choice < len(self.plots):
-                    self.plots[choice].water_plot()
+                    self.plots[choice].water_plot(self.clock.now())
             except ValueError:
-                print("输入错误")
+                echo("输入错误")
                 
         elif operation == "施肥":
             if self.tools['肥料'] > 0:
-                print("选择要施肥的田地：")
+                echo("选择要施肥的田地：")
                 for i, plot in enumerate(self.plots):
-                    print(f"{i+1}. 第{i+1}号田地 (当前肥料：{plot.fertilizer_level}级)")
+                    echo(f"{i+1}. 第{i+1}号田地 (当前肥料：{plot.fertilizer_level}级)")
                     
                 try:
-                    choice = int(input("选择田地: ")) - 1
+                    choice = int(prompt("选择田地: ")) - 1
                     if 0 <= choice < len(self.plots):
                         if self.plots[choice].add_fertilizer():
                             self.tools['肥料'] -= 1
                 except ValueError:
-                    print("输入错误")
+                    echo("输入错误")
             else:
-                print("没有足够的肥料")
+                echo("没有足够的肥料")
                 
         elif operation == "除草":
             if self.tools['除草剂'] > 0:
-                print("使用除草剂清理杂草...")
+                echo("使用除草剂清理杂草...")
                 self.tools['除草剂'] -= 1
-                print("除草完成！作物生长环境改善")
+                echo("除草完成！作物生长环境改善")
             else:
-                print("没有除草剂了")
+                echo("没有除草剂了")
                 
     def harvest_operation(self):
         """收获操作"""
-        print("\n🌾 收获作物")
+        echo("\n🌾 收获作物")
         rewards = {}
         
         for plot in self.plots:
-            ready_crops = [(i, crop) for i, crop in enumerate(plot.crops) if crop and crop.is_ready]
-            if ready_crops:
-                print(f"第{plot.plot_id + 1}号田地有成熟的作物：")
-                for slot, crop in ready_crops:
-                    print(f"  {slot+1}. {crop.name}")
+            ready_slots = plot.ready_slots()
+            if ready_slots:
+                echo(f"第{plot.plot_id + 1}号田地有成熟的作物：")
+                for slot in ready_slots:
+                    echo(f"  {slot+1}. {plot.crop_at(slot).name}")
                     
-                choice = input("是否收获？(y/n): ")
+                choice = prompt("是否收获？(y/n): ")
                 if choice.lower() == 'y':
-                    for slot, crop in ready_crops:
+                    for slot in ready_slots:
                         crop_rewards = plot.harvest_slot(slot)
                         for item, amount in crop_rewards.items():
                             rewards[item] = rewards.get(item, 0) + amount
                             
         if rewards:
-            print(f"收获总计：{rewards}")
+            echo(f"收获总计：{rewards}")
             return rewards
         return {}
         
-    def update_farm(self, current_time, player_stats: Dict):
-        """更新农场状态"""
-        for plot in self.plots:
-            plot.update_plots(current_time, player_stats)
+    def plant(self, plot_index: int, slot: int, crop_name: str, current_time: int = None) -> bool:
+        """在指定田地种下作物并登记生长调度（默认使用游戏时钟的当前回合）"""
+        if not 0 <= plot_index < len(self.plots) or crop_name not in self.available_crops:
+            return False
+        if current_time is None:
+            current_time = self.clock.now()
+        plot = self.plots[plot_index]
+        if not plot.plant_crop(slot, self.available_crops[crop_name], current_time):
+            return False
+        self._schedule(plot_index, slot)
+        return True
+        
+    def _schedule(self, plot_index: int, slot: int):
+        """登记格子中作物下一次进入新阶段的回合"""
+        plot = self.plots[plot_index]
+        stage = plot.stage[slot]
+        if 0 < stage < 4:
+            plant_tick = plot.plant_tick[slot]
+            due = plot.crop_at(slot).stage_tick(plant_tick, stage + 1)
+            self._schedule_seq += 1
+            heapq.heappush(self.growth_queue,
+                           (due, self._schedule_seq, plot_index, slot, stage + 1, plant_tick))
             
+    def update_farm(self, current_time: int = None, player_stats: Dict = None):
+        """更新农场状态，只处理到期的生长阶段变化"""
+        if current_time is None:
+            current_time = self.clock.now()
+        player_stats = player_stats or {}
+        queue = self.growth_queue
+        while queue and queue[0][0] <= current_time:
+            _, _, plot_index, slot, target_stage, plant_tick = heapq.heappop(queue)
+            plot = self.plots[plot_index]
+            # 已收获、重新种植或已推进过的格子直接丢弃
+            if plot.is_empty(slot) or plot.plant_tick[slot] != plant_tick or plot.stage[slot] >= target_stage:
+                continue
+            # 离线追赶时直接跳到当前应处的阶段
+            crop = plot.crop_at(slot)
+            plot.advance_slot(slot, crop.expected_stage(plant_tick, current_time), player_stats)
+            if plot.is_ready(slot):
+                if output_enabled():
+                    echo(f"第{slot+1}格的{crop.name}已经成熟了！")
+            else:
+                self._schedule(plot_index, slot)
+                
+    def get_save_data(self) -> Dict:
+        """获取存档数据"""
+        return {
+            'plots': [plot.get_save_data() for plot in self.plots],
+            'tools': self.tools.copy()
+        }
+        
+    def load_from_data(self, data: Dict):
+        """从存档数据恢复田地，并重新登记生长调度"""
+        self.plots = []
+        self.growth_queue = []
+        for plot_data in data.get('plots', []):
+            plot = FarmPlot(plot_data['plot_id'], plot_data.get('size', 4), self.crop_catalogue)
+            plot.fertilizer_level = plot_data.get('fertilizer_level', 0)
+            plot.water_level = plot_data.get('water_level', 100)
+            plot.last_watered = plot_data.get('last_watered')
+            for slot_data in plot_data.get('slots', []):
+                crop = self.available_crops.get(slot_data['crop'])
+                if crop is None:
+                    continue
+                slot = slot_data['slot']
+                plot.crop_type[slot] = crop.type_id
+                plot.plant_tick[slot] = slot_data['plant_tick']
+                plot.stage[slot] = slot_data['stage']
+                plot.quality[slot] = slot_data['quality']
+            self.plots.append(plot)
+        for plot_index, plot in enumerate(self.plots):
+            for slot in range(plot.size):
+                self._schedule(plot_index, slot)
+        self.tools.update(data.get('tools', {}))
+        
     def expand_farm(self):
         """扩建农场"""
         cost = len(self.plots) * 100  # 扩建费用递增
-        print(f"扩建新田地需要 {cost} 灵石")
+        echo(f"扩建新田地需要 {cost} 灵石")
         return cost
\ No newline at end of file
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+存档存储后端
+SaveSystem 默认把存档写成独立文件；传入 backend 后改由后端负责持久化。
+
+SQLiteBackend 把存档拆成规范化的表（存档、玩家、玩家属性、任务、田地、NPC、世界状态），
+使用 WAL 模式：游戏在后台线程写入时，其他连接（包括存档菜单）可以并发读取，
+并且可以只读取玩家一行而不解析整份存档。
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, List
+
+class SaveBackend:
+    """存档存储后端接口"""
+    
+    def location(self, save_name: str) -> str:
+        """存档位置的描述（用于提示信息）"""
+        return save_name
+        
+    def write_save(self, save_name: str, save_data: Dict):
+        """写入完整存档（覆盖同名存档）"""
+        raise NotImplementedError
+        
+    def read_save(self, save_name: str) -> Dict:
+        """读取完整存档，不存在时返回 None"""
+        raise NotImplementedError
+        
+    def read_player(self, save_name: str) -> Dict:
+        """只读取玩家数据，不存在时返回 None"""
+        save_data = self.read_save(save_name)
+        return save_data['player'] if save_data else None
+        
+    def delete_save(self, save_name: str) -> bool:
+        """删除存档，返回是否存在"""
+        raise NotImplementedError
+        
+    def list_save_info(self) -> List[Dict]:
+        """列出所有存档的元数据"""
+        raise NotImplementedError
+        
+    def close(self):
+        """释放资源"""
+        pass
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS saves (
+    name TEXT PRIMARY KEY,
+    save_time TEXT,
+    version TEXT,
+    game_time INTEGER,
+    difficulty,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS players (
+    save_name TEXT PRIMARY KEY REFERENCES saves(name) ON DELETE CASCADE,
+    name TEXT,
+    realm TEXT,
+    cultivation,
+    lifetime,
+    achievements TEXT,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS player_attributes (
+    save_name TEXT REFERENCES saves(name) ON DELETE CASCADE,
+    category TEXT,
+    key TEXT,
+    value,
+    PRIMARY KEY (save_name, category, key)
+);
+CREATE TABLE IF NOT EXISTS quests (
+    save_name TEXT REFERENCES saves(name) ON DELETE CASCADE,
+    quest_id TEXT,
+    PRIMARY KEY (save_name, quest_id)
+);
+CREATE TABLE IF NOT EXISTS story_flags (
+    save_name TEXT REFERENCES saves(name) ON DELETE CASCADE,
+    flag TEXT,
+    value TEXT,
+    PRIMARY KEY (save_name, flag)
+);
+CREATE TABLE IF NOT EXISTS farm_plots (
+    save_name TEXT REFERENCES saves(name) ON DELETE CASCADE,
+    plot_id INTEGER,
+    size INTEGER,
+    fertilizer_level INTEGER,
+    water_level INTEGER,
+    last_watered INTEGER,
+    PRIMARY KEY (save_name, plot_id)
+);
+CREATE TABLE IF NOT EXISTS farm_slots (
+    save_name TEXT REFERENCES saves(name) ON DELETE CASCADE,
+    plot_id INTEGER,
+    slot INTEGER,
+    crop TEXT,
+    plant_tick INTEGER,
+    stage INTEGER,
+    quality REAL,
+    PRIMARY KEY (save_name, plot_id, slot)
+);
+CREATE TABLE IF NOT EXISTS npcs (
+    save_name TEXT REFERENCES saves(name) ON DELETE CASCADE,
+    npc_index INTEGER,
+    name TEXT,
+    realm TEXT,
+    personality TEXT,
+    location TEXT,
+    relationship,
+    extra TEXT,
+    PRIMARY KEY (save_name, npc_index)
+);
+CREATE TABLE IF NOT EXISTS world_state (
+    save_name TEXT REFERENCES saves(name) ON DELETE CASCADE,
+    key TEXT,
+    value TEXT,
+    PRIMARY KEY (save_name, key)
+);
+"""
+
+# 有独立列的字段，其余字段以 JSON 存入 extra 列
+_PLAYER_COLUMNS = ('name', 'realm', 'cultivation', 'lifetime', 'achievements')
+_PLAYER_CATEGORIES = ('stats', 'resources', 'skills')
+_NPC_COLUMNS = ('name', 'realm', 'personality', 'location', 'relationship')
+_GAME_STATE_TABLES = ('game_time', 'difficulty', 'world_state', 'story_flags', 'completed_quests', 'farm')
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+class SQLiteBackend(SaveBackend):
+    """SQLite 存档后端"""
+    
+    def __init__(self, db_path: str = os.path.join("saves", "saves.db")):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()  # 每个线程一个连接，读写互不阻塞
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        with self._connection() as conn:
+            conn.executescript(_SCHEMA)
+            
+    def _connection(self) -> sqlite3.Connection:
+        """获取当前线程的数据库连接"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # 连接只在创建它的线程中使用；关闭 check_same_thread 以便 close() 统一释放
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+        
+    def location(self, save_name: str) -> str:
+        return f"{self.db_path}#{save_name}"
+        
+    def write_save(self, save_name: str, save_data: Dict):
+        """在一个事务中写入整份存档，各表批量插入"""
+        player = save_data.get('player', {})
+        game_state = save_data.get('game_state', {})
+        world_state = dict(game_state.get('world_state') or {})
+        npcs = world_state.pop('npc_cultivators', [])
+        farm = game_state.get('farm') or {}
+        
+        save_extra = {key: value for key, value in save_data.items()
+                      if key not in ('player', 'game_state', 'save_time', 'version')}
+        state_extra = {key: value for key, value in game_state.items() if key not in _GAME_STATE_TABLES}
+        player_extra = {key: value for key, value in player.items()
+                        if key not in _PLAYER_COLUMNS and key not in _PLAYER_CATEGORIES}
+                        
+        conn = self._connection()
+        with conn:
+            # 外键级联删除旧存档的所有子表数据
+            conn.execute("DELETE FROM saves WHERE name = ?", (save_name,))
+            conn.execute(
+                "INSERT INTO saves VALUES (?, ?, ?, ?, ?, ?)",
+                (save_name, save_data.get('save_time'), save_data.get('version'),
+                 game_state.get('game_time'), game_state.get('difficulty'),
+                 _dumps({'save': save_extra, 'game_state': state_extra,
+                         'has_farm': 'farm' in game_state, 'tools': farm.get('tools')})))
+            conn.execute(
+                "INSERT INTO players VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (save_name, player.get('name'), player.get('realm'), player.get('cultivation'),
+                 player.get('lifetime'), _dumps(player.get('achievements', [])), _dumps(player_extra)))
+            conn.executemany(
+                "INSERT INTO player_attributes VALUES (?, ?, ?, ?)",
+                [(save_name, category, key, value)
+                 for category in _PLAYER_CATEGORIES
+                 for key, value in player.get(category, {}).items()])
+            conn.executemany(
+                "INSERT OR IGNORE INTO quests VALUES (?, ?)",
+                [(save_name, quest_id) for quest_id in game_state.get('completed_quests', [])])
+            conn.executemany(
+                "INSERT INTO story_flags VALUES (?, ?, ?)",
+                [(save_name, flag, _dumps(value))
+                 for flag, value in (game_state.get('story_flags') or {}).items()])
+            conn.executemany(
+                "INSERT INTO farm_plots VALUES (?, ?, ?, ?, ?, ?)",
+                [(save_name, plot['plot_id'], plot['size'], plot['fertilizer_level'],
+                  plot['water_level'], plot['last_watered'])
+                 for plot in farm.get('plots', [])])
+            conn.executemany(
+                "INSERT INTO farm_slots VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(save_name, plot['plot_id'], slot['slot'], slot['crop'],
+                  slot['plant_tick'], slot['stage'], slot['quality'])
+                 for plot in farm.get('plots', []) for slot in plot['slots']])
+            conn.executemany(
+                "INSERT INTO npcs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(save_name, index) + tuple(npc.get(column) for column in _NPC_COLUMNS) +
+                 (_dumps({key: value for key, value in npc.items() if key not in _NPC_COLUMNS}),)
+                 for index, npc in enumerate(npcs)])
+            conn.executemany(
+                "INSERT INTO world_state VALUES (?, ?, ?)",
+                [(save_name, key, _dumps(value)) for key, value in world_state.items()])
+                
+    def read_player(self, save_name: str) -> Dict:
+        """只读取玩家行及其属性"""
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT name, realm, cultivation, lifetime, achievements, extra FROM players WHERE save_name = ?",
+            (save_name,)).fetchone()
+        if row is None:
+            return None
+        player = dict(zip(_PLAYER_COLUMNS, row[:4]))
+        for category in _PLAYER_CATEGORIES:
+            player[category] = {}
+        for category, key, value in conn.execute(
+                "SELECT category, key, value FROM player_attributes WHERE save_name = ?", (save_name,)):
+            player[category][key] = value
+        player['achievements'] = json.loads(row[4])
+        player.update(json.loads(row[5]))
+        return player
+        
+    def read_save(self, save_name: str) -> Dict:
+        """读取完整存档（同一读事务内完成，读到的是一致的快照）"""
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN")
+            row = conn.execute(
+                "SELECT save_time, version, game_time, difficulty, extra FROM saves WHERE name = ?",
+                (save_name,)).fetchone()
+            if row is None:
+                return None
+            save_time, version, game_time, difficulty, extra = row
+            extra = json.loads(extra)
+            
+            world_state = {key: json.loads(value) for key, value in conn.execute(
+                "SELECT key, value FROM world_state WHERE save_name = ?", (save_name,))}
+            npcs = []
+            for row in conn.execute(
+                    "SELECT name, realm, personality, location, relationship, extra FROM npcs "
+                    "WHERE save_name = ? ORDER BY npc_index", (save_name,)):
+                npc = dict(zip(_NPC_COLUMNS, row[:5]))
+                npc.update(json.loads(row[5]))
+                npcs.append(npc)
+            world_state['npc_cultivators'] = npcs
+            
+            game_state = {
+                'game_time': game_time,
+                'difficulty': difficulty,
+                'world_state': world_state,
+                'story_flags': {flag: json.loads(value) for flag, value in conn.execute(
+                    "SELECT flag, value FROM story_flags WHERE save_name = ?", (save_name,))},
+                'completed_quests': [quest_id for quest_id, in conn.execute(
+                    "SELECT quest_id FROM quests WHERE save_name = ?", (save_name,))]
+            }
+            if extra['has_farm']:
+                plots = {}
+                for plot_id, size, fertilizer_level, water_level, last_watered in conn.execute(
+                        "SELECT plot_id, size, fertilizer_level, water_level, last_watered FROM farm_plots "
+                        "WHERE save_name = ? ORDER BY plot_id", (save_name,)):
+                    plots[plot_id] = {
+                        'plot_id': plot_id,
+                        'size': size,
+                        'fertilizer_level': fertilizer_level,
+                        'water_level': water_level,
+                        'last_watered': last_watered,
+                        'slots': []
+                    }
+                for plot_id, slot, crop, plant_tick, stage, quality in conn.execute(
+                        "SELECT plot_id, slot, crop, plant_tick, stage, quality FROM farm_slots "
+                        "WHERE save_name = ? ORDER BY plot_id, slot", (save_name,)):
+                    plots[plot_id]['slots'].append({'slot': slot, 'crop': crop, 'plant_tick': plant_tick,
+                                                    'stage': stage, 'quality': quality})
+                game_state['farm'] = {'plots': list(plots.values()), 'tools': extra['tools']}
+            game_state.update(extra['game_state'])
+            
+            save_data = {
+                'player': self.read_player(save_name),
+                'game_state': game_state,
+                'save_time': save_time,
+                'version': version
+            }
+            save_data.update(extra['save'])
+        return save_data
+        
+    def delete_save(self, save_name: str) -> bool:
+        conn = self._connection()
+        with conn:
+            cursor = conn.execute("DELETE FROM saves WHERE name = ?", (save_name,))
+        return cursor.rowcount > 0
+        
+    def list_save_info(self) -> List[Dict]:
+        """列出存档元数据（只查询存档表和玩家表）"""
+        rows = self._connection().execute(
+            "SELECT s.name, p.name, p.realm, s.game_time, s.save_time FROM saves s "
+            "LEFT JOIN players p ON p.save_name = s.name ORDER BY s.save_time DESC")
+        return [{
+            'name': name,
+            'player': player,
+            'realm': realm,
+            'game_time': game_time,
+            'save_time': save_time,
+            'format': 'sqlite',
+            'size': None,      # 存档共用一个数据库文件，没有单独的大小和校验和
+            'checksum': None
+        } for name, player, realm, game_time, save_time in rows]
+        
+    def close(self):
+        """关闭所有线程的连接"""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
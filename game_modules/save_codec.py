@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+二进制存档格式
+带版本号的分段容器：文件头之后是若干独立压缩的数据段（player、game_state 等），
+每段记录原始长度与 CRC32，可以只解析需要的段
+
+文件布局（小端序）：
+    magic(4s) version(H) codec(B) section_count(B)
+    每段：name_len(B) name raw_len(I) data_len(I) crc32(I) data
+段内数据为紧凑 JSON（C 实现的解析器比纯 Python 的标签解码更快），再按 codec 压缩。
+"""
+
+import json
+import struct
+import zlib
+from typing import Dict, Iterable
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MAGIC = b"XXSV"
+FORMAT_VERSION = 1
+
+CODEC_NONE = 0
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+CODECS = {"none": CODEC_NONE, "zlib": CODEC_ZLIB, "zstd": CODEC_ZSTD}
+
+_HEADER = struct.Struct("<4sHBB")
+_SECTION = struct.Struct("<III")
+
+class SaveFormatError(ValueError):
+    """存档文件格式错误或已损坏"""
+
+def resolve_codec(compression: str) -> int:
+    """把压缩方式名称转换为编码值（zstd 不可用时退回 zlib）"""
+    codec = CODECS.get(compression or "none")
+    if codec is None:
+        raise ValueError(f"未知压缩方式: {compression}")
+    if codec == CODEC_ZSTD and zstandard is None:
+        return CODEC_ZLIB
+    return codec
+
+def _compress(raw: bytes, codec: int) -> bytes:
+    if codec == CODEC_ZLIB:
+        return zlib.compress(raw, 6)
+    if codec == CODEC_ZSTD:
+        return zstandard.ZstdCompressor(level=3).compress(raw)
+    return raw
+
+def _decompress(data: bytes, codec: int) -> bytes:
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(data)
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise SaveFormatError("该存档使用 zstd 压缩，需要安装 zstandard")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return bytes(data)
+
+def encode_save(save_data: Dict, compression: str = "zlib") -> bytes:
+    """把存档数据编码为二进制，每个顶层字段一段"""
+    codec = resolve_codec(compression)
+    parts = [_HEADER.pack(MAGIC, FORMAT_VERSION, codec, len(save_data))]
+    for name, value in save_data.items():
+        raw = json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        data = _compress(raw, codec)
+        encoded_name = name.encode('utf-8')
+        parts.append(bytes([len(encoded_name)]) + encoded_name)
+        parts.append(_SECTION.pack(len(raw), len(data), zlib.crc32(raw)))
+        parts.append(data)
+    return b"".join(parts)
+
+def is_binary_save(data: bytes) -> bool:
+    """判断数据是否为二进制存档"""
+    return data[:4] == MAGIC
+
+def decode_save(data: bytes, sections: Iterable[str] = None) -> Dict:
+    """解码二进制存档；指定 sections 时只解析这些段"""
+    if len(data) < _HEADER.size:
+        raise SaveFormatError("存档文件过短")
+    magic, version, codec, count = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise SaveFormatError("不是二进制存档")
+    if version > FORMAT_VERSION:
+        raise SaveFormatError(f"存档格式版本 {version} 高于当前支持的 {FORMAT_VERSION}")
+        
+    wanted = set(sections) if sections is not None else None
+    result = {}
+    offset = _HEADER.size
+    view = memoryview(data)
+    for _ in range(count):
+        try:
+            name_len = data[offset]
+            name = bytes(view[offset + 1:offset + 1 + name_len]).decode('utf-8')
+            offset += 1 + name_len
+            raw_len, data_len, crc = _SECTION.unpack_from(data, offset)
+        except (IndexError, struct.error):
+            raise SaveFormatError("存档文件不完整")
+        offset += _SECTION.size
+        if offset + data_len > len(data):
+            raise SaveFormatError("存档文件不完整")
+        if wanted is None or name in wanted:
+            raw = _decompress(view[offset:offset + data_len], codec)
+            if len(raw) != raw_len or zlib.crc32(raw) != crc:
+                raise SaveFormatError(f"数据段 {name} 校验失败")
+            result[name] = json.loads(raw)
+        offset += data_len
+    return result
@@ -3,18 +3,108 @@
 """
 存档系统模块
 处理游戏的保存和读取功能
+
+日志模式下，同一存档的后续保存只把与上一次检查点相比发生变化的字段
+追加到 <存档名>.journal，累积一定条数后再压缩为完整快照；读取时先读快照再重放日志。
+后台模式下，自动保存只在主循环中做一次廉价的快照，序列化和落盘交给工作线程。
+存档可选 JSON（.json）或二进制（.sav，见 save_codec）格式，读取时按文件内容自动识别。
+存档目录下的 index.json 记录每个存档的元数据，保存和删除时同步维护，列出存档无需扫描和解析存档文件。
+传入 backend（见 save_backends）时，存档的读写、列出和删除都交给后端，文件格式、日志和索引选项不再生效。
+每个存档带有随机数服务的重放令牌（见 game_utils.rng），读档后的随机结果与存档时继续游戏一致。
 """
 
 import json
 import os
+import pickle
+import threading
+import time
+import zlib
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Tuple
+from game_modules.save_backends import SaveBackend
+from game_modules.save_codec import encode_save, decode_save, is_binary_save
+from game_utils.renderer import echo
+from game_utils.rng import get_rng_service
+
+def _atomic_write(path: str, content):
+    """先写临时文件并落盘，再原子替换目标文件"""
+    tmp_path = path + ".tmp"
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def _diff(old, new, path: List = None, ops: List = None) -> List:
+    """计算两份 JSON 数据的字段级差异，返回 set/del 操作列表"""
+    path = path or []
+    ops = [] if ops is None else ops
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key, value in new.items():
+            if key not in old:
+                ops.append(["set", path + [key], value])
+            elif old[key] != value:
+                _diff(old[key], value, path + [key], ops)
+        for key in old:
+            if key not in new:
+                ops.append(["del", path + [key]])
+    elif old != new:
+        ops.append(["set", path, new])
+    return ops
+
+def _apply(data: Dict, ops: List) -> Dict:
+    """把差异操作应用到数据上"""
+    for op in ops:
+        action, path = op[0], op[1]
+        if not path:
+            data = op[2]
+            continue
+        target = data
+        for key in path[:-1]:
+            target = target.setdefault(key, {})
+        if action == "set":
+            target[path[-1]] = op[2]
+        else:
+            target.pop(path[-1], None)
+    return data
 
 class SaveSystem:
     """存档系统"""
     
-    def __init__(self, save_dir: str = "saves"):
+    EXTENSIONS = {"json": ".json", "binary": ".sav"}
+    INDEX_FILE = "index.json"
+    
+    def __init__(self, save_dir: str = "saves", journal: bool = False, compact_every: int = 50,
+                 background: bool = False, format: str = "json", compression: str = "zlib",
+                 backend: SaveBackend = None):
+        if format not in self.EXTENSIONS:
+            raise ValueError(f"未知存档格式: {format}")
         self.save_dir = save_dir
+        self.backend = backend  # 存储后端，None 表示按文件保存
+        self.format = format  # 存档格式：json 或 binary
+        self.compression = compression  # 二进制格式的压缩方式：none、zlib 或 zstd
+        self.journal = journal  # 是否启用增量日志
+        self.compact_every = compact_every  # 日志累积多少条后压缩为完整快照
+        self.background = background  # 自动保存是否在后台线程落盘
+        self._checkpoints = {}  # 存档名 -> (最近一次保存的数据, 日志序号, 未压缩条数)
+        self._io_lock = threading.Lock()
+        self._pending = None  # 等待后台写入的 (存档名, 数据)，只保留最新一份
+        self._pending_cond = threading.Condition()
+        self._writing = False
+        self._worker = None
+        self._index = None  # 存档名 -> 元数据，首次使用时从 index.json 读取
+        self._index_mtime = None
+        self.last_autosave_error = None
+        self.autosave_metrics = {
+            'snapshots': 0,        # 自动保存快照次数
+            'blocked_total': 0.0,  # 主循环累计阻塞时间（秒）
+            'blocked_max': 0.0,    # 单次最长阻塞时间（秒）
+            'writes': 0,           # 后台实际写入次数
+            'write_total': 0.0,    # 后台累计写入时间（秒）
+            'coalesced': 0         # 被更新快照覆盖而跳过的写入
+        }
         self._ensure_save_directory()
         
     def _ensure_save_directory(self):
@@ -22,73 +112,484 @@ class SaveSystem:
         if not os.path.exists(self.save_dir):
             os.makedirs(self.save_dir)
             
+    def _save_path(self, save_name: str, format: str = None) -> str:
+        extension = self.EXTENSIONS[format or self.format]
+        return os.path.join(self.save_dir, f"{save_name}{extension}")
+        
+    def _location(self, save_name: str) -> str:
+        """存档位置的描述（用于提示信息）"""
+        if self.backend is not None:
+            return self.backend.location(save_name)
+        return self._save_path(save_name)
+        
+    def _find_save(self, save_name: str) -> str:
+        """查找已有的存档文件，优先当前格式"""
+        formats = [self.format] + [f for f in self.EXTENSIONS if f != self.format]
+        for format in formats:
+            path = self._save_path(save_name, format)
+            if os.path.exists(path):
+                return path
+        return None
+        
+    def _serialize(self, save_data: Dict):
+        """按当前格式序列化存档数据"""
+        if self.format == "binary":
+            return encode_save(save_data, self.compression)
+        return json.dumps(save_data, ensure_ascii=False, indent=2)
+        
+    def _read_file(self, path: str) -> Dict:
+        """读取存档文件，自动识别格式"""
+        with open(path, 'rb') as f:
+            content = f.read()
+        if is_binary_save(content):
+            return decode_save(content)
+        return json.loads(content.decode('utf-8'))
+        
+    def _store(self, save_name: str, save_data: Dict) -> str:
+        """原子写入完整存档，并移除其他格式的旧文件，返回文件内容的校验和"""
+        content = self._serialize(save_data)
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        _atomic_write(self._save_path(save_name), content)
+        for format in self.EXTENSIONS:
+            if format != self.format:
+                stale_path = self._save_path(save_name, format)
+                if os.path.exists(stale_path):
+                    os.remove(stale_path)
+        return f"{zlib.crc32(content):08x}"
+        
+    def _index_path(self) -> str:
+        return os.path.join(self.save_dir, self.INDEX_FILE)
+        
+    def _load_index(self) -> Dict[str, Dict]:
+        """读取存档索引；索引缺失或损坏时扫描目录重建"""
+        index_path = self._index_path()
+        try:
+            mtime = os.stat(index_path).st_mtime_ns
+        except OSError:
+            mtime = None
+        if self._index is not None and mtime == self._index_mtime:
+            return self._index
+            
+        if mtime is None:
+            return self._rebuild_index()
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                self._index = json.load(f)['saves']
+            self._index_mtime = mtime
+        except (OSError, ValueError, KeyError, TypeError):
+            return self._rebuild_index()
+        return self._index
+        
+    def _write_index(self):
+        index_path = self._index_path()
+        _atomic_write(index_path, json.dumps({'version': 1, 'saves': self._index},
+                                             ensure_ascii=False, separators=(',', ':')))
+        self._index_mtime = os.stat(index_path).st_mtime_ns
+        
+    def _describe(self, save_name: str, save_data: Dict, checksum: str = None) -> Dict:
+        """根据存档数据生成索引条目"""
+        player = save_data.get('player', {})
+        game_state = save_data.get('game_state', {})
+        path = self._find_save(save_name)
+        journal_path = self._journal_path(save_name)
+        size = os.path.getsize(path) if path else 0
+        if os.path.exists(journal_path):
+            size += os.path.getsize(journal_path)
+        if checksum is None and path:
+            with open(path, 'rb') as f:
+                checksum = f"{zlib.crc32(f.read()):08x}"
+        return {
+            'player': player.get('name'),
+            'realm': player.get('realm'),
+            'game_time': game_state.get('game_time'),
+            'save_time': save_data.get('save_time'),
+            'format': 'binary' if path and path.endswith(self.EXTENSIONS['binary']) else 'json',
+            'size': size,
+            'checksum': checksum
+        }
+        
+    def _update_index(self, save_name: str, save_data: Dict, checksum: str = None):
+        """保存后更新索引条目（调用方持有 _io_lock）"""
+        index = self._load_index()
+        entry = self._describe(save_name, save_data, checksum)
+        if checksum is None and save_name in index:
+            # 日志追加不改动快照文件，沿用快照的校验和
+            entry['checksum'] = index[save_name].get('checksum')
+        index[save_name] = entry
+        self._write_index()
+        
+    def _rebuild_index(self) -> Dict[str, Dict]:
+        """扫描存档目录重建索引，只解析元数据所需的字段"""
+        self._index = {}
+        if os.path.exists(self.save_dir):
+            extensions = tuple(self.EXTENSIONS.values())
+            for file in os.listdir(self.save_dir):
+                if file == self.INDEX_FILE or not file.endswith(extensions):
+                    continue
+                save_name = os.path.splitext(file)[0]
+                if save_name in self._index:
+                    continue
+                try:
+                    with open(os.path.join(self.save_dir, file), 'rb') as f:
+                        content = f.read()
+                    journaled = os.path.exists(self._journal_path(save_name))
+                    if is_binary_save(content):
+                        # 只解码元数据所在的段；有日志时需要完整数据来重放
+                        sections = None if journaled else ('player', 'game_state', 'save_time')
+                        save_data = decode_save(content, sections)
+                    else:
+                        save_data = json.loads(content.decode('utf-8'))
+                    if journaled:
+                        save_data = self._replay_journal(save_name, save_data)[0]
+                except (OSError, ValueError):
+                    continue
+                self._index[save_name] = self._describe(save_name, save_data)
+            self._write_index()
+        return self._index
+        
+    def _journal_path(self, save_name: str) -> str:
+        return os.path.join(self.save_dir, f"{save_name}.journal")
+        
     def save_game(self, player, game_state: Dict, save_name: str = None) -> str:
         """保存游戏"""
         if not save_name:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             save_name = f"save_{timestamp}"
             
-        save_data = {
+        save_data = self._build_save_data(player, game_state)
+        save_path = self._location(save_name)
+        
+        try:
+            self._write_save(save_name, save_data)
+            echo(f"游戏已保存至: {save_path}")
+            return save_path
+        except Exception as e:
+            echo(f"保存失败: {e}")
+            return None
+            
+    def _build_save_data(self, player, game_state: Dict) -> Dict:
+        """组装存档数据"""
+        return {
             'player': player.get_save_data(),
             'game_state': game_state,
             'save_time': datetime.now().isoformat(),
-            'version': '1.0'
+            'version': '1.0',
+            'rng': get_rng_service().checkpoint()  # 重放令牌：保存后随机数流进入新纪元
         }
         
-        save_path = os.path.join(self.save_dir, f"{save_name}.json")
+    def _write_save(self, save_name: str, save_data: Dict):
+        """把存档数据写入磁盘（整文件写入也经过临时文件和原子替换）"""
+        with self._io_lock:
+            if self.backend is not None:
+                self.backend.write_save(save_name, save_data)
+                return
+            if self.journal:
+                checksum = self._journaled_save(save_name, save_data)
+            else:
+                checksum = self._store(save_name, save_data)
+            self._update_index(save_name, save_data, checksum)
+            
+    def _journaled_save(self, save_name: str, save_data: Dict) -> str:
+        """日志模式保存：只追加变化的字段，定期压缩；写入快照时返回其校验和"""
+        # 规范化为纯 JSON 数据，同时得到与游戏对象脱钩的副本
+        save_data = json.loads(json.dumps(save_data, ensure_ascii=False))
+        checkpoint = self._checkpoints.get(save_name)
         
-        try:
-            with open(save_path, 'w', encoding='utf-8') as f:
-                json.dump(save_data, f, ensure_ascii=False, indent=2)
-            print(f"游戏已保存至: {save_path}")
-            return save_path
-        except Exception as e:
-            print(f"保存失败: {e}")
+        if checkpoint is None or checkpoint[2] >= self.compact_every:
+            # 本进程未读过该存档时，磁盘上可能还留着旧会话的日志：序号须从其最后一条接着算，
+            # 新快照的 journal_seq 才能覆盖盘上全部旧条目
+            seq = checkpoint[1] if checkpoint else self._journal_last_seq(save_name)
+            return self._write_snapshot(save_name, save_data, seq)
+            
+        baseline, seq, pending = checkpoint
+        ops = _diff(baseline, save_data)
+        if not ops:
             return None
             
-    def load_game(self, save_name: str):
-        """读取游戏存档"""
-        save_path = os.path.join(self.save_dir, f"{save_name}.json")
+        seq += 1
+        payload = json.dumps({'seq': seq, 'ops': ops}, ensure_ascii=False, separators=(',', ':'))
+        line = f"{zlib.crc32(payload.encode('utf-8')):08x} {payload}\n"
+        with open(self._journal_path(save_name), 'a', encoding='utf-8') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        self._checkpoints[save_name] = (save_data, seq, pending + 1)
+        return None
+        
+    def _write_snapshot(self, save_name: str, save_data: Dict, seq: int) -> str:
+        """写入完整快照并清空日志，返回快照的校验和"""
+        checksum = self._store(save_name, dict(save_data, journal_seq=seq))
+        # 快照已包含序号 <= seq 的全部改动；即使在此处崩溃，重放时也会跳过这些旧条目
+        journal_path = self._journal_path(save_name)
+        if os.path.exists(journal_path):
+            os.remove(journal_path)
+        self._checkpoints[save_name] = (save_data, seq, 0)
+        return checksum
+        
+    @staticmethod
+    def _journal_entries(journal_path: str):
+        """逐条读出日志中完好的条目（条目, 所占字节数），遇到损坏或不完整的条目即停止"""
+        with open(journal_path, 'rb') as f:
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    return
+                try:
+                    crc, payload = raw.rstrip(b"\n").split(b" ", 1)
+                    if int(crc, 16) != zlib.crc32(payload):
+                        return
+                    entry = json.loads(payload.decode('utf-8'))
+                except ValueError:
+                    return
+                yield entry, len(raw)
+                
+    def _journal_last_seq(self, save_name: str) -> int:
+        """磁盘上日志最后一条完好条目的序号（没有日志时为 0）"""
+        journal_path = self._journal_path(save_name)
+        seq = 0
+        if os.path.exists(journal_path):
+            for entry, _ in self._journal_entries(journal_path):
+                seq = entry['seq']
+        return seq
+        
+    def _replay_journal(self, save_name: str, save_data: Dict) -> Tuple[Dict, int, int]:
+        """在快照上重放日志，遇到损坏或不完整的条目即停止并截断"""
+        seq = save_data.pop('journal_seq', 0)
+        journal_path = self._journal_path(save_name)
+        applied = 0
+        if not os.path.exists(journal_path):
+            return save_data, seq, applied
+            
+        valid_bytes = 0
+        for entry, size in self._journal_entries(journal_path):
+            valid_bytes += size
+            if entry['seq'] <= seq:
+                continue
+            save_data = _apply(save_data, entry['ops'])
+            seq = entry['seq']
+            applied += 1
+            
+        # 去掉崩溃时写了一半的尾部，后续追加才不会接在残缺行后面
+        if valid_bytes < os.path.getsize(journal_path):
+            with open(journal_path, 'r+b') as f:
+                f.truncate(valid_bytes)
+        return save_data, seq, applied
+        
+    def load_game(self, save_name: str, restore_rng: bool = True):
+        """读取游戏存档；restore_rng 为 True 时按存档中的重放令牌重设随机数服务"""
+        save_data = self._load_save_data(save_name)
+        if save_data and restore_rng and 'rng' in save_data:
+            get_rng_service().restore(save_data['rng'])
+        return save_data
         
-        if not os.path.exists(save_path):
-            print(f"存档不存在: {save_path}")
+    def _load_save_data(self, save_name: str):
+        """读取存档数据"""
+        if self.backend is not None:
+            return self._load_from_backend(save_name)
+            
+        save_path = self._find_save(save_name)
+        
+        if save_path is None:
+            echo(f"存档不存在: {self._save_path(save_name)}")
             return None
             
         try:
-            with open(save_path, 'r', encoding='utf-8') as f:
-                save_data = json.load(f)
+            with self._io_lock:
+                save_data = self._read_file(save_path)
                 
-            print(f"成功读取存档: {save_path}")
+                if self.journal or 'journal_seq' in save_data:
+                    save_data, seq, applied = self._replay_journal(save_name, save_data)
+                    self._checkpoints[save_name] = (json.loads(json.dumps(save_data)), seq, applied)
+                    
+            echo(f"成功读取存档: {save_path}")
             return save_data
         except Exception as e:
-            print(f"读取存档失败: {e}")
+            echo(f"读取存档失败: {e}")
             return None
             
+    def _load_from_backend(self, save_name: str):
+        """从存储后端读取存档（后端自行处理并发读取，不持有 _io_lock）"""
+        try:
+            save_data = self.backend.read_save(save_name)
+        except Exception as e:
+            echo(f"读取存档失败: {e}")
+            return None
+        if save_data is None:
+            echo(f"存档不存在: {self._location(save_name)}")
+            return None
+        echo(f"成功读取存档: {self._location(save_name)}")
+        return save_data
+        
+    def load_player(self, save_name: str) -> Dict:
+        """只读取存档中的玩家数据（二进制存档只解码玩家段）"""
+        if self.backend is not None:
+            return self.backend.read_player(save_name)
+        save_path = self._find_save(save_name)
+        if save_path is None:
+            return None
+        with self._io_lock:
+            with open(save_path, 'rb') as f:
+                content = f.read()
+        # 日志只记录整体差异，玩家数据可能在日志中，需要完整读取（二进制与 JSON 存档都一样）
+        if os.path.exists(self._journal_path(save_name)):
+            save_data = self.load_game(save_name, restore_rng=False)
+            return save_data['player'] if save_data else None
+        if is_binary_save(content):
+            return decode_save(content, ('player',)).get('player')
+        return json.loads(content.decode('utf-8')).get('player')
+        
     def list_saves(self) -> List[str]:
-        """列出所有存档"""
-        saves = []
-        if os.path.exists(self.save_dir):
-            for file in os.listdir(self.save_dir):
-                if file.endswith('.json'):
-                    saves.append(file[:-5])  # 移除.json后缀
-        return sorted(saves)
+        """列出所有存档（读取索引，不扫描目录）"""
+        if self.backend is not None:
+            return sorted(info['name'] for info in self.backend.list_save_info())
+        with self._io_lock:
+            return sorted(self._load_index())
+            
+    def list_save_info(self) -> List[Dict]:
+        """列出所有存档及其元数据（玩家、境界、游戏时间、大小、校验和等），按保存时间倒序"""
+        if self.backend is not None:
+            return self.backend.list_save_info()
+        with self._io_lock:
+            index = self._load_index()
+            infos = [dict(info, name=save_name) for save_name, info in index.items()]
+        return sorted(infos, key=lambda info: info.get('save_time') or '', reverse=True)
+        
+    def get_save_info(self, save_name: str) -> Dict:
+        """获取单个存档的元数据"""
+        if self.backend is not None:
+            return next((info for info in self.backend.list_save_info() if info['name'] == save_name), None)
+        with self._io_lock:
+            info = self._load_index().get(save_name)
+        return dict(info, name=save_name) if info else None
         
+    def rebuild_index(self) -> int:
+        """手动重建存档索引（存档目录被外部修改后使用），返回存档数量"""
+        if self.backend is not None:
+            return len(self.backend.list_save_info())
+        with self._io_lock:
+            return len(self._rebuild_index())
+            
     def delete_save(self, save_name: str) -> bool:
         """删除存档"""
-        save_path = os.path.join(self.save_dir, f"{save_name}.json")
+        if self.backend is not None:
+            with self._io_lock:
+                deleted = self.backend.delete_save(save_name)
+            echo(f"已删除存档: {save_name}" if deleted else f"存档不存在: {save_name}")
+            return deleted
+            
+        save_path = self._find_save(save_name)
         
-        if os.path.exists(save_path):
+        if save_path is not None:
             try:
-                os.remove(save_path)
-                print(f"已删除存档: {save_name}")
+                with self._io_lock:
+                    for format in self.EXTENSIONS:
+                        path = self._save_path(save_name, format)
+                        if os.path.exists(path):
+                            os.remove(path)
+                    journal_path = self._journal_path(save_name)
+                    if os.path.exists(journal_path):
+                        os.remove(journal_path)
+                    self._checkpoints.pop(save_name, None)
+                    index = self._load_index()
+                    if index.pop(save_name, None) is not None:
+                        self._write_index()
+                echo(f"已删除存档: {save_name}")
                 return True
             except Exception as e:
-                print(f"删除失败: {e}")
+                echo(f"删除失败: {e}")
                 return False
         else:
-            print(f"存档不存在: {save_name}")
+            with self._io_lock:
+                index = self._load_index()
+                if index.pop(save_name, None) is not None:
+                    self._write_index()
+            echo(f"存档不存在: {save_name}")
             return False
             
+    def export_json(self, save_name: str, export_path: str = None) -> str:
+        """把存档导出为带缩进的 JSON，便于调试查看"""
+        save_data = self.load_game(save_name, restore_rng=False)
+        if save_data is None:
+            return None
+        if export_path is None:
+            export_dir = os.path.join(self.save_dir, "exports")
+            os.makedirs(export_dir, exist_ok=True)
+            export_path = os.path.join(export_dir, f"{save_name}.json")
+        with open(export_path, 'w', encoding='utf-8') as f:
+            json.dump(save_data, f, ensure_ascii=False, indent=2)
+        echo(f"存档已导出至: {export_path}")
+        return export_path
+        
     def auto_save(self, player, game_state: Dict):
         """自动保存"""
-        return self.save_game(player, game_state, "auto_save")
\ No newline at end of file
+        if not self.background:
+            return self.save_game(player, game_state, "auto_save")
+            
+        if self.last_autosave_error:
+            echo(f"自动保存失败: {self.last_autosave_error}")
+            self.last_autosave_error = None
+            
+        # 主循环只负责拍快照：pickle 往返得到与游戏对象完全脱钩的深拷贝
+        start = time.perf_counter()
+        save_data = self._build_save_data(player, game_state)
+        snapshot = pickle.loads(pickle.dumps(save_data, pickle.HIGHEST_PROTOCOL))
+        with self._pending_cond:
+            if self._pending is not None:
+                self.autosave_metrics['coalesced'] += 1
+            self._pending = ("auto_save", snapshot)
+            self._pending_cond.notify()
+        self._ensure_worker()
+        blocked = time.perf_counter() - start
+        
+        metrics = self.autosave_metrics
+        metrics['snapshots'] += 1
+        metrics['blocked_total'] += blocked
+        metrics['blocked_max'] = max(metrics['blocked_max'], blocked)
+        return self._location("auto_save")
+        
+    def _ensure_worker(self):
+        """按需启动后台写入线程"""
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._autosave_worker,
+                                            name="autosave", daemon=True)
+            self._worker.start()
+            
+    def _autosave_worker(self):
+        """后台线程：序列化并落盘最新的自动保存快照"""
+        while True:
+            with self._pending_cond:
+                while self._pending is None:
+                    self._pending_cond.wait()
+                save_name, save_data = self._pending
+                self._pending = None
+                self._writing = True
+            start = time.perf_counter()
+            try:
+                self._write_save(save_name, save_data)
+            except Exception as e:
+                self.last_autosave_error = e
+            finally:
+                elapsed = time.perf_counter() - start
+                with self._pending_cond:
+                    self._writing = False
+                    self.autosave_metrics['writes'] += 1
+                    self.autosave_metrics['write_total'] += elapsed
+                    self._pending_cond.notify_all()
+                    
+    def flush(self, timeout: float = None) -> bool:
+        """等待后台自动保存全部落盘，超时返回 False"""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        with self._pending_cond:
+            while self._pending is not None or self._writing:
+                remaining = None if deadline is None else deadline - time.perf_counter()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._pending_cond.wait(remaining)
+        return True
+        
+    def get_autosave_metrics(self) -> Dict[str, float]:
+        """获取自动保存指标（含平均阻塞与写入耗时）"""
+        metrics = dict(self.autosave_metrics)
+        metrics['blocked_avg'] = metrics['blocked_total'] / metrics['snapshots'] if metrics['snapshots'] else 0.0
+        metrics['write_avg'] = metrics['write_total'] / metrics['writes'] if metrics['writes'] else 0.0
+        return metrics
@@ -5,8 +5,11 @@
 处理修仙门派相关功能
 """
 
-import random
 from typing import Dict, List
+from game_utils.renderer import echo
+from game_utils.rng import stream
+
+_rng = stream("sect")  # 本模块的随机数流
 
 class Sect:
     """门派类"""
@@ -37,34 +40,34 @@ class Sect:
         """加入门派"""
         # 检查入门条件
         if player.realm == "凡人":
-            print("凡人无法加入门派")
+            echo("凡人无法加入门派")
             return False
             
         if hasattr(player, 'sect') and player.sect:
-            print("你已经有门派了")
+            echo("你已经有门派了")
             return False
             
         # 入门测试（简化版）
         test_difficulty = max(1, self.reputation // 100)
         success_chance = (player.stats['悟性'] + player.stats['机缘']) / 20
         
-        if random.random() < success_chance / test_difficulty:
+        if _rng.random() < success_chance / test_difficulty:
             player.sect = self
             self.members.append(player.name)
-            print(f"恭喜加入{self.name}！")
+            echo(f"恭喜加入{self.name}！")
             
             # 新手奖励
             player.add_resource("灵石", 100)
             player.add_resource("贡献点", 50)
             return True
         else:
-            print("入门测试失败")
+            echo("入门测试失败")
             return False
             
     def sect_task(self, player) -> bool:
         """门派任务"""
         if not hasattr(player, 'sect') or not player.sect:
-            print("你还没有门派")
+            echo("你还没有门派")
             return False
             
         tasks = [
@@ -72,41 +75,41 @@ class Sect:
             "协助炼丹", "维护阵法", "教导新弟子"
         ]
         
-        task = random.choice(tasks)
-        difficulty = random.randint(1, 5)
+        task = _rng.choice(tasks)
+        difficulty = _rng.randint(1, 5)
         reward = difficulty * 20
         
-        print(f"门派任务：{task}")
-        print(f"难度等级：{difficulty}")
-        print(f"奖励：{reward}贡献点")
+        echo(f"门派任务：{task}")
+        echo(f"难度等级：{difficulty}")
+        echo(f"奖励：{reward}贡献点")
         
         # 任务成功率
         success_rate = (
             player.stats['体质'] * 0.2 + 
             player.stats['悟性'] * 0.15 + 
             player.stats['机缘'] * 0.1 +
-            random.randint(-10, 10)
+            _rng.randint(-10, 10)
         ) / 100
         
         if success_rate > 0.5:
-            print("任务完成！")
+            echo("任务完成！")
             player.add_resource("贡献点", reward)
             
             # 随机获得物品奖励
-            if random.random() < 0.3:
+            if _rng.random() < 0.3:
                 items = ["丹药", "法器", "秘籍"]
-                item = random.choice(items)
+                item = _rng.choice(items)
                 player.add_resource(item, 1)
-                print(f"额外获得{item}一件")
+                echo(f"额外获得{item}一件")
             return True
         else:
-            print("任务失败...")
+            echo("任务失败...")
             return False
             
     def sect_exchange(self, player, item: str) -> bool:
         """门派兑换"""
         if not hasattr(player, 'sect') or not player.sect:
-            print("你还没有门派")
+            echo("你还没有门派")
             return False
             
         exchange_rates = {
@@ -117,17 +120,17 @@ class Sect:
         }
         
         if item not in exchange_rates:
-            print("该物品无法兑换")
+            echo("该物品无法兑换")
             return False
             
         cost = exchange_rates[item]["贡献点"]
         if player.resources.get("贡献点", 0) >= cost:
             player.resources["贡献点"] -= cost
             player.add_resource(item, 1)
-            print(f"成功兑换{item}")
+            echo(f"成功兑换{item}")
             return True
         else:
-            print(f"贡献点不足，需要{cost}点")
+            echo(f"贡献点不足，需要{cost}点")
             return False
 
 class SectSystem:
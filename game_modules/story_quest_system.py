@@ -8,6 +8,7 @@
 import random
 from typing import Dict, List, Callable
 from datetime import datetime
+from game_utils.renderer import echo
 
 class Quest:
     """任务类"""
@@ -34,8 +35,8 @@ class Quest:
         self.status = "active"
         self.accept_time = datetime.now()
         self.progress = {obj['id']: 0 for obj in self.objectives}
-        print(f"📋 任务已接受：{self.title}")
-        print(f"📝 任务描述：{self.description}")
+        echo(f"📋 任务已接受：{self.title}")
+        echo(f"📝 任务描述：{self.description}")
         
     def update_progress(self, objective_id: str, amount: int = 1):
         """更新任务进度"""
@@ -214,24 +215,24 @@ class StoryQuestSystem:
                 
     def complete_quest(self, quest: Quest):
         """完成任务"""
-        print(f"\n🎉 任务完成：{quest.title}")
-        print("获得奖励：")
+        echo(f"\n🎉 任务完成：{quest.title}")
+        echo("获得奖励：")
         
         rewards = quest.get_rewards()
         for reward_type, amount in rewards.items():
             if reward_type == "灵石":
                 # 这里应该调用玩家的添加资源方法
-                print(f"  - {amount} 灵石")
+                echo(f"  - {amount} 灵石")
             elif reward_type == "经验值":
-                print(f"  - {amount} 经验值")
+                echo(f"  - {amount} 经验值")
             elif reward_type == "next_quest":
                 # 自动触发下一个任务
                 next_quest_id = amount
                 if next_quest_id in self.quests:
                     self.quests[next_quest_id].status = "available"
-                    print(f"  - 解锁新任务：{self.quests[next_quest_id].title}")
+                    echo(f"  - 解锁新任务：{self.quests[next_quest_id].title}")
             else:
-                print(f"  - {amount} {reward_type}")
+                echo(f"  - {amount} {reward_type}")
                 
         # 移动到完成列表
         self.active_quests.remove(quest)
@@ -242,31 +243,31 @@ class StoryQuestSystem:
         
     def show_quest_status(self):
         """显示任务状态"""
-        print("\n=== 任务面板 ===")
+        echo("\n=== 任务面板 ===")
         
         if self.active_quests:
-            print("📋 进行中的任务：")
+            echo("📋 进行中的任务：")
             for quest in self.active_quests:
-                print(f"  🎯 {quest.title}")
-                print(f"    {quest.description}")
-                print("    进度：")
+                echo(f"  🎯 {quest.title}")
+                echo(f"    {quest.description}")
+                echo("    进度：")
                 for obj in quest.objectives:
                     current = quest.progress.get(obj['id'], 0)
-                    print(f"      {obj['desc']}: {current}/{obj['required']}")
-                print()
+                    echo(f"      {obj['desc']}: {current}/{obj['required']}")
+                echo()
                 
         available_quests = self.get_available_quests(None)  # 简化处理
         if available_quests:
-            print("🆕 可接任务：")
+            echo("🆕 可接任务：")
             for quest in available_quests[:3]:  # 只显示前3个
-                print(f"  🆕 {quest.title}")
-                print(f"    {quest.description}")
-                print()
+                echo(f"  🆕 {quest.title}")
+                echo(f"    {quest.description}")
+                echo()
                 
         if self.completed_quests:
-            print("✅ 已完成任务：")
+            echo("✅ 已完成任务：")
             for quest in self.completed_quests[-3:]:  # 只显示最近3个
-                print(f"  ✅ {quest.title}")
+                echo(f"  ✅ {quest.title}")
                 
     def trigger_story_event(self, event_type: str, player) -> bool:
         """触发剧情事件"""
@@ -293,30 +294,30 @@ class StoryQuestSystem:
         
     def _first_combat_event(self, player):
         """首次战斗剧情"""
-        print("\n🎭 剧情触发：初次战斗")
-        print("这是你第一次真正意义上的战斗...")
-        print("紧张、兴奋、还有一丝不安...")
-        print("但这就是修仙路上必经的考验！")
+        echo("\n🎭 剧情触发：初次战斗")
+        echo("这是你第一次真正意义上的战斗...")
+        echo("紧张、兴奋、还有一丝不安...")
+        echo("但这就是修仙路上必经的考验！")
         
         self.story_flags["first_combat"] = True
         return True
         
     def _first_breakthrough_event(self, player):
         """首次突破剧情"""
-        print("\n🎭 剧情触发：境界突破")
-        print(f"恭喜你，{player.name}！")
-        print(f"从凡人成功突破至{player.realm}！")
-        print("这只是一个开始，前方还有更广阔的天地等着你探索...")
+        echo("\n🎭 剧情触发：境界突破")
+        echo(f"恭喜你，{player.name}！")
+        echo(f"从凡人成功突破至{player.realm}！")
+        echo("这只是一个开始，前方还有更广阔的天地等着你探索...")
         
         self.story_flags["first_breakthrough"] = True
         return True
         
     def _sect_choice_event(self, player):
         """门派选择剧情"""
-        print("\n🎭 剧情触发：门派归属")
-        print(f"欢迎加入{player.sect.name}！")
-        print("从此你不再是孤身一人，有了同门师兄弟姐妹。")
-        print("门派将为你提供资源、指导和保护...")
+        echo("\n🎭 剧情触发：门派归属")
+        echo(f"欢迎加入{player.sect.name}！")
+        echo("从此你不再是孤身一人，有了同门师兄弟姐妹。")
+        echo("门派将为你提供资源、指导和保护...")
         
         self.story_flags["sect_chosen"] = True
         return True
\ No newline at end of file
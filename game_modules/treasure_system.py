@@ -5,9 +5,13 @@
 完整的法宝体系，参照《仙逆》等经典作品
 """
 
-import random
 from typing import Dict, List, Tuple
 from datetime import datetime
+from game_utils.console_io import prompt
+from game_utils.renderer import echo
+from game_utils.rng import stream
+
+_rng = stream("treasure")  # 本模块的随机数流
 
 class Treasure:
     """法宝基类"""
@@ -119,7 +123,7 @@ class TreasureRefining:
     def refine_treasure(self, treasure: Treasure, player_level: int) -> bool:
         """精炼法宝"""
         if not treasure.can_refine():
-            print("已达到最大精炼等级")
+            echo("已达到最大精炼等级")
             return False
             
         # 检查所需材料
@@ -132,13 +136,13 @@ class TreasureRefining:
         
         # 精炼成功率
         success_rate = max(0.3, 0.9 - (treasure.refinement_level * 0.05))
-        if random.random() > success_rate:
-            print("精炼失败...")
+        if _rng.random() > success_rate:
+            echo("精炼失败...")
             return False
             
         # 精炼成功
         treasure.refinement_level += 1
-        print(f"精炼成功！当前等级：{treasure.refinement_level}")
+        echo(f"精炼成功！当前等级：{treasure.refinement_level}")
         
         # 提升属性
         for attr in treasure.attributes:
@@ -179,7 +183,7 @@ class TreasureCollection:
         
         collection_type = type_mapping.get(treasure.type, "特殊法宝")
         self.collection[collection_type].append(treasure)
-        print(f"获得法宝：{treasure.name}")
+        echo(f"获得法宝：{treasure.name}")
         
     def get_total_power(self) -> int:
         """计算总威力"""
@@ -191,18 +195,18 @@ class TreasureCollection:
         
     def show_collection(self):
         """显示法宝收藏"""
-        print("\n=== 法宝收藏 ===")
+        echo("\n=== 法宝收藏 ===")
         for category, treasures in self.collection.items():
             if treasures:
-                print(f"\n{category}：")
+                echo(f"\n{category}：")
                 for treasure in treasures:
-                    print(f"  • {treasure.name} ({treasure.grade})")
-                    print(f"    威力评分：{treasure.get_power_rating()}")
+                    echo(f"  • {treasure.name} ({treasure.grade})")
+                    echo(f"    威力评分：{treasure.get_power_rating()}")
                     if treasure.soul_imprint:
-                        print(f"    已认主：{treasure.soul_imprint}")
+                        echo(f"    已认主：{treasure.soul_imprint}")
                     if treasure.refinement_level > 0:
-                        print(f"    精炼等级：{treasure.refinement_level}")
-                    print()
+                        echo(f"    精炼等级：{treasure.refinement_level}")
+                    echo()
 
 class TreasureSystem:
     """法宝系统主类"""
@@ -247,7 +251,7 @@ class TreasureSystem:
         
     def treasure_interface(self, player_name: str, player_stats: Dict):
         """法宝系统主界面"""
-        print("\n=== 法宝系统 ===")
+        echo("\n=== 法宝系统 ===")
         
         # 初始化玩家法宝收藏
         if not hasattr(self, 'player_collections'):
@@ -259,15 +263,15 @@ class TreasureSystem:
         collection = self.player_collections[player_name]
         
         while True:
-            print(f"\n总威力评分：{collection.get_total_power()}")
-            print("\n操作选项：")
-            print("1. 查看法宝收藏")
-            print("2. 精炼法宝")
-            print("3. 寻找法宝")
-            print("4. 器灵认主")
-            print("5. 返回")
+            echo(f"\n总威力评分：{collection.get_total_power()}")
+            echo("\n操作选项：")
+            echo("1. 查看法宝收藏")
+            echo("2. 精炼法宝")
+            echo("3. 寻找法宝")
+            echo("4. 器灵认主")
+            echo("5. 返回")
             
-            choice = input("请选择: ")
+            choice = prompt("请选择: ")
             
             if choice == "1":
                 collection.show_collection()
@@ -280,7 +284,7 @@ class TreasureSystem:
             elif choice == "5":
                 break
             else:
-                print("无效选择")
+                echo("无效选择")
                 
     def refine_treasure_interface(self, collection: TreasureCollection, player_stats: Dict):
         """精炼法宝界面"""
@@ -292,38 +296,38 @@ class TreasureSystem:
                     refinable_treasures.append(treasure)
                     
         if not refinable_treasures:
-            print("没有可精炼的法宝")
+            echo("没有可精炼的法宝")
             return
             
-        print("可精炼法宝：")
+        echo("可精炼法宝：")
         for i, treasure in enumerate(refinable_treasures, 1):
-            print(f"{i}. {treasure.name} (当前等级：{treasure.refinement_level})")
+            echo(f"{i}. {treasure.name} (当前等级：{treasure.refinement_level})")
             
         try:
-            choice = int(input("选择法宝: ")) - 1
+            choice = int(prompt("选择法宝: ")) - 1
             if 0 <= choice < len(refinable_treasures):
                 treasure = refinable_treasures[choice]
                 success = self.refining_system.refine_treasure(treasure, player_stats.get('realm_level', 1))
                 if success:
-                    print("精炼完成！")
+                    echo("精炼完成！")
         except ValueError:
-            print("输入错误")
+            echo("输入错误")
             
     def search_treasure(self, collection: TreasureCollection):
         """寻找法宝"""
-        print("\n寻找法宝...")
+        echo("\n寻找法宝...")
         
         # 根据运气和境界决定获得品质
-        search_results = random.choices(
+        search_results = _rng.choices(
             list(self.treasure_database.keys()),
-            weights=[10, 8, 5, 2, 15, 12, 8, 3, 10, 8, 5, 2, 5, 3, 1, 1],
+            weights=[10, 8, 5, 2, 15, 12, 8, 3, 10, 8, 5, 2, 5, 3, 1],
             k=1
         )
         
         treasure_name = search_results[0]
         treasure = self.treasure_database[treasure_name]
         
-        print(f"找到了{treasure.name}({treasure.grade})！")
+        echo(f"找到了{treasure.name}({treasure.grade})！")
         
         # 加入收藏
         collection.add_treasure(treasure)
@@ -338,20 +342,20 @@ class TreasureSystem:
                     unimprinted.append(treasure)
                     
         if not unimprinted:
-            print("没有可认主的法宝")
+            echo("没有可认主的法宝")
             return
             
-        print("可认主法宝：")
+        echo("可认主法宝：")
         for i, treasure in enumerate(unimprinted, 1):
-            print(f"{i}. {treasure.name}")
+            echo(f"{i}. {treasure.name}")
             
         try:
-            choice = int(input("选择法宝: ")) - 1
+            choice = int(prompt("选择法宝: ")) - 1
             if 0 <= choice < len(unimprinted):
                 treasure = unimprinted[choice]
                 # 这里应该传递玩家名字
                 success = treasure.imprint_soul("玩家")
                 if success:
-                    print(f"{treasure.name}成功认主！")
+                    echo(f"{treasure.name}成功认主！")
         except ValueError:
-            print("输入错误")
\ No newline at end of file
+            echo("输入错误")
\ No newline at end of file
@@ -3,11 +3,18 @@
 """
 世界观构建系统
 构建完整的修仙世界背景、势力分布和历史脉络
+
+时代、势力、地理等静态内容由代码生成，每次启动都相同；存档只记录静态内容的
+版本号与内容哈希，以及近期事件、世界紧张度等可变字段。
 """
 
-import random
+import hashlib
+import json
 from typing import Dict, List, Tuple
 from datetime import datetime
+from game_utils.rng import stream
+
+_rng = stream("world_building")  # 本模块的随机数流
 
 class WorldHistory:
     """世界历史系统"""
@@ -117,12 +124,12 @@ class WorldHistory:
             "万宝阁举办百年拍卖会",
             "各大门派开始招收新弟子"
         ]
-        return random.sample(recent, 3)
+        return _rng.sample(recent, 3)
         
     def _get_world_state(self) -> Dict[str, any]:
         """获取当前世界状态"""
         return {
-            "灵气浓度": random.randint(30, 70),  # 末法时代特征
+            "灵气浓度": _rng.randint(30, 70),  # 末法时代特征
             "修仙资源": "稀缺",
             "主要威胁": ["魔气复苏", "妖兽暴动", "人心不古"],
             "发展机遇": ["古遗迹现世", "新修炼法门", "跨界机缘"]
@@ -333,17 +340,83 @@ class WorldGeography:
         
     def get_random_treasure_hunt(self) -> Dict:
         """随机获取一个寻宝任务"""
-        return random.choice(self.treasure_maps)
+        return _rng.choice(self.treasure_maps)
 
 class WorldBuildingSystem:
     """世界观构建主系统"""
     
+    STATIC_VERSION = 1  # 修改静态世界内容时递增
+    
     def __init__(self):
         self.history = WorldHistory()
         self.factions = MajorFactions()
         self.geography = WorldGeography()
+        self.static_hash = self._hash_static_content()
         self.world_context = self._build_world_context()
         
+    def get_static_content(self) -> Dict[str, any]:
+        """获取静态世界内容（不随游戏进程变化，不写入存档）"""
+        return {
+            "epochs": self.history.epochs,
+            "major_events": self.history.major_events,
+            "major_factions": self.factions.factions,
+            "key_locations": self.geography.locations,
+            "treasure_maps": self.geography.treasure_maps
+        }
+        
+    def _hash_static_content(self) -> str:
+        """静态内容的哈希，用于校验存档引用的是同一份世界设定"""
+        canonical = json.dumps(self.get_static_content(), ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+        
+    def get_static_ref(self) -> Dict[str, any]:
+        """存档中代替静态内容的引用"""
+        return {"version": self.STATIC_VERSION, "hash": self.static_hash}
+        
+    def get_save_data(self) -> Dict[str, any]:
+        """获取存档数据：静态内容引用 + 可变字段"""
+        history = self.world_context["history"]
+        return {
+            "static_ref": self.get_static_ref(),
+            "era": history["era"],
+            "recent_events": history["recent_events"],
+            "spirit_level": history["world_state"]["灵气浓度"],
+            "current_events": self.world_context["current_events"],
+            "world_tension": self.world_context["world_tension"]
+        }
+        
+    def load_from_data(self, data: Dict[str, any]) -> bool:
+        """从存档恢复可变字段，返回静态内容引用是否与当前版本一致
+        
+        也接受旧存档中完整的 world_context。
+        """
+        if "major_factions" in data:
+            history = data.get("history", {})
+            data = {
+                "era": history.get("era"),
+                "recent_events": history.get("recent_events"),
+                "spirit_level": history.get("world_state", {}).get("灵气浓度"),
+                "current_events": data.get("current_events"),
+                "world_tension": data.get("world_tension")
+            }
+            matched = False
+        else:
+            matched = data.get("static_ref") == self.get_static_ref()
+            
+        if data.get("era") in self.history.epochs:
+            self.history.current_era = data["era"]
+        context = self._build_world_context()
+        history = context["history"]
+        if data.get("recent_events") is not None:
+            history["recent_events"] = data["recent_events"]
+        if data.get("spirit_level") is not None:
+            history["world_state"]["灵气浓度"] = data["spirit_level"]
+        for key in ("current_events", "world_tension"):
+            if data.get(key) is not None:
+                context[key] = data[key]
+        self.world_context = context
+        return matched
+        
     def _build_world_context(self) -> Dict[str, any]:
         """构建完整的世界背景"""
         context = {
@@ -360,7 +433,7 @@ class WorldBuildingSystem:
         tensions = ["平静", "暗流涌动", "局势紧张", "剑拔弩张", "大战将起"]
         # 基于各种因素计算紧张程度
         base_tension = 2  # 默认暗流涌动
-        modifiers = random.randint(-1, 2)
+        modifiers = _rng.randint(-1, 2)
         final_index = max(0, min(len(tensions)-1, base_tension + modifiers))
         return tensions[final_index]
         
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+控制台输入钩子
+所有交互式提示统一经过这里读取，无头模式下可替换为脚本化的行动策略
+"""
+
+from game_utils.renderer import flush_output
+
+_input_policy = None
+
+def set_input_policy(policy):
+    """设置输入策略（None 表示从控制台读取）"""
+    global _input_policy
+    previous = _input_policy
+    _input_policy = policy
+    return previous
+
+def get_input_policy():
+    """获取当前输入策略"""
+    return _input_policy
+
+def prompt(message: str = "") -> str:
+    """读取一行输入，替代内置 input()"""
+    if _input_policy is None:
+        # 等待玩家输入前先把缓冲的输出刷到屏幕上
+        flush_output()
+        return input(message)
+    return _input_policy.answer(message)
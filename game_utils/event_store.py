@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+限时事件存储
+按到期回合组织的最小堆：加入事件 O(log n)，每回合只弹出已到期的事件，
+不必扫描仍在持续的事件；另按地区分组，查询某地事件只看该地区。
+"""
+
+import heapq
+from typing import Dict, List
+
+class EventStore:
+    """限时事件存储"""
+    
+    def __init__(self):
+        self.clear()
+        
+    def clear(self):
+        """清空所有事件"""
+        self._heap = []      # (到期回合, 事件编号)
+        self._events = {}    # 事件编号 -> 事件（按加入顺序）
+        self._regions = {}   # 地区 -> {事件编号: 事件}；None 表示全世界
+        self._next_id = 0
+        
+    def __len__(self) -> int:
+        return len(self._events)
+        
+    def add(self, event: Dict, start_time: int, region: str = None) -> int:
+        """加入事件（event['duration'] 为持续回合数），返回事件编号"""
+        event_id = self._next_id
+        self._next_id += 1
+        event['start_time'] = start_time
+        event['region'] = region
+        self._events[event_id] = event
+        self._regions.setdefault(region, {})[event_id] = event
+        heapq.heappush(self._heap, (start_time + event['duration'], event_id))
+        return event_id
+        
+    def remove(self, event_id: int) -> bool:
+        """提前结束事件；堆中的条目在到期弹出时跳过"""
+        event = self._events.pop(event_id, None)
+        if event is None:
+            return False
+        self._drop_from_region(event_id, event)
+        return True
+        
+    def _drop_from_region(self, event_id: int, event: Dict):
+        region_events = self._regions[event['region']]
+        del region_events[event_id]
+        if not region_events:
+            del self._regions[event['region']]
+            
+    def expire(self, current_time: int) -> List[Dict]:
+        """移除所有在 current_time 前已结束的事件，返回这些事件"""
+        heap = self._heap
+        expired = []
+        while heap and heap[0][0] <= current_time:
+            _, event_id = heapq.heappop(heap)
+            event = self._events.pop(event_id, None)
+            if event is not None:
+                self._drop_from_region(event_id, event)
+                expired.append(event)
+        return expired
+        
+    def active(self, region: str = None) -> List[Dict]:
+        """某地区正在进行的事件（region 为 None 时为全世界范围的事件）"""
+        return list(self._regions.get(region, {}).values())
+        
+    def active_near(self, region: str) -> List[Dict]:
+        """全世界范围的事件加上指定地区的事件"""
+        return self.active(None) + (self.active(region) if region is not None else [])
+        
+    def regions(self) -> List[str]:
+        """当前有事件的地区"""
+        return [region for region in self._regions if region is not None]
+        
+    def all_events(self) -> List[Dict]:
+        """所有进行中的事件（按加入顺序）"""
+        return list(self._events.values())
+        
+    def load(self, events: List[Dict]):
+        """从事件列表恢复（事件需带 start_time 与 duration）"""
+        self.clear()
+        for event in events:
+            event = dict(event)
+            self.add(event, event.get('start_time', 0), event.get('region'))
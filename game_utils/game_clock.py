@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+游戏时钟
+全局唯一的游戏内时间来源，以回合为单位计时
+"""
+
+class GameClock:
+    """游戏时钟"""
+    
+    def __init__(self, tick: int = 0):
+        self.tick = tick  # 当前回合数
+        
+    def now(self) -> int:
+        """当前回合"""
+        return self.tick
+        
+    def advance(self, ticks: int = 1) -> int:
+        """推进若干回合，返回推进后的回合"""
+        self.tick += ticks
+        return self.tick
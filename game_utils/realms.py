@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+境界表
+所有境界相关的数值按整数境界编号（0 为凡人）预先排成元组，玩家、战斗和功法共用；
+热路径上按编号直接取下标，不再逐次查找列表或重建字典，九个境界都有各自的数值。
+"""
+
+from typing import Tuple
+
+NAMES: Tuple[str, ...] = (
+    "凡人", "练气期", "筑基期", "金丹期",
+    "元婴期", "化神期", "合体期", "大乘期", "渡劫期"
+)
+REALM_ID = {name: realm_id for realm_id, name in enumerate(NAMES)}
+MORTAL = 0
+HIGHEST = len(NAMES) - 1
+
+# 从该境界突破到下一境界的门槛（机缘 + 1d10 需超过门槛）
+BREAKTHROUGH_COST = tuple((realm_id + 1) * 20 for realm_id in range(len(NAMES)))
+
+# 战斗数值：玩家（及按玩家数值切磋的修士）的血量、伤害加成，妖兽的血量、伤害倍率
+PLAYER_HP_BONUS = (0, 0, 50, 100, 200, 400, 800, 1600, 3200)
+PLAYER_DAMAGE_BONUS = (0, 0, 10, 25, 50, 100, 200, 400, 800)
+ENEMY_HP_MULTIPLIER = (1, 1, 2, 4, 8, 16, 32, 64, 128)
+ENEMY_DAMAGE_MULTIPLIER = (1, 1, 1.5, 2.5, 4, 6.5, 10.5, 17, 27.5)
+
+def realm_id(name: str) -> int:
+    """境界名称对应的编号（未知境界抛出 KeyError，不再静默当作默认值）"""
+    return REALM_ID[name]
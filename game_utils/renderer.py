@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+输出渲染层
+游戏模块统一通过 echo() 输出文本，由当前渲染器决定立即输出、按回合缓冲还是直接丢弃
+"""
+
+import sys
+
+class Renderer:
+    """即时渲染器，行为等同 print()"""
+    
+    enabled = True  # 为 False 时调用方可跳过格式化工作
+    
+    def __init__(self, stream=None):
+        self.stream = stream
+        
+    def _target(self):
+        # 运行时取 sys.stdout，兼容 redirect_stdout
+        return self.stream if self.stream is not None else sys.stdout
+        
+    def write(self, text: str):
+        """写入文本"""
+        self._target().write(text)
+        
+    def flush(self):
+        """刷新输出"""
+        self._target().flush()
+
+class BufferedRenderer(Renderer):
+    """缓冲渲染器：收集一个回合的全部输出，刷新时一次性写出"""
+    
+    def __init__(self, stream=None):
+        super().__init__(stream)
+        self.parts = []
+        
+    def write(self, text: str):
+        self.parts.append(text)
+        
+    def flush(self):
+        if self.parts:
+            target = self._target()
+            target.write("".join(self.parts))
+            self.parts.clear()
+            target.flush()
+
+class NullRenderer(Renderer):
+    """空渲染器：丢弃所有输出，用于无头模拟"""
+    
+    enabled = False
+    
+    def write(self, text: str):
+        pass
+        
+    def flush(self):
+        pass
+
+_renderer = Renderer()
+
+def set_renderer(renderer: Renderer) -> Renderer:
+    """切换当前渲染器，返回之前的渲染器"""
+    global _renderer
+    previous = _renderer
+    _renderer = renderer
+    return previous
+
+def get_renderer() -> Renderer:
+    """获取当前渲染器"""
+    return _renderer
+
+def output_enabled() -> bool:
+    """当前渲染器是否会产生输出"""
+    return _renderer.enabled
+
+def echo(*values, sep: str = " ", end: str = "\n"):
+    """输出一行文本，参数语义与 print() 相同"""
+    renderer = _renderer
+    if renderer.enabled:
+        renderer.write(sep.join(map(str, values)) + end)
+
+def flush_output():
+    """刷新当前渲染器"""
+    _renderer.flush()
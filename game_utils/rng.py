@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+随机数服务
+每个子系统（战斗、炼丹、种植、世界、门派、引导、法宝等）从同一个服务取得独立的随机数流，
+各流的种子由总种子和流名派生，互不干扰：某个子系统多抽一次不会改变其他子系统的结果。
+另提供 NumPy Generator 流，供批量抽样使用。
+
+存档时调用 checkpoint() 得到重放令牌（总种子与纪元号），同时按新纪元重设所有流；
+读档时 restore(令牌) 重设到同一纪元，之后的随机结果与存档当时继续游戏完全一致。
+"""
+
+import hashlib
+import os
+import random
+from typing import Dict
+
+class RNGService:
+    """随机数服务"""
+    
+    def __init__(self, seed: int = None):
+        self._streams = {}     # 流名 -> random.Random
+        self._generators = {}  # 流名 -> numpy.random.Generator
+        self.reseed(seed)
+        
+    def reseed(self, seed: int = None, epoch: int = 0):
+        """设置总种子（None 时取系统熵，种子仍会记录在重放令牌中），原地重设所有已发出的流"""
+        self.seed = int.from_bytes(os.urandom(8), "big") if seed is None else seed
+        self.epoch = epoch
+        for name, stream in self._streams.items():
+            stream.seed(self._derive(name))
+        if self._generators:
+            import numpy as np
+            for name, generator in self._generators.items():
+                generator.bit_generator.state = np.random.PCG64(self._derive(name)).state
+                
+    def _derive(self, name: str) -> int:
+        """由总种子、纪元号和流名派生 64 位子种子"""
+        digest = hashlib.sha256(f"{self.seed}/{self.epoch}/{name}".encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "big")
+        
+    def stream(self, name: str) -> random.Random:
+        """取得某个子系统的随机数流（同名返回同一对象，重设种子时原地更新）"""
+        stream = self._streams.get(name)
+        if stream is None:
+            stream = self._streams[name] = random.Random(self._derive(name))
+        return stream
+        
+    def numpy(self, name: str):
+        """取得某个子系统的 NumPy Generator 流，用于批量抽样"""
+        generator = self._generators.get(name)
+        if generator is None:
+            import numpy as np
+            generator = self._generators[name] = np.random.default_rng(self._derive(name))
+        return generator
+        
+    def checkpoint(self) -> Dict[str, int]:
+        """进入下一纪元并重设所有流，返回可写入存档的重放令牌"""
+        self.reseed(self.seed, self.epoch + 1)
+        return self.replay_token()
+        
+    def replay_token(self) -> Dict[str, int]:
+        """当前的重放令牌"""
+        return {'seed': self.seed, 'epoch': self.epoch}
+        
+    def restore(self, token: Dict[str, int]):
+        """按重放令牌重设所有流"""
+        self.reseed(token['seed'], token.get('epoch', 0))
+
+_service = RNGService()
+
+def get_rng_service() -> RNGService:
+    """获取全局随机数服务"""
+    return _service
+
+def seed(value: int = None):
+    """设置全局随机数服务的总种子"""
+    _service.reseed(value)
+
+def stream(name: str) -> random.Random:
+    """全局服务中某个子系统的随机数流"""
+    return _service.stream(name)
+
+def numpy_stream(name: str):
+    """全局服务中某个子系统的 NumPy Generator 流"""
+    return _service.numpy(name)
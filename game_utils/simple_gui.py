@@ -6,35 +6,100 @@
 """
 
 import os
+import sys
 import time
 from typing import List, Dict
 
+def _enable_ansi() -> bool:
+    """检测终端是否支持ANSI控制序列（Windows下尝试开启VT模式）"""
+    stream = sys.stdout
+    if not hasattr(stream, 'isatty') or not stream.isatty():
+        return False
+    if os.name != 'nt':
+        return True
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        mode = ctypes.c_uint32()
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            return False
+        # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+        return bool(kernel32.SetConsoleMode(handle, mode.value | 0x0004))
+    except Exception:
+        return False
+
+class ScreenRenderer:
+    """差异化屏幕渲染器：保留上一帧，只重绘发生变化的行"""
+    
+    def __init__(self, ansi: bool = None):
+        self.ansi = _enable_ansi() if ansi is None else ansi
+        self.previous_frame = []  # 上一帧已绘制的行
+        self.last_frame_bytes = 0  # 上一帧写出的字节数
+        
+    def clear(self):
+        """清屏并丢弃上一帧"""
+        self.previous_frame = []
+        if self.ansi:
+            self._write("\033[2J\033[H")
+            
+    def draw(self, lines: List[str]):
+        """绘制一帧，只输出与上一帧不同的行"""
+        if not self.ansi:
+            # 不支持光标控制（如输出被重定向）时退化为顺序打印
+            self._write("".join(line + "\n" for line in lines))
+            self.previous_frame = list(lines)
+            return
+            
+        parts = []
+        previous = self.previous_frame
+        for row, line in enumerate(lines):
+            if row >= len(previous) or previous[row] != line:
+                parts.append(f"\033[{row + 1};1H{line}\033[K")
+        # 光标移到帧末尾，擦除帧下方残留的内容（包括上一帧多出的行）
+        parts.append(f"\033[{len(lines) + 1};1H\033[J")
+        self._write("".join(parts))
+        self.previous_frame = list(lines)
+        
+    def _write(self, text: str):
+        data = text.encode('utf-8')
+        self.last_frame_bytes = len(data)
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
 class SimpleGUI:
     """简易图形界面"""
     
     def __init__(self):
+        self.screen = ScreenRenderer()
         self.clear_screen()
         
     def clear_screen(self):
         """清屏"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        self.screen.clear()
         
-    def print_header(self, title: str):
-        """打印标题栏"""
+    def header_lines(self, title: str) -> List[str]:
+        """生成标题栏的行"""
         width = 50
-        print("=" * width)
-        print(f"{title:^{width}}")
-        print("=" * width)
+        return ["=" * width, f"{title:^{width}}", "=" * width]
         
-    def print_box(self, content: str):
-        """打印带边框的内容"""
+    def box_lines(self, content: str) -> List[str]:
+        """生成带边框内容的行"""
         lines = content.split('\n')
         max_length = max(len(line) for line in lines) + 4
         
-        print("+" + "-" * (max_length - 2) + "+")
-        for line in lines:
-            print(f"| {line:<{max_length-4}} |")
-        print("+" + "-" * (max_length - 2) + "+")
+        border = "+" + "-" * (max_length - 2) + "+"
+        return [border] + [f"| {line:<{max_length-4}} |" for line in lines] + [border]
+        
+    def print_header(self, title: str):
+        """打印标题栏"""
+        for line in self.header_lines(title):
+            print(line)
+        
+    def print_box(self, content: str):
+        """打印带边框的内容"""
+        for line in self.box_lines(content):
+            print(line)
         
     def print_progress_bar(self, current: int, total: int, width: int = 30):
         """打印进度条"""
@@ -65,9 +130,6 @@ class SimpleGUI:
             
     def show_main_menu(self) -> str:
         """显示主菜单"""
-        self.clear_screen()
-        self.print_header("道士职业模拟器")
-        
         menu_items = [
             "1. 新游戏",
             "2. 读取存档", 
@@ -75,11 +137,12 @@ class SimpleGUI:
             "4. 退出游戏"
         ]
         
-        print("\n请选择:")
-        for item in menu_items:
-            print(f"  {item}")
-            
-        return input("\n请输入选择: ").strip()
+        frame = self.header_lines("道士职业模拟器") + ["", "请选择:"]
+        frame += [f"  {item}" for item in menu_items]
+        frame.append("")
+        self.screen.draw(frame)
+        
+        return input("请输入选择: ").strip()
         
     def show_character_creation(self) -> Dict[str, any]:
         """显示角色创建界面"""
@@ -124,11 +187,9 @@ class SimpleGUI:
         }
         
     def show_game_interface(self, player, world_state):
-        """显示游戏主界面"""
-        self.clear_screen()
-        
+        """显示游戏主界面（只重绘变化的行）"""
         # 顶部状态栏
-        self.print_header(f"道士职业模拟器 - {player.name}")
+        frame = self.header_lines(f"道士职业模拟器 - {player.name}")
         
         # 玩家状态
         status_lines = [
@@ -142,7 +203,7 @@ class SimpleGUI:
             status_lines.append(f"门派: {player.sect.name}")
             
         status_text = "\n".join(status_lines)
-        self.print_box(status_text)
+        frame += self.box_lines(status_text)
         
         # 世界状态
         world_lines = [
@@ -151,15 +212,12 @@ class SimpleGUI:
             f"灵气浓度: {world_state['灵气浓度']}"
         ]
         world_text = "\n".join(world_lines)
-        print("\n世界状态:")
-        self.print_box(world_text)
+        frame += ["", "世界状态:"] + self.box_lines(world_text)
+        self.screen.draw(frame)
         
     def show_loading_screen(self, message: str = "加载中"):
         """显示加载界面"""
-        self.clear_screen()
-        self.print_header("Loading...")
-        print(f"\n{message}")
-        print("请稍候...")
+        self.screen.draw(self.header_lines("Loading...") + ["", message, "请稍候..."])
         
     def pause(self, message: str = "按回车键继续..."):
         """暂停等待用户输入"""